@@ -0,0 +1,20 @@
+# Generated by Django 5.1 on 2026-10-18 19:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0002_taskcategory_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskcategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0003_taskcategory_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskcategory',
+            name='open_task_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='taskcategory',
+            name='task_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
@@ -8,9 +8,33 @@ class TaskCategory(models.Model):
     Attributes:
         name (str): The name of the task category.
         user (ForeignKey): The user associated with this category.
+        updated_at (datetime): When the category was last changed, used for conditional GETs.
+        task_count (int): Number of tasks filed under the category.
+        open_task_count (int): Number of those tasks not yet completed.
+
+    The counts are maintained by triggers on the task table (tasks migration
+    0015), so every write path keeps them current; the rebuild_task_counters
+    command recomputes them.
     """
     name = models.CharField(max_length=100, unique=True)  # Category name must be unique
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='categories')  # Link to the user
+    updated_at = models.DateTimeField(auto_now=True)  # Timestamp when the category was last updated
+    task_count = models.IntegerField(default=0, editable=False)  # Tasks in the category (maintained by triggers)
+    open_task_count = models.IntegerField(default=0, editable=False)  # Incomplete tasks in the category
+
+    COUNT_FIELDS = ('task_count', 'open_task_count')  # Written only by the triggers
+
+    def save(self, **kwargs):
+        """
+        Save the category without writing back the task counts, which the
+        triggers may have changed since this instance was loaded.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNT_FIELDS
+            ]
+        super().save(**kwargs)
 
     def __str__(self):
         return self.name  # String representation of the category
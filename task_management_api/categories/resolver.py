@@ -0,0 +1,63 @@
+from .models import TaskCategory
+
+
+class CategoryResolver:
+    """
+    Request-scoped view of the categories a user owns.
+
+    The user's categories are loaded with one query the first time they are
+    needed and then reused for validating category ids, filtering by category
+    name and rendering category names, so a request never looks a category up
+    twice. Only the user's own categories can be resolved, which is how
+    ownership is enforced.
+    """
+    def __init__(self, user):
+        self.user = user
+        self._by_pk = None
+
+    @classmethod
+    def for_request(cls, request):
+        """
+        Return the resolver attached to the request, creating it on first use.
+        """
+        resolver = getattr(request, '_category_resolver', None)
+        if resolver is None or resolver.user != request.user:
+            resolver = request._category_resolver = cls(request.user)
+        return resolver
+
+    @property
+    def categories(self):
+        """
+        Return the user's categories as a {pk: category} map.
+        """
+        if self._by_pk is None:
+            self._by_pk = TaskCategory.objects.filter(user=self.user).in_bulk()
+        return self._by_pk
+
+    async def aload(self):
+        """
+        Load the user's categories with the async ORM, so later lookups made
+        from async code never touch the database.
+        """
+        if self._by_pk is None:
+            self._by_pk = await TaskCategory.objects.filter(user=self.user).ain_bulk()
+        return self._by_pk
+
+    def get(self, pk):
+        """
+        Return the user's category with the given pk, or None.
+        """
+        return self.categories.get(pk)
+
+    def get_by_name(self, name):
+        """
+        Return the user's category with the given name, or None.
+        """
+        return next((category for category in self.categories.values() if category.name == name), None)
+
+    def name_of(self, pk):
+        """
+        Return the name of the user's category with the given pk, or None.
+        """
+        category = self.get(pk)
+        return category.name if category else None
@@ -9,8 +9,8 @@ class CategorySerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = TaskCategory  # Specify the model to be serialized
-        fields = ['id', 'name']  # Specify fields to include in the serialization
-        read_only_fields = ['id']  # Mark 'id' as read-only since it's auto-generated by the database
+        fields = ['id', 'name', 'task_count', 'open_task_count']  # Specify fields to include in the serialization
+        read_only_fields = ['id', 'task_count', 'open_task_count']  # Generated by the database; counts are kept by triggers
 
     def create(self, validated_data):
         """
@@ -1,3 +1,134 @@
-from django.test import TestCase
+import io
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from users.models import User
+from .models import TaskCategory
+
+
+class CategoryConditionalGetTest(APITestCase):
+    """
+    Tests for ETag / Last-Modified handling on category endpoints.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='catetag', email='catetag@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = TaskCategory.objects.create(name='Etag', user=self.user)
+
+    def test_list_answers_304_until_a_category_changes(self):
+        url = reverse('category-list')
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.post(url, {'name': 'Another'})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_detail_answers_304_until_renamed(self):
+        url = reverse('category-detail', args=[self.category.id])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {'name': 'Renamed'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Renamed')
+
+
+class CategoryTaskCountTest(APITestCase):
+    """
+    Tests for the task counts maintained on each category.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='counts', email='counts@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.work = TaskCategory.objects.create(name='Work', user=self.user)
+        self.home = TaskCategory.objects.create(name='Home', user=self.user)
+
+    def create_task(self, category, **extra):
+        response = self.client.post(reverse('task-list'), {
+            'title': 'Counted', 'description': 'Task', 'due_date': (timezone.now() + timedelta(days=1)).isoformat(),
+            'priority': 'Low', 'status': 'Pending', 'category': category.id, **extra,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id']
+
+    def counts(self, category):
+        category.refresh_from_db()
+        return category.task_count, category.open_task_count
+
+    def test_counts_follow_task_writes(self):
+        first = self.create_task(self.work)
+        second = self.create_task(self.work)
+        self.assertEqual(self.counts(self.work), (2, 2))
+
+        self.client.patch(reverse('task-toggle-complete', args=[first]))
+        self.assertEqual(self.counts(self.work), (2, 1))
+        self.client.patch(reverse('task-toggle-incomplete', args=[first]))
+        self.assertEqual(self.counts(self.work), (2, 2))
+
+        self.client.patch(reverse('task-detail', args=[second]), {'category': self.home.id}, format='json')
+        self.assertEqual(self.counts(self.work), (1, 1))
+        self.assertEqual(self.counts(self.home), (1, 1))
+
+        self.client.patch(reverse('task-bulk-complete'), {'ids': [first, second]}, format='json')
+        self.assertEqual(self.counts(self.work), (1, 0))
+        self.assertEqual(self.counts(self.home), (1, 0))
+
+        self.client.delete(reverse('task-detail', args=[first]))
+        self.client.delete(reverse('task-bulk'), {'ids': [second]}, format='json')
+        self.assertEqual(self.counts(self.work), (0, 0))
+        self.assertEqual(self.counts(self.home), (0, 0))
+
+    def test_list_returns_counts_without_touching_tasks(self):
+        self.create_task(self.work)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('category-list'))
+        self.assertEqual(
+            {category['name']: (category['task_count'], category['open_task_count']) for category in response.data},
+            {'Work': (1, 1), 'Home': (0, 0)},
+        )
+        self.assertFalse([query for query in queries if 'tasks_task' in query['sql']])
+
+    def test_detail_etag_changes_with_counts(self):
+        url = reverse('category-detail', args=[self.work.id])
+        etag = self.client.get(url)['ETag']
+        self.create_task(self.work)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['task_count'], 1)
+
+    def test_counts_are_read_only(self):
+        response = self.client.patch(reverse('category-detail', args=[self.work.id]), {'task_count': 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts(self.work), (0, 0))
+
+    def test_saving_a_category_keeps_the_counts(self):
+        self.create_task(self.work)
+        category = TaskCategory.objects.get(pk=self.work.pk)  # Loaded with a count of 1
+        self.create_task(self.work)
+        category.name = 'Office'
+        category.save()
+        self.assertEqual(self.counts(self.work), (2, 2))
+        response = self.client.patch(reverse('category-detail', args=[self.work.id]), {'name': 'Job'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts(self.work), (2, 2))
+        self.assertEqual(self.work.name, 'Job')
+
+    def test_rebuild_command(self):
+        self.create_task(self.work)
+        TaskCategory.objects.update(task_count=7, open_task_count=7)
+        call_command('rebuild_task_counters', stdout=io.StringIO())
+        self.assertEqual(self.counts(self.work), (1, 1))
+        self.assertEqual(self.counts(self.home), (0, 0))
@@ -3,10 +3,19 @@ from rest_framework.response import Response
 from rest_framework import status
 from .models import TaskCategory
 from .serializers import CategorySerializer 
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+from tasks.cache import invalidate_user  # Per-user task list cache
+from tasks.conditional import ConditionalGetMixin, make_etag  # ETag / Last-Modified support
+from tasks.models import Task
+from tasks.sync import record_deletions  # Tombstones for delta sync
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     A viewset for viewing and editing category instances.
+    GET responses carry ETag/Last-Modified headers and unchanged resources are
+    answered with 304 Not Modified.
     """
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]  # Ensure user is authenticated
@@ -17,12 +26,63 @@ class CategoryViewSet(viewsets.ModelViewSet):
         """
         return TaskCategory.objects.filter(user=self.request.user)  # Filter by user
 
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Derive validators from the latest updated_at and the row count (list) or
+        from the category's own updated_at and task counts (detail), without
+        loading any rows. Task writes change the counts but not updated_at; in
+        the list they change the user's cache generation.
+        """
+        if self.action == 'retrieve':
+            row = self.get_queryset().filter(pk=kwargs['pk']).values_list(
+                'updated_at', 'task_count', 'open_task_count',
+            ).first()
+            if row is None:
+                return None  # Fall through to the normal 404
+            return make_etag('category', kwargs['pk'], *row), row[0]
+        stats = self.get_queryset().aggregate(last_modified=Max('updated_at'), count=Count('id'))
+        etag = make_etag('categories', request.user.pk, self.get_user_version(), stats['count'], stats['last_modified'])
+        return etag, stats['last_modified']
+
     def perform_create(self, serializer):
         """
         Automatically set the user to the currently authenticated user
         when a category is created.
         """
         serializer.save(user=self.request.user)
+        invalidate_user(self.request.user.pk)  # Drop the user's cached task lists
+
+    def task_list_users(self, category):
+        """
+        Return the ids of every user whose cached task lists show the category.
+        """
+        return set(Task.objects.filter(category=category).values_list('user_id', flat=True).distinct()) | {category.user_id}
+
+    def invalidate_task_lists(self, user_ids):
+        """
+        Invalidate the cached task lists of the given users, since renaming or
+        deleting a category changes their tasks. Called inside the write's
+        transaction, so the caches are invalidated again once it commits.
+        """
+        for user_id in user_ids:
+            invalidate_user(user_id)
+
+    def perform_update(self, serializer):
+        name = serializer.validated_data.get('name')
+        renamed = name is not None and name != serializer.instance.name
+        with transaction.atomic():
+            serializer.save()
+            if renamed:
+                # Task representations carry the category name, so sync clients must see them as updated
+                Task.objects.filter(category=serializer.instance).update(updated_at=timezone.now())
+            self.invalidate_task_lists(self.task_list_users(serializer.instance))
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            user_ids = self.task_list_users(instance)  # Collected before the tasks cascade away
+            record_deletions(Task.objects.filter(category=instance))  # Let sync clients see the cascaded deletions
+            instance.delete()
+            self.invalidate_task_lists(user_ids)
 
     def update(self, request, *args, **kwargs):
         """
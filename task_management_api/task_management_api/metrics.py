@@ -0,0 +1,266 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets, per kind of observation
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """
+    Prometheus-style histogram with labels, kept in process memory.
+    Each process (e.g. each gunicorn worker) exposes its own series.
+    """
+    def __init__(self, name, documentation, buckets, labels=('view',)):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self.labels = labels
+        self.series = {}  # {label values: [count per bucket..., sum, count]}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[label]) for label in self.labels)
+        with self.lock:
+            series = self.series.setdefault(key, [0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1  # Buckets are cumulative, as Prometheus expects
+            series[-2] += value
+            series[-1] += 1
+
+    def clear(self):
+        with self.lock:
+            self.series.clear()
+
+    def render(self):
+        """
+        Return the histogram in the Prometheus text exposition format.
+        """
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            series = sorted(self.series.items())
+        for key, values in series:
+            labels = ','.join(f'{label}="{escape_label(value)}"' for label, value in zip(self.labels, key))
+            for bound, count in zip(self.buckets, values):
+                le = '+Inf' if bound == float('inf') else format_number(bound)
+                lines.append(f'{self.name}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f'{self.name}_sum{{{labels}}} {format_number(values[-2])}')
+            lines.append(f'{self.name}_count{{{labels}}} {values[-1]}')
+        return '\n'.join(lines)
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', "Time spent handling the request.", SECONDS_BUCKETS,
+    labels=('view', 'method', 'status'),
+)
+DB_QUERIES = Histogram('http_request_db_queries', "SQL queries executed per request.", QUERY_BUCKETS)
+DB_DURATION = Histogram('http_request_db_duration_seconds', "Time spent in SQL queries per request.", SECONDS_BUCKETS)
+SERIALIZATION_DURATION = Histogram(
+    'http_request_serialization_seconds', "Time spent serializing and rendering the response.", SECONDS_BUCKETS,
+)
+RESPONSE_SIZE = Histogram('http_response_size_bytes', "Size of the response body.", BYTES_BUCKETS)
+HISTOGRAMS = [REQUEST_DURATION, DB_QUERIES, DB_DURATION, SERIALIZATION_DURATION, RESPONSE_SIZE]
+
+current = ContextVar('request_metrics', default=None)  # RequestMetrics of the request being handled
+
+
+class RequestMetrics:
+    """
+    Measurements of one request: SQL queries, and named phases such as serialization.
+    """
+    def __init__(self, max_statements):
+        self.queries = 0
+        self.db_time = 0.0
+        self.phases = {}  # {name: seconds}
+        self.statements = []  # (seconds, sql), kept for the slow request log
+        self.max_statements = max_statements
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_query(self, sql, seconds):
+        self.queries += 1
+        self.db_time += seconds
+        if len(self.statements) < self.max_statements:
+            self.statements.append((seconds, sql))
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper timing every query of the current request.
+    """
+    metrics = current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(sql, time.perf_counter() - started)
+
+
+def install_wrapper(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# Connections are per thread; this covers the ones opened later, e.g. by sync_to_async threads
+connection_created.connect(install_wrapper)
+
+
+@contextmanager
+def timed(phase):
+    """
+    Add the time spent in the block to the current request's `phase`
+    (reported in Server-Timing); a no-op outside instrumented requests.
+    """
+    metrics = current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_phase(phase, time.perf_counter() - started)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record, per request, the view name, the number and total time of SQL
+    queries, the serialization and rendering time and the response size.
+
+    The measurements are sent back in a Server-Timing header and observed in
+    the histograms served by metrics_view. Requests slower than
+    METRICS_SLOW_REQUEST_MS are logged with their SQL. Place it first in
+    MIDDLEWARE so the timings cover the whole stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            return self.get_response(request)
+        for connection in connections.all(initialized_only=True):
+            install_wrapper(connection)  # Opened before this module was imported
+        metrics = RequestMetrics(getattr(settings, 'METRICS_SLOW_REQUEST_MAX_QUERIES', 100))
+        token = current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current.reset(token)
+        self.finish(request, response, metrics, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            return await self.get_response(request)
+        metrics = RequestMetrics(getattr(settings, 'METRICS_SLOW_REQUEST_MAX_QUERIES', 100))
+        token = current.set(metrics)  # sync_to_async copies the context, so ORM threads see it
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current.reset(token)
+        self.finish(request, response, metrics, time.perf_counter() - started)
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        Called just before a DRF Response is rendered; time the rendering.
+        """
+        metrics = current.get()
+        if metrics is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: metrics.add_phase('render', time.perf_counter() - started)
+            )
+        return response
+
+    def get_view_name(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unmatched'  # 404s are not labelled by path, which would be unbounded
+        return match.view_name or match._func_path
+
+    def finish(self, request, response, metrics, duration):
+        view = self.get_view_name(request)
+        serialization = metrics.phases.get('serialize', 0.0) + metrics.phases.get('render', 0.0)
+        size = None if response.streaming else len(response.content)
+
+        REQUEST_DURATION.observe(duration, view=view, method=request.method, status=response.status_code)
+        DB_QUERIES.observe(metrics.queries, view=view)
+        DB_DURATION.observe(metrics.db_time, view=view)
+        SERIALIZATION_DURATION.observe(serialization, view=view)
+        if size is not None:
+            RESPONSE_SIZE.observe(size, view=view)
+
+        timings = [f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"']
+        timings += [f'{name};dur={seconds * 1000:.2f}' for name, seconds in sorted(metrics.phases.items())]
+        timings.append(f'total;dur={duration * 1000:.2f}')
+        response['Server-Timing'] = ', '.join(timings)
+
+        slow_request_ms = getattr(settings, 'METRICS_SLOW_REQUEST_MS', 2000)
+        if slow_request_ms and duration * 1000 >= slow_request_ms:
+            self.log_slow_request(request, view, response, metrics, duration, size)
+
+    def log_slow_request(self, request, view, response, metrics, duration, size):
+        statements = ''.join(f'\n  [{seconds * 1000:.2f} ms] {sql}' for seconds, sql in metrics.statements)
+        if metrics.queries > len(metrics.statements):
+            statements += f'\n  ... {metrics.queries - len(metrics.statements)} more queries'
+        logger.warning(
+            "Slow request %s %s view=%s status=%s duration_ms=%.1f queries=%d db_ms=%.1f bytes=%s%s",
+            request.method, request.path, view, response.status_code, duration * 1000,
+            metrics.queries, metrics.db_time * 1000, size, statements,
+        )
+
+
+def metrics_view(request):
+    """
+    Serve the request histograms in the Prometheus text format.
+
+    When METRICS_TOKEN is set, clients must send it as a bearer token.
+    Otherwise only clients listed in METRICS_ALLOWED_IPS (loopback by default)
+    may read them; behind a reverse proxy on the same host every client has a
+    loopback address, so set METRICS_TOKEN there.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        allowed = constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}')
+    else:
+        allowed = request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', ('127.0.0.1', '::1'))
+    if not allowed:
+        raise PermissionDenied
+    body = '\n'.join(histogram.render() for histogram in HISTOGRAMS) + '\n'
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
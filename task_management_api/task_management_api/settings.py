@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -34,6 +35,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'task_management_api.metrics.RequestMetricsMiddleware',  # First, so its timings cover the whole stack
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,13 +68,69 @@ WSGI_APPLICATION = 'task_management_api.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# SQLite by default; set DB_ENGINE=postgresql (plus DB_NAME, DB_USER, DB_PASSWORD,
+# DB_HOST and DB_PORT) to use PostgreSQL. Connections are kept open for
+# DB_CONN_MAX_AGE seconds and health-checked before reuse.
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'task_management'),
+            'USER': os.environ.get('DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Take the write lock when a transaction starts, so concurrent writers
+                # wait on busy_timeout instead of failing to upgrade a read lock
+                'transaction_mode': 'IMMEDIATE',
+                # Seconds the driver waits for a lock before raising "database is locked"
+                'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)) / 1000,
+                # Run on every new connection: WAL lets readers proceed while a writer commits,
+                # synchronous=NORMAL is durable across crashes in WAL mode, and mmap serves reads from the page cache
+                'init_command': (
+                    f"PRAGMA journal_mode={os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')};"
+                    f"PRAGMA synchronous={os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')};"
+                    f"PRAGMA busy_timeout={int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))};"
+                    f"PRAGMA mmap_size={int(os.environ.get('SQLITE_MMAP_SIZE', 268435456))};"
+                    'PRAGMA temp_store=MEMORY;'
+                ),
+            },
+        }
+    }
+
+DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 60))  # Reuse connections across requests
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True  # Ping reused connections before handing them out
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# In-process LocMem by default; set CACHE_DIR to share a file-based cache between worker processes
+
+if os.environ.get('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'task-management-api',
+        }
     }
-}
 
 
 # Password validation
@@ -120,10 +178,69 @@ AUTH_USER_MODEL = 'users.User'  # Adjust based on your app name
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',  # JWT with the user cached between requests
     ),
 }
 
+# Task list pagination (cursor based, see tasks/pagination.py)
+TASKS_PAGE_SIZE = 50  # Default number of tasks per page
+TASKS_MAX_PAGE_SIZE = 500  # Upper bound for the page_size query parameter
+TASKS_BULK_MAX_ITEMS = 10000  # Largest list accepted by the bulk task endpoint
+TASKS_EXPORT_CHUNK_SIZE = 2000  # Rows fetched per database round trip when exporting
+
+# Serve task list/filter/detail GETs with async views (tasks/async_views.py); enable under ASGI
+TASKS_ASYNC_VIEWS = os.environ.get('TASKS_ASYNC_VIEWS') == '1'
+
+# Per-user task list cache (see tasks/cache.py); a timeout of 0 disables it
+TASKS_CACHE_ALIAS = 'default'
+TASKS_LIST_CACHE_TIMEOUT = 300
+
+# Task statistics (see tasks/stats.py): seconds a user's stats stay cached (0 disables
+# the cache), and whether status/priority totals come from the trigger-maintained counters
+TASKS_STATS_CACHE_TIMEOUT = 60
+TASKS_STATS_COUNTERS = True
+
+# Delta sync (see tasks/sync.py): changes returned per request and how long
+# tombstones of deleted tasks are kept before older sync tokens expire
+TASKS_SYNC_MAX_CHANGES = 1000
+TASKS_TOMBSTONE_RETENTION_DAYS = 90
+
+# Recurring tasks (see tasks/recurrence.py): the generate_occurrences command materializes
+# occurrences due within this many days, at most TASKS_RECURRENCE_MAX_PER_RULE per rule and run
+TASKS_RECURRENCE_HORIZON_DAYS = 30
+TASKS_RECURRENCE_MAX_PER_RULE = 400
+
+# Authenticated users are cached by id for this many seconds; 0 disables the cache
+USERS_AUTH_CACHE_TIMEOUT = 60
+
+# Request instrumentation (see task_management_api/metrics.py): Server-Timing headers,
+# histograms at /metrics, and a log of slow requests' SQL
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')  # Bearer token required for /metrics when set
+METRICS_ALLOWED_IPS = ('127.0.0.1', '::1')  # Without a token; behind a local reverse proxy every client is loopback
+METRICS_SLOW_REQUEST_MS = int(os.environ.get('METRICS_SLOW_REQUEST_MS', 2000))  # 0 disables the log
+METRICS_SLOW_REQUEST_MAX_QUERIES = 100  # SQL statements kept per request for the log
+
+# Admin purges delete rows in batches of this size, committing after each batch
+PURGE_BATCH_SIZE = 1000
+
+# Application logging; set TASKS_LOG_LEVEL=DEBUG to trace task state changes and user deletions
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'structured': {'format': 'level=%(levelname)s logger=%(name)s msg="%(message)s"'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'structured'},
+    },
+    'loggers': {
+        'tasks': {'handlers': ['console'], 'level': os.environ.get('TASKS_LOG_LEVEL', 'WARNING')},
+        'users': {'handlers': ['console'], 'level': os.environ.get('TASKS_LOG_LEVEL', 'WARNING')},
+        'task_management_api.metrics': {'handlers': ['console'], 'level': 'WARNING'},  # Slow requests
+    },
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=300),  # Set token lifetime here
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
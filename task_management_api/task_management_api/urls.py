@@ -1,9 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from .metrics import metrics_view
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),  # Prometheus request histograms (local clients only)
     path('api/', include('tasks.urls')),  # Include task URLs
     path('api/', include('users.urls')),   # Include user URLs
     path('api/', include('categories.urls')),  # Include categories url
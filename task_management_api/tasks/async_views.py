@@ -0,0 +1,175 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound
+from rest_framework.request import Request
+
+from categories.resolver import CategoryResolver
+from task_management_api.metrics import timed
+from users.authentication import CachedJWTAuthentication
+from .cache import get_cache, get_timeout, is_in_process, list_cache_key, record
+from .conditional import latest, not_modified_response, set_validator_headers, task_etag, task_list_etag
+from .filters import filter_tasks
+from .models import Task, TaskTombstone
+from .pagination import TaskKeysetPagination
+from .serializers import TaskRowSerializer, TaskSerializer
+from .views import TaskDetailView, TaskFilterView, TaskListView
+
+
+async def cache_call(func, *args):
+    """
+    Call a function that reads or writes the task cache. The in-process LocMem
+    cache does not block, so it is called inline; other backends (e.g. the file
+    cache used with CACHE_DIR) do I/O and are called in a worker thread.
+    """
+    if is_in_process(get_cache()):
+        return func(*args)
+    return await sync_to_async(func, thread_sensitive=False)(*args)
+
+
+class AsyncTaskReadView(View):
+    """
+    Base for async-native versions of the hot task read endpoints.
+
+    GET requests are authenticated and served entirely with the async ORM, so
+    under ASGI they never wait for the single thread that sync views share.
+    Every other method is delegated to `sync_view`, the DRF view serving the
+    same URL, so writes keep their validation and cache invalidation.
+    Responses match the DRF views, including ETag/Last-Modified handling and
+    the per-user list cache (see cache_call()).
+    """
+    sync_view = None  # DRF view handling the non-GET methods
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))  # Token-authenticated, like the DRF views
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET':
+            return await sync_to_async(self.sync_view.as_view())(request, *args, **kwargs)
+
+        request = Request(request)  # For query_params and absolute URLs; authentication happens below
+        try:
+            request.user = await self.authenticate(request)
+            return await self.get(request, *args, **kwargs)
+        except ValidationError as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except APIException as exc:
+            return self.error_response(exc)
+
+    async def authenticate(self, request):
+        """
+        Return the authenticated user or raise NotAuthenticated/AuthenticationFailed.
+        """
+        forced_user = getattr(request._request, '_force_auth_user', None)
+        if forced_user is not None:
+            return forced_user  # APIClient.force_authenticate, honoured as DRF's Request does
+        result = await CachedJWTAuthentication().aauthenticate(request)
+        if result is None:
+            raise NotAuthenticated()
+        return result[0]
+
+    def error_response(self, exc):
+        data = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+        response = JsonResponse(data, status=exc.status_code)
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            response['WWW-Authenticate'] = CachedJWTAuthentication().authenticate_header(None)
+        return response
+
+
+class AsyncTaskListView(AsyncTaskReadView):
+    """
+    Async GET of the authenticated user's task list (see TaskListView).
+    """
+    sync_view = TaskListView
+
+    async def filter_queryset(self, request, queryset):
+        return queryset
+
+    async def get_list_validators(self, request, queryset):
+        """
+        Return (etag, last_modified) for the list, as TaskRowListMixin does.
+        """
+        stats = await queryset.order_by().aaggregate(
+            last_modified=Max('updated_at'), category_modified=Max('category__updated_at'), count=Count('id'),
+        )
+        deleted = await TaskTombstone.objects.filter(user=request.user).aaggregate(last=Max('deleted_at'))
+        last_modified = latest(stats['last_modified'], stats['category_modified'], deleted['last'])
+        return task_list_etag(request, stats['count'], last_modified), last_modified
+
+    async def get(self, request, *args, **kwargs):
+        timeout = get_timeout()
+        cache = get_cache()
+        key = await cache_call(list_cache_key, request) if timeout else None
+
+        # Same flow as TaskRowListMixin.list: a cache hit answers without a query
+        cached = await cache_call(cache.get, key) if key else None
+        if cached is not None:
+            data, validators = cached
+            await cache_call(record, 'hits')
+        else:
+            queryset = await self.filter_queryset(request, Task.objects.for_user(request.user))
+            validators = await self.get_list_validators(request, queryset)
+
+        not_modified = not_modified_response(request, *validators)
+        if not_modified is not None:
+            return not_modified
+
+        if cached is not None:
+            response = JsonResponse(data)
+            response['X-Cache'] = 'HIT'
+        else:
+            paginator = TaskKeysetPagination()
+            rows = await paginator.apaginate_queryset(queryset.values(*TaskRowSerializer.values_fields), request)
+            with timed('serialize'):
+                data = paginator.get_paginated_data(TaskRowSerializer().serialize(rows))
+            response = JsonResponse(data)
+            if key:
+                await cache_call(cache.set, key, (data, validators), timeout)
+                await cache_call(record, 'misses')
+                response['X-Cache'] = 'MISS'
+        set_validator_headers(response, *validators)
+        return response
+
+
+class AsyncTaskFilterView(AsyncTaskListView):
+    """
+    Async GET of the filtered and sorted task list (see TaskFilterView).
+    """
+    sync_view = TaskFilterView
+
+    async def filter_queryset(self, request, queryset):
+        categories = CategoryResolver.for_request(request)
+        if request.query_params.get('category'):
+            await categories.aload()  # filter_tasks then resolves the name without a query
+        return filter_tasks(queryset, request.query_params, request.user, categories)
+
+
+class AsyncTaskDetailView(AsyncTaskReadView):
+    """
+    Async GET of a single task (see TaskDetailView).
+    """
+    sync_view = TaskDetailView
+
+    async def get(self, request, pk, *args, **kwargs):
+        try:
+            task = await Task.objects.for_user(request.user).with_related().aget(pk=pk)
+        except Task.DoesNotExist:
+            raise NotFound(f"No {Task._meta.object_name} matches the given query.")
+
+        validators = (
+            task_etag(task.pk, task.updated_at, task.category.name), latest(task.updated_at, task.category.updated_at),
+        )
+        not_modified = not_modified_response(request, *validators)
+        if not_modified is not None:
+            return not_modified
+
+        with timed('serialize'):
+            data = TaskSerializer(task).data
+        response = JsonResponse(data)
+        set_validator_headers(response, *validators)
+        return response
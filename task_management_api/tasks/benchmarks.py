@@ -0,0 +1,257 @@
+import platform
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from categories.models import TaskCategory
+from users.models import User
+from .filters import SORT_FIELDS
+from .models import Task
+from .serializers import TaskRowSerializer, TaskSerializer
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+
+@dataclass
+class Dataset:
+    """
+    Users, categories and tasks created by generate_dataset().
+    """
+    users: list
+    categories: dict  # {user_id: [category, ...]}
+    task_ids: dict = field(default_factory=dict)  # {user_id: [task_id, ...]}
+
+
+def generate_dataset(users=10, categories=5, tasks=1000, seed=0):
+    """
+    Create `users` users, each with `categories` categories and `tasks` tasks.
+
+    Tasks mix statuses, priorities, completion and past/future due dates so
+    every filter matches a realistic share of rows. All rows are written with
+    bulk_create, and the users share one password hash (BENCHMARK_PASSWORD) so
+    generating thousands of users does not hash thousands of passwords.
+    """
+    rng = random.Random(seed)
+    prefix = f'bench-{time.time_ns()}'
+    password = make_password(BENCHMARK_PASSWORD)
+    User.objects.bulk_create([
+        User(username=f'{prefix}-{index}', email=f'{prefix}-{index}@example.com', password=password)
+        for index in range(users)
+    ])
+    created = list(User.objects.filter(username__startswith=f'{prefix}-').order_by('id'))
+    TaskCategory.objects.bulk_create([
+        TaskCategory(name=f'{prefix}-{user.id}-{index}', user=user)
+        for user in created for index in range(categories)
+    ])
+    dataset = Dataset(users=created, categories={user.id: [] for user in created})
+    for category in TaskCategory.objects.filter(user__in=created).order_by('id'):
+        dataset.categories[category.user_id].append(category)
+
+    now = timezone.now()
+    for user in created:
+        batch = []
+        for index in range(tasks):
+            is_completed = rng.random() < 0.3
+            batch.append(Task(
+                title=f'Task {index}', description='Generated for benchmarking',
+                due_date=now + timedelta(hours=rng.randint(-24 * 30, 24 * 90)),
+                priority=rng.choice((Task.LOW, Task.MEDIUM, Task.HIGH)),
+                status=Task.COMPLETED if is_completed else Task.PENDING, is_completed=is_completed,
+                user=user, category=rng.choice(dataset.categories[user.id]),
+            ))
+        Task.objects.bulk_create(batch, batch_size=1000)
+        dataset.task_ids[user.id] = list(Task.objects.for_user(user).values_list('id', flat=True))
+    return dataset
+
+
+def summarize(name, timings, queries=None, items=1):
+    """
+    Summarize the wall-clock timings (in seconds) of one benchmark.
+    `items` is the number of rows/operations each run processes.
+    """
+    timings = sorted(timings)
+    mean = statistics.fmean(timings)
+    return {
+        'name': name,
+        'runs': len(timings),
+        'mean_ms': mean * 1000,
+        'p50_ms': statistics.median(timings) * 1000,
+        'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+        'min_ms': timings[0] * 1000,
+        'ops_per_sec': items / mean if mean else 0.0,
+        'queries': queries,
+    }
+
+
+def measure(name, func, repeat, items=1, setup=None):
+    """
+    Time `repeat` runs of func, counting the queries of the first one.
+    `setup`, when given, runs untimed before each run and its result is passed to func.
+    """
+    timings, queries = [], None
+    for run in range(repeat):
+        argument = setup() if setup else None
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            func(argument) if setup else func()
+            timings.append(time.perf_counter() - started)
+        if run == 0:
+            queries = len(captured)
+    return summarize(name, timings, queries, items)
+
+
+class BenchmarkSuite:
+    """
+    Micro-benchmarks of the task API, run in-process through the Django test
+    client against a generated dataset.
+    """
+    def __init__(self, dataset, repeat=20, stdout=None):
+        self.dataset = dataset
+        self.repeat = repeat
+        self.stdout = stdout
+        self.user = dataset.users[0]
+        # Any host the project accepts ('localhost' is always allowed while DEBUG is on)
+        host = next((host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost')
+        self.client = Client(HTTP_HOST=host)
+        token = RefreshToken.for_user(self.user).access_token
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        self.rng = random.Random(1)
+        self.results = []
+
+    def record(self, result):
+        self.results.append(result)
+        if self.stdout:
+            queries = '' if result['queries'] is None else f"  {result['queries']:3d} queries"
+            self.stdout.write(
+                f"{result['name']:50} {result['mean_ms']:9.2f} ms  p95 {result['p95_ms']:9.2f} ms"
+                f"  {result['ops_per_sec']:12,.1f} ops/s{queries}"
+            )
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params or {}, **self.auth)
+        assert response.status_code == 200, (url, params, response.status_code)
+        return response
+
+    def run(self):
+        self.bench_serializers()
+        self.bench_filters()
+        self.bench_toggles()
+        self.bench_bulk_delete()
+        self.bench_login()
+        return self.results
+
+    def bench_serializers(self):
+        queryset = Task.objects.for_user(self.user).order_by('id')
+        count = queryset.count()
+        self.record(measure(
+            'serializer/TaskSerializer', lambda: TaskSerializer(queryset.with_related(), many=True).data,
+            self.repeat, items=count,
+        ))
+        self.record(measure(
+            'serializer/TaskRowSerializer',
+            lambda: TaskRowSerializer().serialize(queryset.values(*TaskRowSerializer.values_fields)),
+            self.repeat, items=count,
+        ))
+
+    def get_filters(self):
+        """
+        Return the TaskFilterView parameter sets to benchmark, keyed by name.
+        """
+        return {
+            'none': {},
+            'status': {'status': Task.PENDING},
+            'priority': {'priority': 'High'},
+            'priority_range': {'priority_min': 'Medium', 'priority_max': 'High'},
+            'category': {'category': self.dataset.categories[self.user.id][0].name},
+            'due_date': {'due_date': timezone.localdate().isoformat()},
+            'overdue': {'overdue': 'true'},
+            'is_completed': {'is_completed': 'false'},
+        }
+
+    def bench_filters(self):
+        url = reverse('task-filter')
+        with override_settings(TASKS_LIST_CACHE_TIMEOUT=0):  # Measure the database path, not the list cache
+            for filter_name, params in self.get_filters().items():
+                for sort in [None] + SORT_FIELDS:
+                    query = dict(params, sort_by=sort) if sort else params
+                    self.record(measure(
+                        f'filter/{filter_name}/sort={sort or "id"}', lambda: self.get(url, query), self.repeat,
+                    ))
+        self.record(measure('list/cached', lambda: self.get(reverse('task-list')), self.repeat))
+
+    def bench_toggles(self):
+        task_ids = self.dataset.task_ids[self.user.id]
+        for name in ('task-toggle-complete', 'task-toggle-incomplete'):
+            self.record(measure(
+                f'toggle/{name}',
+                lambda pk: self.client.patch(reverse(name, args=[pk]), **self.auth),
+                self.repeat, setup=lambda: self.rng.choice(task_ids),
+            ))
+
+    def bench_bulk_delete(self, batch=100):
+        user = self.dataset.users[-1]
+        token = RefreshToken.for_user(user).access_token
+        remaining = list(self.dataset.task_ids[user.id])
+        runs = min(self.repeat, len(remaining) // batch)
+        if not runs:
+            return
+
+        def take():
+            ids, remaining[:batch] = remaining[:batch], []
+            return ids
+
+        self.record(measure(
+            f'bulk_delete/{batch}',
+            lambda ids: self.client.delete(
+                reverse('task-bulk'), {'ids': ids}, content_type='application/json',
+                HTTP_AUTHORIZATION=f'Bearer {token}',
+            ),
+            runs, items=batch, setup=take,
+        ))
+
+    def bench_login(self):
+        data = {'username': self.user.username, 'password': BENCHMARK_PASSWORD}
+        self.record(measure(
+            'auth/jwt_login', lambda: self.client.post(reverse('token_obtain_pair'), data),
+            max(1, self.repeat // 4),  # Password hashing is deliberately slow
+        ))
+
+
+def environment():
+    """
+    Describe the environment results were measured in.
+    """
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'platform': platform.platform(),
+        'timestamp': timezone.now().isoformat(),
+    }
+
+
+def compare(results, baseline, threshold=0.10):
+    """
+    Compare mean timings with a baseline results file.
+    Returns [(name, baseline_ms, current_ms, change)] for every benchmark
+    present in both, and the subset slower than `threshold`.
+    """
+    previous = {result['name']: result for result in baseline['results']}
+    changes = [
+        (result['name'], previous[result['name']]['mean_ms'], result['mean_ms'],
+         result['mean_ms'] / previous[result['name']]['mean_ms'] - 1)
+        for result in results if result['name'] in previous and previous[result['name']]['mean_ms']
+    ]
+    return changes, [change for change in changes if change[3] > threshold]
@@ -0,0 +1,144 @@
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_GENERATION_KEY = 'tasks:generation:all'
+STATS_KEYS = {'hits': 'tasks:stats:hits', 'misses': 'tasks:stats:misses'}
+TIME_DEPENDENT_PARAMS = ('overdue',)  # Filters whose results change with the clock, not with writes
+
+
+def get_cache():
+    """
+    Return the cache backend used for task list responses.
+    """
+    return caches[getattr(settings, 'TASKS_CACHE_ALIAS', 'default')]
+
+
+def is_in_process(cache):
+    """
+    Return whether a cache backend answers from process memory, without I/O.
+    """
+    return isinstance(cache, (LocMemCache, DummyCache))
+
+
+def get_timeout():
+    """
+    Return how long cached list responses live; 0 disables the cache.
+    """
+    return getattr(settings, 'TASKS_LIST_CACHE_TIMEOUT', 300)
+
+
+def user_generation_key(user_id):
+    return f'tasks:generation:user:{user_id}'
+
+
+def get_generation(key):
+    """
+    Return the current value of a generation counter.
+    A missing counter starts from the current time in nanoseconds, so a counter
+    evicted from the cache can never come back at a value that was used before.
+    """
+    cache = get_cache()
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)  # Counter was missing or evicted
+
+
+def bump_now_and_on_commit(key):
+    """
+    Bump a generation counter straight away, so the rest of the transaction
+    never reads a stale page, and again once the transaction commits, so a
+    page a concurrent request cached from the pre-commit rows in between is
+    dropped as well. Outside a transaction the write is already committed.
+    """
+    bump_generation(key)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: bump_generation(key))
+
+
+def invalidate_user(user_id):
+    """
+    Invalidate every cached list response of one user.
+    Called from each write path that changes the user's tasks or categories,
+    after its writes, inside their transaction if they have one.
+    """
+    bump_now_and_on_commit(user_generation_key(user_id))
+
+
+def invalidate_all():
+    """
+    Invalidate the cached list responses of every user, e.g. after an admin purge.
+    """
+    bump_now_and_on_commit(GLOBAL_GENERATION_KEY)
+
+
+def get_user_version(user_id):
+    """
+    Return a token that changes whenever the user's task data is invalidated.
+    """
+    return f'{get_generation(GLOBAL_GENERATION_KEY)}.{get_generation(user_generation_key(user_id))}'
+
+
+def list_cache_key(request):
+    """
+    Build the cache key for a list request: user, data version, host, path and
+    the query parameters in a normalized (sorted, non-empty) order. Returns
+    None for time-dependent filters, which the cache must not serve.
+    """
+    if any(request.query_params.get(name) for name in TIME_DEPENDENT_PARAMS):
+        return None
+    params = sorted(
+        (name, value) for name, values in request.query_params.lists() for value in values if value != ''
+    )
+    digest = hashlib.md5(repr((request.get_host(), request.path, params)).encode()).hexdigest()
+    return f'tasks:list:{request.user.pk}:{get_user_version(request.user.pk)}:{digest}'
+
+
+def stats_cache_key(user_id):
+    """
+    Build the cache key for a user's task statistics at the current data version.
+    """
+    return f'tasks:statistics:{user_id}:{get_user_version(user_id)}'
+
+
+def record(outcome):
+    """
+    Count a cache hit or miss.
+    """
+    cache = get_cache()
+    key = STATS_KEYS[outcome]
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+    logger.debug("Task list cache %s", outcome)
+
+
+def get_stats():
+    """
+    Return the hit/miss counters and the resulting hit rate.
+    """
+    values = get_cache().get_many(STATS_KEYS.values())
+    hits = values.get(STATS_KEYS['hits'], 0)
+    misses = values.get(STATS_KEYS['misses'], 0)
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
@@ -0,0 +1,68 @@
+from django.core.checks import Error, Tags, Warning, register
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+
+# Triggers on tasks_task created by migrations 0013-0015, per database vendor.
+# They keep the search index, TaskCounter rows and category counts up to date.
+TRIGGERS = {
+    'sqlite': {
+        ('tasks', '0013_task_search_index'): (
+            'tasks_task_fts_insert', 'tasks_task_fts_delete', 'tasks_task_fts_update',
+        ),
+        ('tasks', '0014_task_counter'): (
+            'tasks_taskcounter_insert', 'tasks_taskcounter_delete', 'tasks_taskcounter_update',
+        ),
+        ('tasks', '0015_category_task_counts'): (
+            'tasks_category_counts_insert', 'tasks_category_counts_delete', 'tasks_category_counts_update',
+        ),
+    },
+    'postgresql': {
+        ('tasks', '0014_task_counter'): ('tasks_taskcounter_insert_delete', 'tasks_taskcounter_update'),
+        ('tasks', '0015_category_task_counts'): ('tasks_category_counts_insert_delete', 'tasks_category_counts_update'),
+    },
+}
+
+TRIGGER_QUERIES = {
+    'sqlite': "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'tasks_task'",
+    'postgresql': "SELECT tgname FROM pg_trigger WHERE tgrelid = 'tasks_task'::regclass AND NOT tgisinternal",
+}
+
+
+def get_trigger_names(connection):
+    """
+    Return the names of the triggers defined on tasks_task.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(TRIGGER_QUERIES[connection.vendor])
+        return {name for name, in cursor.fetchall()}
+
+
+@register(Tags.database)
+def check_task_triggers(app_configs, databases=None, **kwargs):
+    """
+    Report triggers on tasks_task that a migration created but that are gone,
+    e.g. because a later migration made SQLite rebuild the table, which drops
+    them silently and leaves counts and search results stale.
+    """
+    messages = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if connection.vendor not in TRIGGERS:
+            messages.append(Warning(
+                f"Task counters and category counts are not maintained on {connection.vendor}.",
+                hint="They rely on triggers written for SQLite and PostgreSQL only.",
+                id='tasks.W001',
+            ))
+            continue
+        applied = MigrationRecorder(connection).applied_migrations()
+        expected = {
+            name for migration, names in TRIGGERS[connection.vendor].items() if migration in applied for name in names
+        }
+        missing = sorted(expected - get_trigger_names(connection)) if expected else []
+        if missing:
+            messages.append(Error(
+                f"Triggers missing on tasks_task in database '{alias}': {', '.join(missing)}.",
+                hint="Rebuilding tasks_task drops them; re-create them in the migration that rebuilt the table.",
+                id='tasks.E001',
+            ))
+    return messages
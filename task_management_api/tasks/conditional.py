@@ -0,0 +1,131 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .cache import get_user_version
+
+
+def make_etag(*parts):
+    """
+    Return a strong, quoted ETag hashing the given validator parts.
+    """
+    return '"%s"' % hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+class PreconditionFailed(APIException):
+    """
+    Raised when an If-Match precondition does not hold, i.e. the resource was
+    changed by someone else since the client read it.
+    """
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The resource has been modified since it was retrieved. Fetch it again and retry."
+    default_code = 'precondition_failed'
+
+
+def if_match_holds(request, etag):
+    """
+    Return whether the request's If-Match header (if any) matches the ETag.
+    """
+    if_match = request.headers.get('If-Match')
+    if not if_match:
+        return True
+    etags = parse_etags(if_match)
+    return '*' in etags or etag in etags
+
+
+def request_params(request):
+    """
+    Return the query parameters in a normalized order, since they select the
+    page and filters and therefore change the representation.
+    """
+    return sorted((name, value) for name, values in request.query_params.lists() for value in values)
+
+
+def task_list_etag(request, count, last_modified):
+    """
+    Return the ETag of a task list page: the user's cache generation, the
+    filtered row count and latest change, and the request's URL and parameters.
+    """
+    return make_etag(
+        request.user.pk, get_user_version(request.user.pk), count, last_modified,
+        request.get_host(), request.path, request_params(request),
+    )
+
+
+def latest(*timestamps):
+    """
+    Return the latest of the given timestamps, ignoring missing ones.
+    """
+    return max(filter(None, timestamps), default=None)
+
+
+def task_etag(pk, updated_at, category_name):
+    """
+    Return the ETag of a single task.
+    """
+    return make_etag('task', pk, updated_at, category_name)
+
+
+def not_modified_response(request, etag, last_modified):
+    """
+    Return a 304 response when the client's If-None-Match / If-Modified-Since
+    validators still match, otherwise None.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validator_headers(response, etag, last_modified)
+    return response
+
+
+def set_validator_headers(response, etag, last_modified):
+    """
+    Attach the ETag and Last-Modified headers to a response.
+    """
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(int(last_modified.timestamp()))
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET requests with strong ETag and Last-Modified headers, and with
+    304 Not Modified when the client's validators still match, without
+    loading or serializing the object(s).
+
+    Views implement get_validators(), which must be cheap (an aggregate or a
+    single indexed lookup) and return (etag, last_modified) or None to skip
+    conditional handling for the request.
+    """
+    def get_validators(self, request, *args, **kwargs):
+        raise NotImplementedError("Views using ConditionalGetMixin must implement get_validators().")
+
+    def get_user_version(self):
+        """
+        Return the user's cache generation, which every write through the API bumps.
+        """
+        return get_user_version(self.request.user.pk)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """
+        Run the handler only when the client's cached copy is stale.
+        """
+        validators = self.get_validators(request, *args, **kwargs)
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        response = not_modified_response(request, *validators)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code == 200:
+                set_validator_headers(response, *validators)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,168 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from categories.resolver import CategoryResolver
+from .models import Task
+
+# Parameters understood by filter_tasks, shared by every endpoint that filters tasks
+FILTER_PARAMS = (
+    'status', 'priority', 'priority_min', 'priority_max', 'category', 'due_date',
+    'due_before', 'due_after', 'overdue', 'tz', 'is_completed', 'sort_by',
+)
+SORT_FIELDS = ['due_date', 'priority', 'created_at', 'updated_at']
+
+
+def get_request_timezone(tz_name=None):
+    """
+    Return the time zone date filters are evaluated in.
+    Uses the `tz` query parameter when given, otherwise the active time zone.
+    """
+    if not tz_name:
+        return timezone.get_current_timezone()
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError(f"Unknown time zone '{tz_name}'.")
+
+
+def start_of_day(day, tz):
+    """
+    Return the aware datetime at which the given calendar day starts in tz.
+    """
+    return timezone.make_aware(datetime.combine(day, time.min), tz)
+
+
+def day_bounds(value, tz):
+    """
+    Turn a 'YYYY-MM-DD' string into the half-open [start, end) datetime range
+    covering that day in tz, so due_date can be matched with an index range
+    instead of wrapping the column in a date cast.
+    """
+    try:
+        day = parse_date(value) if value else None
+    except ValueError:
+        day = None  # Well-formed but impossible, e.g. February 30th
+    if day is None:
+        raise ValidationError("Invalid due_date. Must be in 'YYYY-MM-DD' format.")
+    return start_of_day(day, tz), start_of_day(day + timedelta(days=1), tz)
+
+
+def parse_bound(value, tz, name):
+    """
+    Parse a due_before/due_after value.
+    Accepts a 'YYYY-MM-DD' date (meaning the start of that day in tz) or an
+    ISO 8601 datetime; naive datetimes are interpreted in tz.
+    """
+    try:
+        moment = parse_datetime(value)
+    except ValueError:
+        moment = None
+    if moment is None:
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValidationError(f"Invalid {name}. Must be a 'YYYY-MM-DD' date or an ISO 8601 datetime.")
+        return start_of_day(day, tz)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, tz)
+    return moment
+
+
+def parse_boolean(value, name):
+    """
+    Parse a 'true'/'false' query parameter.
+    """
+    if value.lower() not in ('true', 'false'):
+        raise ValidationError(f"Invalid {name}. Must be 'true' or 'false'.")
+    return value.lower() == 'true'
+
+
+def priority_rank(label, name):
+    """
+    Translate a priority label from the query string into its stored rank.
+    """
+    if label not in Task.PRIORITY_RANKS:
+        raise ValidationError(f"Invalid {name}. Must be 'Low', 'Medium', or 'High'.")
+    return Task.PRIORITY_RANKS[label]
+
+
+def filter_tasks(queryset, params, user, categories=None):
+    """
+    Apply the TaskFilterView filter and sort parameters to a task queryset.
+
+    `params` may be the request's query parameters or a plain dict (such as a
+    JSON filter expression). `categories` is the CategoryResolver used to look
+    up the category filter; pass the request's one to share its categories.
+    Raises ValidationError for invalid values.
+    """
+    def get(name):
+        value = params.get(name)
+        return None if value is None else str(value)
+
+    status = get('status')
+    priority = get('priority')
+    priority_min = get('priority_min')
+    priority_max = get('priority_max')
+    category = get('category')
+    due_date = get('due_date')
+    due_before = get('due_before')
+    due_after = get('due_after')
+    overdue = get('overdue')
+    sort_by = get('sort_by')
+    is_completed = get('is_completed')
+
+    if status:
+        if status not in ['Pending', 'Completed']:
+            raise ValidationError("Invalid status. Must be either 'Pending' or 'Completed'.")
+        queryset = queryset.filter(status=status)
+
+    if priority:
+        queryset = queryset.filter(priority=priority_rank(priority, 'priority'))
+
+    if priority_min:
+        queryset = queryset.filter(priority__gte=priority_rank(priority_min, 'priority_min'))
+
+    if priority_max:
+        queryset = queryset.filter(priority__lte=priority_rank(priority_max, 'priority_max'))
+
+    tz = get_request_timezone(get('tz'))  # Calendar days are evaluated in the caller's time zone
+
+    if due_date:
+        # Half-open range over the day so the due_date index can be used
+        start, end = day_bounds(due_date, tz)
+        queryset = queryset.filter(due_date__gte=start, due_date__lt=end)
+
+    if due_after:
+        queryset = queryset.filter(due_date__gte=parse_bound(due_after, tz, 'due_after'))
+
+    if due_before:
+        queryset = queryset.filter(due_date__lt=parse_bound(due_before, tz, 'due_before'))
+
+    if overdue:
+        overdue_tasks = Q(is_completed=False, due_date__lt=timezone.now())
+        queryset = queryset.filter(overdue_tasks if parse_boolean(overdue, 'overdue') else ~overdue_tasks)
+
+    if category:
+        # Check if the category exists and belongs to the user
+        resolved = (categories or CategoryResolver(user)).get_by_name(category)
+        if resolved is None:
+            raise ValidationError(f"Category '{category}' does not exist or does not belong to you.")
+        queryset = queryset.filter(category=resolved)  # Filter on the indexed category id, no join
+
+    if is_completed is not None:
+        is_completed = is_completed.lower() == 'true'
+        queryset = queryset.filter(is_completed=is_completed)
+
+    if sort_by:
+        if sort_by not in SORT_FIELDS:
+            raise ValidationError("Invalid sorting parameter. Must be 'due_date', 'priority', 'created_at', or 'updated_at'.")
+        queryset = queryset.order_by(sort_by)
+
+    return queryset
@@ -0,0 +1,114 @@
+import random
+import statistics
+import threading
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from categories.models import TaskCategory
+from tasks.models import Task
+from tasks.purge import purge_users
+from tasks.serializers import TaskRowSerializer
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Measure read throughput of the task list query while other threads write.
+    Runs against the configured database (the data must be visible to every
+    thread, so it is committed and purged afterwards). Compare journal modes by
+    running it with SQLITE_JOURNAL_MODE=DELETE and with the default WAL.
+    """
+    help = "Benchmark task list reads/sec and latency under concurrent task updates."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=5000, help="Number of tasks to generate.")
+        parser.add_argument('--readers', type=int, default=4, help="Reader threads.")
+        parser.add_argument('--writers', type=int, default=2, help="Writer threads.")
+        parser.add_argument('--duration', type=float, default=5.0, help="Seconds to run.")
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            journal_mode = 'n/a'
+            if connection.vendor == 'sqlite':
+                cursor.execute('PRAGMA journal_mode')
+                journal_mode = cursor.fetchone()[0]
+        self.stdout.write(f"Backend: {connection.vendor}, journal_mode: {journal_mode}")
+
+        user, task_ids = self.create_tasks(options['tasks'])
+        try:
+            results = self.run_threads(user, task_ids, options)
+        finally:
+            purge_users(User.objects.filter(pk=user.pk))
+
+        duration = options['duration']
+        latencies = sorted(results['latencies'])
+        self.stdout.write(f"Reads:  {len(latencies) / duration:10.1f} /sec")
+        if latencies:
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            self.stdout.write(f"        p50 {statistics.median(latencies) * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms")
+        self.stdout.write(f"Writes: {results['writes'] / duration:10.1f} /sec")
+        self.stdout.write(f"Lock errors: {results['errors']}")
+
+    def create_tasks(self, count):
+        """
+        Create a throwaway user with `count` tasks; the data is committed.
+        """
+        user = User.objects.create_user(
+            username=f'db-benchmark-{time.time_ns()}', email=f'db-benchmark-{time.time_ns()}@example.com',
+        )
+        category = TaskCategory.objects.create(name=f'db-benchmark-{time.time_ns()}', user=user)
+        due = timezone.now() + timedelta(days=1)
+        Task.objects.bulk_create([
+            Task(title=f'Task {index}', description='Benchmark task', due_date=due + timedelta(minutes=index),
+                 priority=index % 3 + 1, user=user, category=category)
+            for index in range(count)
+        ], batch_size=1000)
+        return user, list(Task.objects.for_user(user).values_list('id', flat=True))
+
+    def run_threads(self, user, task_ids, options):
+        deadline = time.perf_counter() + options['duration']
+        results = {'latencies': [], 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+
+        def read():
+            latencies = []
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    rows = Task.objects.for_user(user).order_by('-updated_at', '-id')
+                    list(rows.values(*TaskRowSerializer.values_fields)[:50])
+                    latencies.append(time.perf_counter() - started)
+            finally:
+                connection.close()  # Each thread owns its connection
+            with lock:
+                results['latencies'].extend(latencies)
+
+        def write():
+            writes = errors = 0
+            try:
+                while time.perf_counter() < deadline:
+                    try:
+                        with transaction.atomic():
+                            Task.objects.filter(pk=random.choice(task_ids)).update(
+                                title=f'Updated {writes}', updated_at=timezone.now(),
+                            )
+                        writes += 1
+                    except DatabaseError:
+                        errors += 1  # e.g. "database is locked" once busy_timeout expires
+            finally:
+                connection.close()
+            with lock:
+                results['writes'] += writes
+                results['errors'] += errors
+
+        threads = [threading.Thread(target=read) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=write) for _ in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
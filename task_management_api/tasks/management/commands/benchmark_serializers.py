@@ -0,0 +1,74 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from categories.models import TaskCategory
+from tasks.models import Task
+from tasks.serializers import TaskRowSerializer, TaskSerializer
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Compare TaskSerializer with the TaskRowSerializer fast path on a generated task list.
+    The data is created inside a transaction that is rolled back afterwards.
+    """
+    help = "Benchmark TaskSerializer against TaskRowSerializer (rows/sec) on a generated task list."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10000, help="Number of tasks to serialize.")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per serializer; the best run is reported.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.create_tasks(options['tasks'])
+            queryset = Task.objects.for_user(user).order_by('id')
+
+            def full_path():
+                return TaskSerializer(queryset.with_related(), many=True).data
+
+            def fast_path():
+                return TaskRowSerializer().serialize(queryset.values(*TaskRowSerializer.values_fields))
+
+            renderer = JSONRenderer()
+            if renderer.render(full_path()) != renderer.render(fast_path()):
+                self.stderr.write("Serializer outputs differ!")
+
+            results = {name: self.measure(func, options['repeat']) for name, func in
+                       (('TaskSerializer', full_path), ('TaskRowSerializer', fast_path))}
+            transaction.set_rollback(True)  # Leave the database untouched
+
+        for name, seconds in results.items():
+            self.stdout.write(f"{name:<18} {options['tasks'] / seconds:>12,.0f} rows/sec ({seconds * 1000:.1f} ms)")
+        speedup = results['TaskSerializer'] / results['TaskRowSerializer']
+        self.stdout.write(self.style.SUCCESS(f"Fast path speedup: {speedup:.1f}x"))
+
+    def create_tasks(self, count):
+        """
+        Create a throwaway user with `count` tasks spread over a few categories.
+        """
+        suffix = timezone.now().strftime('%Y%m%d%H%M%S%f')
+        user = User.objects.create(username=f'benchmark-{suffix}', email=f'benchmark-{suffix}@example.com')
+        categories = [TaskCategory.objects.create(name=f'Benchmark {suffix} {index}', user=user) for index in range(10)]
+        now = timezone.now()
+        Task.objects.bulk_create([
+            Task(title=f'Task {index}', description='Benchmark task', due_date=now + timedelta(hours=index),
+                 priority=index % 3 + 1, user=user, category=categories[index % len(categories)])
+            for index in range(count)
+        ], batch_size=1000)
+        return user
+
+    def measure(self, func, repeat):
+        """
+        Return the best wall-clock time of `repeat` runs of func.
+        """
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.recurrence import generate_occurrences, get_horizon
+
+
+class Command(BaseCommand):
+    """
+    Materialize the occurrences of recurring tasks due within the horizon.
+    Run it periodically (e.g. hourly from cron); each run only creates the
+    occurrences not generated yet, so overlapping or repeated runs are safe.
+    """
+    help = "Create the tasks of recurring series due within TASKS_RECURRENCE_HORIZON_DAYS (or --days)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="Horizon in days; defaults to the setting.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Recurrence rules processed per transaction.")
+
+    def handle(self, *args, **options):
+        horizon = timedelta(days=options['days']) if options['days'] is not None else get_horizon()
+        rules, tasks = generate_occurrences(timezone.now() + horizon, max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(f"Generated {tasks} tasks from {rules} recurrence rules."))
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from categories.models import TaskCategory
+from tasks.models import Task
+from tasks.purge import purge_users
+from users.models import User
+
+# Servers the command can start itself, keyed by label: (module, argv after the port)
+SERVERS = {
+    'wsgi': ('gunicorn', ['task_management_api.wsgi:application', '--workers', '1', '--threads', '8', '--bind']),
+    'asgi': ('uvicorn', ['task_management_api.asgi:application', '--workers', '1', '--no-access-log', '--port']),
+}
+
+
+class Command(BaseCommand):
+    """
+    Compare requests/sec and latency percentiles of the task read endpoints
+    when served through WSGI (gunicorn, sync DRF views) and ASGI (uvicorn,
+    async views via TASKS_ASYNC_VIEWS=1).
+
+    With --spawn the servers are started on free local ports against the
+    configured database; otherwise pass already running servers with
+    --target label=http://host:port. A throwaway user with generated tasks is
+    created for the run and purged afterwards.
+    """
+    help = "Load-test the task read endpoints under WSGI and ASGI servers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--spawn', nargs='*', choices=sorted(SERVERS), help="Start these servers locally.")
+        parser.add_argument('--target', action='append', default=[], help="label=base URL of a running server.")
+        parser.add_argument('--path', action='append', help="Path to request (default: list, filter and detail).")
+        parser.add_argument('--tasks', type=int, default=1000, help="Number of tasks to generate.")
+        parser.add_argument('--concurrency', type=int, default=32, help="Concurrent connections.")
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per target and path.")
+        parser.add_argument('--output', help="Write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        targets = dict(target.split('=', 1) for target in options['target'])
+        if not targets and not options['spawn']:
+            raise CommandError("Pass --spawn wsgi asgi and/or --target label=http://host:port.")
+        if settings.DATABASES['default']['NAME'] == ':memory:':
+            raise CommandError("The servers need a shared on-disk database.")
+
+        user, task_id = self.create_data(options['tasks'])
+        token = str(RefreshToken.for_user(user).access_token)
+        paths = options['path'] or ['/api/tasks/', '/api/tasks/filter/?sort_by=due_date', f'/api/tasks/{task_id}/']
+        processes = []
+        results = []
+        try:
+            for label in options['spawn'] or []:
+                port, process = self.spawn(label)
+                processes.append(process)
+                targets[label] = f'http://127.0.0.1:{port}'
+
+            for label, base_url in targets.items():
+                for path in paths:
+                    result = asyncio.run(self.run(base_url + path, token, options['concurrency'], options['duration']))
+                    result.update(target=label, path=path)
+                    results.append(result)
+                    self.stdout.write(
+                        f"{label:6} {path:45} {result['requests_per_sec']:9.1f} req/s  "
+                        f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  errors {result['errors']}"
+                    )
+        finally:
+            for process in processes:
+                process.terminate()
+                process.wait()
+            purge_users(User.objects.filter(pk=user.pk))
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({'concurrency': options['concurrency'], 'results': results}, output, indent=2)
+
+    def create_data(self, count):
+        """
+        Create a throwaway user with `count` tasks. Returns the user and one task id.
+        """
+        name = f'loadtest-{time.time_ns()}'
+        user = User.objects.create_user(username=name, email=f'{name}@example.com')
+        category = TaskCategory.objects.create(name=name, user=user)
+        due = timezone.now() + timedelta(days=1)
+        Task.objects.bulk_create([
+            Task(title=f'Task {index}', description='Load test task', due_date=due + timedelta(minutes=index),
+                 priority=index % 3 + 1, user=user, category=category)
+            for index in range(count)
+        ], batch_size=1000)
+        return user, Task.objects.for_user(user).values_list('id', flat=True).first()
+
+    def spawn(self, label):
+        """
+        Start a server on a free port and wait until it accepts connections.
+        """
+        module, argv = SERVERS[label]
+        if shutil.which(module) is None:
+            raise CommandError(f"{module} is not installed; it is needed to spawn the {label} server.")
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        bind = f'127.0.0.1:{port}' if label == 'wsgi' else str(port)
+        env = dict(os.environ, TASKS_ASYNC_VIEWS='1' if label == 'asgi' else '0')
+        process = subprocess.Popen(
+            [sys.executable, '-m', module, *argv, bind], cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        for _ in range(100):
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+                return port, process
+            except OSError:
+                time.sleep(0.1)
+        process.terminate()
+        raise CommandError(f"The {label} server did not start.")
+
+    async def run(self, url, token, concurrency, duration):
+        """
+        Issue GET requests from `concurrency` keep-alive connections for
+        `duration` seconds and summarize the latencies.
+        """
+        parts = urlsplit(url)
+        target = parts.path + (f'?{parts.query}' if parts.query else '')
+        request = (
+            f'GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\n'
+            f'Authorization: Bearer {token}\r\nAccept: application/json\r\n\r\n'
+        ).encode()
+        deadline = time.perf_counter() + duration
+        latencies, errors = [], 0
+
+        async def worker():
+            nonlocal errors
+            reader = writer = None
+            while time.perf_counter() < deadline:
+                try:
+                    if writer is None:
+                        reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+                    started = time.perf_counter()
+                    writer.write(request)
+                    status, keep_alive = await self.read_response(reader)
+                    latencies.append(time.perf_counter() - started)
+                    if status != 200:
+                        errors += 1
+                    if not keep_alive:
+                        writer.close()
+                        reader = writer = None
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    errors += 1
+                    reader = writer = None
+            if writer is not None:
+                writer.close()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        latencies.sort()
+
+        def percentile(fraction):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000 if latencies else 0.0
+
+        return {
+            'requests': len(latencies), 'errors': errors, 'requests_per_sec': len(latencies) / duration,
+            'p50_ms': percentile(0.50), 'p90_ms': percentile(0.90), 'p99_ms': percentile(0.99),
+        }
+
+    async def read_response(self, reader):
+        """
+        Read one HTTP/1.1 response; returns (status, whether the connection stays open).
+        """
+        head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        status = int(head[0].split()[1])
+        headers = dict(line.split(':', 1) for line in head[1:] if ':' in line)
+        headers = {name.strip().lower(): value.strip() for name, value in headers.items()}
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await reader.readexactly(int(headers.get('content-length', 0)))
+        return status, headers.get('connection', '').lower() != 'close'
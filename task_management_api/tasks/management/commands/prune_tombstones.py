@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from tasks.sync import get_retention, prune_tombstones
+
+
+class Command(BaseCommand):
+    """
+    Delete task tombstones older than the retention period.
+    Sync tokens issued before the cutoff are rejected, so clients holding
+    them fall back to a full sync instead of missing deletions.
+    """
+    help = "Delete task tombstones older than TASKS_TOMBSTONE_RETENTION_DAYS (or --days)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="Retention period in days; defaults to the setting.")
+
+    def handle(self, *args, **options):
+        older_than = timedelta(days=options['days']) if options['days'] is not None else get_retention()
+        deleted = prune_tombstones(older_than)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones older than {older_than.days} days."))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from categories.models import TaskCategory
+from tasks.stats import rebuild_category_counts, rebuild_counters
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Recompute the trigger-maintained task counts from the tasks themselves:
+    the per-user TaskCounter rows and the task_count/open_task_count of every
+    TaskCategory. Use it after restoring data or changing tasks with the
+    triggers disabled.
+    """
+    help = "Rebuild per-user task counters and per-category task counts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', type=int, help="Only rebuild the counts of this user id.")
+
+    def handle(self, *args, **options):
+        users = categories = None
+        if options['user']:
+            users = User.objects.filter(pk__in=options['user'])
+            categories = TaskCategory.objects.filter(user__in=users)
+        counters = rebuild_counters(users)
+        updated = rebuild_category_counts(categories)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {counters} user counters and {updated} category counts."))
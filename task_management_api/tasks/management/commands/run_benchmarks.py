@@ -0,0 +1,56 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tasks.benchmarks import BenchmarkSuite, compare, environment, generate_dataset
+from tasks.cache import invalidate_all
+from users.cache import invalidate_all as invalidate_all_users
+
+
+class Command(BaseCommand):
+    """
+    Run the API micro-benchmarks (serializers, every TaskFilterView filter and
+    sort, toggles, bulk deletes and JWT login) on a generated dataset and
+    write the results to JSON. The dataset is created inside a transaction
+    that is rolled back afterwards, so the database is left untouched.
+    """
+    help = "Benchmark the task API on generated data and write the results to JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5, help="Number of users to generate.")
+        parser.add_argument('--categories', type=int, default=5, help="Categories per user.")
+        parser.add_argument('--tasks', type=int, default=2000, help="Tasks per user.")
+        parser.add_argument('--repeat', type=int, default=20, help="Runs per benchmark.")
+        parser.add_argument('--output', default='benchmark-results.json', help="File the results are written to.")
+        parser.add_argument('--baseline', help="Earlier results file to compare against.")
+        parser.add_argument('--threshold', type=float, default=0.10, help="Slowdown reported as a regression.")
+        parser.add_argument('--fail-on-regression', action='store_true', help="Exit non-zero on regressions.")
+
+    def handle(self, *args, **options):
+        sizes = {key: options[key] for key in ('users', 'categories', 'tasks')}
+        try:
+            with transaction.atomic():
+                dataset = generate_dataset(**sizes)
+                self.stdout.write(f"Generated {sizes['users']} users x {sizes['categories']} categories "
+                                  f"x {sizes['tasks']} tasks")
+                results = BenchmarkSuite(dataset, repeat=options['repeat'], stdout=self.stdout).run()
+                transaction.set_rollback(True)  # Leave the database untouched
+        finally:
+            # Rolled-back ids will be reused, so nothing cached for them may survive the run
+            invalidate_all()
+            invalidate_all_users()
+
+        report = {'environment': environment(), 'dataset': sizes, 'repeat': options['repeat'], 'results': results}
+        with open(options['output'], 'w') as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}"))
+
+        if options['baseline']:
+            with open(options['baseline']) as baseline:
+                changes, regressions = compare(results, json.load(baseline), options['threshold'])
+            for name, before, after, change in changes:
+                style = self.style.ERROR if change > options['threshold'] else self.style.SUCCESS
+                self.stdout.write(style(f"{name:50} {before:9.2f} -> {after:9.2f} ms ({change:+.1%})"))
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f"{len(regressions)} benchmarks regressed by more than {options['threshold']:.0%}.")
@@ -0,0 +1,69 @@
+# Generated by Django 5.1 on 2026-10-18 19:00
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+PRIORITY_RANKS = {'Low': 1, 'Medium': 2, 'High': 3}
+
+
+def labels_to_ranks(apps, schema_editor):
+    """
+    Copy the old string priority of every task into the new rank column.
+    """
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.update(priority_rank=Case(
+        *[When(priority=label, then=Value(rank)) for label, rank in PRIORITY_RANKS.items()],
+        default=Value(PRIORITY_RANKS['Medium']),
+    ))
+
+
+def ranks_to_labels(apps, schema_editor):
+    """
+    Restore the string priority from the rank column when migrating backwards.
+    """
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.update(priority=Case(
+        *[When(priority_rank=rank, then=Value(label)) for label, rank in PRIORITY_RANKS.items()],
+        default=Value('Medium'),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_task_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_status_prio_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_priority_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='priority_rank',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Low'), (2, 'Medium'), (3, 'High')], default=2),
+        ),
+        migrations.RunPython(labels_to_ranks, ranks_to_labels),
+        migrations.RemoveField(
+            model_name='task',
+            name='priority',
+        ),
+        migrations.RenameField(
+            model_name='task',
+            old_name='priority_rank',
+            new_name='priority',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'status', 'priority'], name='task_user_status_prio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'priority'], name='task_user_priority_idx'),
+        ),
+    ]
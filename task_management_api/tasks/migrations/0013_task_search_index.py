@@ -0,0 +1,73 @@
+import warnings
+
+from django.db import migrations
+
+# SQLite: an external-content FTS5 table over tasks_task, kept in sync by triggers.
+# user_id is indexed too, so a search only walks the requesting user's postings,
+# and 2-3 character prefix indexes keep search-as-you-type prefix queries cheap.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE tasks_task_fts USING fts5(
+        title, description, user_id,
+        content='tasks_task', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, title, description, user_id)
+        VALUES (new.id, new.title, new.description, new.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description, user_id)
+        VALUES ('delete', old.id, old.title, old.description, old.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_task_fts_update AFTER UPDATE OF title, description, user_id ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description, user_id)
+        VALUES ('delete', old.id, old.title, old.description, old.user_id);
+        INSERT INTO tasks_task_fts(rowid, title, description, user_id)
+        VALUES (new.id, new.title, new.description, new.user_id);
+    END
+    """,
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS tasks_task_fts_insert',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_delete',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_update',
+    'DROP TABLE IF EXISTS tasks_task_fts',
+]
+
+# PostgreSQL: a GIN expression index matching the tsvector built by tasks/search.py
+POSTGRESQL_FORWARD = [
+    "CREATE INDEX task_search_idx ON tasks_task USING GIN "
+    "(to_tsvector('english', title || ' ' || description))",
+]
+POSTGRESQL_BACKWARD = ['DROP INDEX IF EXISTS task_search_idx']
+
+
+def run(statements, required=False):
+    def operation(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if required and vendor not in statements:
+            warnings.warn(f"No full-text index for {vendor}: task search falls back to LIKE scans.", RuntimeWarning)
+        for statement in statements.get(vendor, []):
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_task_tombstone'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}, required=True),
+            run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+    ]
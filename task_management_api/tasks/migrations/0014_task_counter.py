@@ -0,0 +1,135 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import NotSupportedError, migrations, models
+
+# Columns of tasks_taskcounter and the condition on a task row each one counts
+COUNTED = [
+    ('pending', "status = 'Pending'"),
+    ('completed', "status = 'Completed'"),
+    ('low', 'priority = 1'),
+    ('medium', 'priority = 2'),
+    ('high', 'priority = 3'),
+]
+COLUMNS = ', '.join(column for column, _ in COUNTED)
+
+
+def conditions(row, cast=''):
+    return ', '.join(f'({row}.{condition}){cast}' for _, condition in COUNTED)
+
+
+def decrements(row, cast=''):
+    return ', '.join(f'{column} = {column} - ({row}.{condition}){cast}' for column, condition in COUNTED)
+
+
+def upsert(row, table_prefix='', cast=''):
+    """
+    Add one task (the trigger's NEW row) to its user's counters, creating them if needed.
+    """
+    increments = ', '.join(f'{column} = {table_prefix}{column} + excluded.{column}' for column, _ in COUNTED)
+    return (
+        f'INSERT INTO tasks_taskcounter (user_id, total, {COLUMNS}) VALUES ({row}.user_id, 1, {conditions(row, cast)}) '
+        f'ON CONFLICT (user_id) DO UPDATE SET total = {table_prefix}total + 1, {increments}'
+    )
+
+
+def subtract(row, cast=''):
+    """
+    Remove one task (the trigger's OLD row) from its user's counters.
+    """
+    return f'UPDATE tasks_taskcounter SET total = total - 1, {decrements(row, cast)} WHERE user_id = {row}.user_id'
+
+
+CHANGED = '{old}.status IS DISTINCT FROM {new}.status OR {old}.priority IS DISTINCT FROM {new}.priority ' \
+          'OR {old}.user_id IS DISTINCT FROM {new}.user_id'
+
+SQLITE_FORWARD = [
+    f'CREATE TRIGGER tasks_taskcounter_insert AFTER INSERT ON tasks_task BEGIN {upsert("new")}; END',
+    f'CREATE TRIGGER tasks_taskcounter_delete AFTER DELETE ON tasks_task BEGIN {subtract("old")}; END',
+    # Django's save() rewrites every column, so only real changes touch the counters
+    f'CREATE TRIGGER tasks_taskcounter_update AFTER UPDATE OF status, priority, user_id ON tasks_task '
+    f'WHEN {CHANGED.format(old="old", new="new").replace("IS DISTINCT FROM", "IS NOT")} '
+    f'BEGIN {subtract("old")}; {upsert("new")}; END',
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS tasks_taskcounter_insert',
+    'DROP TRIGGER IF EXISTS tasks_taskcounter_delete',
+    'DROP TRIGGER IF EXISTS tasks_taskcounter_update',
+]
+
+POSTGRESQL_FORWARD = [
+    f"""
+    CREATE FUNCTION tasks_taskcounter_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            {subtract('OLD', '::int')};
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            {upsert('NEW', 'tasks_taskcounter.', '::int')};
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    'CREATE TRIGGER tasks_taskcounter_insert_delete AFTER INSERT OR DELETE ON tasks_task '
+    'FOR EACH ROW EXECUTE FUNCTION tasks_taskcounter_apply()',
+    f'CREATE TRIGGER tasks_taskcounter_update AFTER UPDATE OF status, priority, user_id ON tasks_task '
+    f'FOR EACH ROW WHEN ({CHANGED.format(old="OLD", new="NEW")}) EXECUTE FUNCTION tasks_taskcounter_apply()',
+]
+POSTGRESQL_BACKWARD = [
+    'DROP TRIGGER IF EXISTS tasks_taskcounter_insert_delete ON tasks_task',
+    'DROP TRIGGER IF EXISTS tasks_taskcounter_update ON tasks_task',
+    'DROP FUNCTION IF EXISTS tasks_taskcounter_apply()',
+]
+
+
+def run(statements, required=False):
+    def operation(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if required and vendor not in statements:
+            raise NotSupportedError(
+                f"Task counters are maintained by triggers, which are only written for {', '.join(statements)}."
+            )
+        for statement in statements.get(vendor, []):
+            schema_editor.execute(statement)
+    return operation
+
+
+def backfill(apps, schema_editor):
+    """
+    Count the existing tasks of every user.
+    """
+    sums = ', '.join(f'SUM(CASE WHEN {condition} THEN 1 ELSE 0 END)' for _, condition in COUNTED)
+    schema_editor.execute(
+        f'INSERT INTO tasks_taskcounter (user_id, total, {COLUMNS}) '
+        f'SELECT user_id, COUNT(*), {sums} FROM tasks_task GROUP BY user_id'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0013_task_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('low', models.IntegerField(default=0)),
+                ('medium', models.IntegerField(default=0)),
+                ('high', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}, required=True),
+            run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,93 @@
+from django.db import NotSupportedError, migrations
+
+
+def adjust(row, sign, cast=''):
+    """
+    Add (sign '+') or remove (sign '-') one task row to its category's counts.
+    """
+    return (
+        f'UPDATE categories_taskcategory SET task_count = task_count {sign} 1, '
+        f'open_task_count = open_task_count {sign} (NOT {row}.is_completed){cast} '
+        f'WHERE id = {row}.category_id'
+    )
+
+
+CHANGED = '{old}.category_id IS DISTINCT FROM {new}.category_id OR {old}.is_completed IS DISTINCT FROM {new}.is_completed'
+
+SQLITE_FORWARD = [
+    f'CREATE TRIGGER tasks_category_counts_insert AFTER INSERT ON tasks_task BEGIN {adjust("new", "+")}; END',
+    f'CREATE TRIGGER tasks_category_counts_delete AFTER DELETE ON tasks_task BEGIN {adjust("old", "-")}; END',
+    f'CREATE TRIGGER tasks_category_counts_update AFTER UPDATE OF category_id, is_completed ON tasks_task '
+    f'WHEN {CHANGED.format(old="old", new="new").replace("IS DISTINCT FROM", "IS NOT")} '
+    f'BEGIN {adjust("old", "-")}; {adjust("new", "+")}; END',
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS tasks_category_counts_insert',
+    'DROP TRIGGER IF EXISTS tasks_category_counts_delete',
+    'DROP TRIGGER IF EXISTS tasks_category_counts_update',
+]
+
+POSTGRESQL_FORWARD = [
+    f"""
+    CREATE FUNCTION tasks_category_counts_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            {adjust('OLD', '-', '::int')};
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            {adjust('NEW', '+', '::int')};
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    'CREATE TRIGGER tasks_category_counts_insert_delete AFTER INSERT OR DELETE ON tasks_task '
+    'FOR EACH ROW EXECUTE FUNCTION tasks_category_counts_apply()',
+    f'CREATE TRIGGER tasks_category_counts_update AFTER UPDATE OF category_id, is_completed ON tasks_task '
+    f'FOR EACH ROW WHEN ({CHANGED.format(old="OLD", new="NEW")}) EXECUTE FUNCTION tasks_category_counts_apply()',
+]
+POSTGRESQL_BACKWARD = [
+    'DROP TRIGGER IF EXISTS tasks_category_counts_insert_delete ON tasks_task',
+    'DROP TRIGGER IF EXISTS tasks_category_counts_update ON tasks_task',
+    'DROP FUNCTION IF EXISTS tasks_category_counts_apply()',
+]
+
+
+def run(statements, required=False):
+    def operation(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if required and vendor not in statements:
+            raise NotSupportedError(
+                f"Category task counts are maintained by triggers, which are only written for {', '.join(statements)}."
+            )
+        for statement in statements.get(vendor, []):
+            schema_editor.execute(statement)
+    return operation
+
+
+def backfill(apps, schema_editor):
+    """
+    Count the existing tasks of every category.
+    """
+    schema_editor.execute(
+        'UPDATE categories_taskcategory SET '
+        'task_count = (SELECT COUNT(*) FROM tasks_task WHERE category_id = categories_taskcategory.id), '
+        'open_task_count = (SELECT COUNT(*) FROM tasks_task '
+        'WHERE category_id = categories_taskcategory.id AND NOT is_completed)'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0014_task_counter'),
+        ('categories', '0004_taskcategory_task_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}, required=True),
+            run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
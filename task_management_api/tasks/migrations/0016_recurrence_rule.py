@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0015_category_task_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurrenceRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('frequency', models.CharField(choices=[('Daily', 'Daily'), ('Weekly', 'Weekly'), ('Monthly', 'Monthly')], max_length=10)),
+                ('interval', models.PositiveSmallIntegerField(default=1)),
+                ('by_weekday', models.CharField(blank=True, max_length=20)),
+                ('by_month_day', models.SmallIntegerField(blank=True, null=True)),
+                ('count', models.PositiveIntegerField(blank=True, null=True)),
+                ('until', models.DateTimeField(blank=True, null=True)),
+                ('next_occurrence', models.DateTimeField(blank=True, null=True)),
+                ('generated_count', models.PositiveIntegerField(default=1)),
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='recurrence', to='tasks.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['next_occurrence'], name='recurrence_next_idx')],
+            },
+        ),
+    ]
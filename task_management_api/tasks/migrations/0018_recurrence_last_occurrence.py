@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0017_tombstone_task_id_bigint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recurrencerule',
+            name='last_occurrence',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
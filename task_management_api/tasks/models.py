@@ -1,7 +1,62 @@
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models.sql import UpdateQuery
 from users.models import User  # Importing the User model
 from categories.models import TaskCategory  # Importing the TaskCategory model
 
+class TaskQuerySet(models.QuerySet):
+    """
+    Reusable queryset for Task lookups.
+    Every task view builds on this so the relations read during serialization
+    are loaded in the same query instead of once per row.
+    """
+
+    # Relations read by TaskSerializer.to_representation
+    SERIALIZER_RELATED = ('category',)
+
+    def for_user(self, user):
+        """
+        Return only the tasks owned by the given user.
+        """
+        return self.filter(user=user)
+
+    def with_related(self):
+        """
+        Join the relations the serializers need so list endpoints run a
+        constant number of queries regardless of how many rows they return.
+        """
+        return self.select_related(*self.SERIALIZER_RELATED)
+
+    def update_returning(self, fields, **values):
+        """
+        Update the matching rows and return the given fields of each updated row
+        as a dict. On backends that support UPDATE ... RETURNING (PostgreSQL,
+        SQLite 3.35+) this is a single statement; elsewhere the rows are locked,
+        updated and read back in one transaction.
+        """
+        connection = connections[self.db]
+        model_fields = [self.model._meta.get_field(name) for name in fields]
+        if connection.vendor == 'postgresql' or (
+            connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 35)
+        ):
+            query = self.query.chain(UpdateQuery)
+            query.add_update_values(values)
+            sql, params = query.get_compiler(self.db).as_sql()
+            returning = ', '.join(connection.ops.quote_name(field.column) for field in model_fields)
+            with connection.cursor() as cursor:
+                cursor.execute(f'{sql} RETURNING {returning}', params)
+                rows = cursor.fetchall()
+            return [
+                {field.name: field.to_python(value) for field, value in zip(model_fields, row)} for row in rows
+            ]
+
+        with transaction.atomic(using=self.db):
+            ids = list(self.select_for_update().values_list('pk', flat=True))
+            if not ids:
+                return []
+            self.model._base_manager.using(self.db).filter(pk__in=ids).update(**values)
+            return list(self.model._base_manager.using(self.db).filter(pk__in=ids).values(*fields))
+
+
 # Defining the Task model 
 class Task(models.Model):
     """
@@ -10,17 +65,18 @@ class Task(models.Model):
     due date, priority, status, and completion.
     """
 
-    # Priority levels for tasks
-    LOW = 'Low'
-    MEDIUM = 'Medium'
-    HIGH = 'High'
+    # Priority levels for tasks, stored as ordinal ranks so they sort correctly
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
 
-    # Choices for priority field
+    # Choices for priority field (rank, label); the API speaks in labels
     PRIORITY_LEVELS = [
         (LOW, 'Low'),
         (MEDIUM, 'Medium'),
         (HIGH, 'High'),
     ]
+    PRIORITY_RANKS = {label: rank for rank, label in PRIORITY_LEVELS}  # Label -> rank lookup
 
     # Status choices for tasks
     PENDING = 'Pending'
@@ -36,7 +92,7 @@ class Task(models.Model):
     title = models.CharField(max_length=255)  # The title of the task
     description = models.TextField()  # Detailed description of the task
     due_date = models.DateTimeField()  # Date and time the task is due
-    priority = models.CharField(max_length=10, choices=PRIORITY_LEVELS, default=MEDIUM)  # Priority level with default as 'Medium'
+    priority = models.PositiveSmallIntegerField(choices=PRIORITY_LEVELS, default=MEDIUM)  # Priority rank with default as 'Medium'
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)  # Status of the task (Pending/Completed)
     created_at = models.DateTimeField(auto_now_add=True)  # Timestamp when task is created
     updated_at = models.DateTimeField(auto_now=True)  # Timestamp when task is updated
@@ -44,8 +100,103 @@ class Task(models.Model):
     category = models.ForeignKey(TaskCategory, on_delete=models.CASCADE)  # Task category (linked to TaskCategory model)
     is_completed = models.BooleanField(default=False)  # Boolean to track if the task is completed
 
+    objects = TaskQuerySet.as_manager()  # Manager exposing the shared task queryset
+
+    class Meta:
+        # Composite indexes matching the query shapes of the task views:
+        # every lookup is scoped by user, then filtered and/or sorted below
+        indexes = [
+            models.Index(fields=['user', 'is_completed', 'due_date'], name='task_user_done_due_idx'),
+            models.Index(fields=['user', 'status', 'priority'], name='task_user_status_prio_idx'),
+            models.Index(fields=['user', 'priority'], name='task_user_priority_idx'),
+            models.Index(fields=['user', 'due_date'], name='task_user_due_idx'),
+            models.Index(fields=['user', 'created_at'], name='task_user_created_idx'),
+            models.Index(fields=['user', 'updated_at'], name='task_user_updated_idx'),
+            models.Index(fields=['user', 'category'], name='task_user_category_idx'),
+        ]
+
     def __str__(self):
         """
         Return the string representation of the task.
         """
         return self.title  # Return the task title for easy identification
+
+
+# Record of a deleted task, kept so sync clients can learn about deletions
+class TaskTombstone(models.Model):
+    """
+    Compact marker left behind when a task is deleted.
+    The delta sync endpoint reads these by their increasing id, so clients
+    holding an older sync token can drop tasks that no longer exist.
+    """
+    task_id = models.PositiveBigIntegerField()  # Primary key of the deleted task
+    user = models.ForeignKey(User, on_delete=models.CASCADE)  # The user who owned the task
+    deleted_at = models.DateTimeField(auto_now_add=True)  # Timestamp when the task was deleted
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id'], name='tombstone_user_id_idx'),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_at_idx'),
+        ]
+
+    def __str__(self):
+        return f'Deleted task {self.task_id}'
+
+
+# Per-user task counts, maintained by database triggers
+class TaskCounter(models.Model):
+    """
+    Running totals of a user's tasks by status and priority, so the stats
+    endpoint can read them with one primary-key lookup however many tasks the
+    user has. Triggers on tasks_task (migration 0014) keep the row current on
+    every insert, delete and status/priority change, whichever code path
+    issues it; rebuild_counters() in tasks/stats.py recomputes them.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)  # The user the counts belong to
+    total = models.IntegerField(default=0)  # All tasks
+    pending = models.IntegerField(default=0)  # Tasks with status 'Pending'
+    completed = models.IntegerField(default=0)  # Tasks with status 'Completed'
+    low = models.IntegerField(default=0)  # Tasks with priority 'Low'
+    medium = models.IntegerField(default=0)  # Tasks with priority 'Medium'
+    high = models.IntegerField(default=0)  # Tasks with priority 'High'
+
+
+# Recurrence rule of a repeating task
+class RecurrenceRule(models.Model):
+    """
+    Repeats a task (the series template) daily, weekly or monthly.
+
+    Occurrences are materialized as ordinary tasks by the
+    generate_occurrences command, a rolling horizon ahead, never in a request.
+    `next_occurrence` is the first due date not yet materialized (None once
+    the series has ended), so generation resumes where it stopped and each
+    occurrence is created exactly once. `last_occurrence` lets a replaced
+    rule continue after the occurrences already created.
+    """
+    DAILY = 'Daily'
+    WEEKLY = 'Weekly'
+    MONTHLY = 'Monthly'
+
+    FREQUENCY_CHOICES = [
+        (DAILY, 'Daily'),
+        (WEEKLY, 'Weekly'),
+        (MONTHLY, 'Monthly'),
+    ]
+
+    WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')  # RFC 5545 day codes, Monday first
+
+    task = models.OneToOneField(Task, on_delete=models.CASCADE, related_name='recurrence')  # The series template
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES)  # How often the task repeats
+    interval = models.PositiveSmallIntegerField(default=1)  # Repeat every `interval` days/weeks/months
+    by_weekday = models.CharField(max_length=20, blank=True)  # Weekly: comma-separated day codes, e.g. 'MO,WE'
+    by_month_day = models.SmallIntegerField(null=True, blank=True)  # Monthly: day of the month, -1 for the last
+    count = models.PositiveIntegerField(null=True, blank=True)  # Total occurrences, the template included
+    until = models.DateTimeField(null=True, blank=True)  # No occurrence is due after this
+    next_occurrence = models.DateTimeField(null=True, blank=True)  # First due date not yet materialized
+    generated_count = models.PositiveIntegerField(default=1)  # Occurrences materialized, the template included
+    last_occurrence = models.DateTimeField(null=True, blank=True)  # Due date of the latest occurrence materialized
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['next_occurrence'], name='recurrence_next_idx'),  # Rules due for generation
+        ]
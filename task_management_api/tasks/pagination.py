@@ -0,0 +1,205 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TaskKeysetPagination(BasePagination):
+    """
+    Opaque-cursor keyset pagination for task lists.
+
+    Pages are keyed on the queryset's active sort field with `id` as a
+    tiebreaker, so each page is fetched with an indexed range condition
+    and deep pages cost the same as the first one (unlike OFFSET).
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    # Sort fields the cursor may be keyed on, and the type of their values
+    datetime_fields = ('due_date', 'created_at', 'updated_at')
+    integer_fields = ('priority',)
+    sort_fields = datetime_fields + integer_fields + ('id',)
+
+    def get_page_size(self, request):
+        """
+        Return the requested page size, capped at the configured maximum.
+        """
+        page_size = getattr(settings, 'TASKS_PAGE_SIZE', 50)
+        max_page_size = getattr(settings, 'TASKS_MAX_PAGE_SIZE', 500)
+        requested = request.query_params.get(self.page_size_query_param)
+        if requested:
+            try:
+                page_size = int(requested)
+            except ValueError:
+                pass
+        return max(1, min(page_size, max_page_size))
+
+    def get_sort(self, queryset):
+        """
+        Return the (field, descending) pair the queryset is ordered by.
+        Falls back to `id` when the queryset has no explicit ordering.
+        """
+        ordering = [field for field in queryset.query.order_by if field.lstrip('-') != 'id']
+        if not ordering:
+            return 'id', False
+        field = ordering[0]
+        if field.lstrip('-') not in self.sort_fields:
+            raise ValueError(f"Cannot paginate on '{field}'.")
+        return field.lstrip('-'), field.startswith('-')
+
+    def get_page_queryset(self, queryset, request):
+        """
+        Return the queryset fetching the requested page plus one extra row,
+        which tells whether another page follows.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_sort(queryset)
+        self.cursor = self.decode_cursor(request)
+
+        # Walking backwards flips the ordering; the page is reversed afterwards
+        self.reverse = self.cursor is not None and self.cursor['reverse']
+        descending = self.descending != self.reverse
+        order = [f'-{name}' if descending else name for name in dict.fromkeys((self.field, 'id'))]
+        queryset = queryset.order_by(*order)
+        if self.cursor is not None:
+            queryset = queryset.filter(self.build_condition(self.cursor['value'], self.cursor['id'], descending))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        """
+        Record the fetched rows as the current page and return them in display order.
+        """
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = self.cursor is not None and (has_more if self.reverse else True)
+        self.page = rows
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """
+        Async counterpart of paginate_queryset, fetching the page with the async ORM.
+        """
+        return self.set_page([row async for row in self.get_page_queryset(queryset, request)])
+
+    def get_paginated_data(self, data):
+        return OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+
+    def build_condition(self, value, pk, descending):
+        """
+        Return the keyset condition selecting rows strictly after (value, pk).
+        """
+        op = 'lt' if descending else 'gt'
+        if self.field == 'id':
+            return Q(**{f'id__{op}': pk})
+        # The leading inclusive bound lets the database seek on the sort index
+        return Q(**{f'{self.field}__{op}e': value}) & (
+            Q(**{f'{self.field}__{op}': value}) | Q(**{f'id__{op}': pk})
+        )
+
+    def get_row_value(self, row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+    def encode_cursor(self, row, reverse):
+        """
+        Build the absolute URL pointing past (or before) the given row.
+        """
+        value = self.get_row_value(row, self.field)
+        if self.field in self.datetime_fields:
+            value = value.isoformat()
+        payload = {'f': self.field, 'v': value, 'i': self.get_row_value(row, 'id'), 'r': reverse}
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """
+        Decode the cursor query parameter, or return None on the first page.
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            if payload['f'] != self.field:
+                raise ValueError('Cursor does not match the current sort order.')
+            value = payload['v']
+            if self.field in self.datetime_fields:
+                value = parse_datetime(value)
+                if value is None:
+                    raise ValueError('Malformed cursor value.')
+            elif self.field in self.integer_fields and (not isinstance(value, int) or isinstance(value, bool)):
+                raise ValueError('Malformed cursor value.')
+            return {'value': value, 'id': int(payload['i']), 'reverse': bool(payload['r'])}
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class TaskSearchPagination(TaskKeysetPagination):
+    """
+    Keyset pagination over ranked search hits (see tasks/search.py), keyed on
+    (rank, id) with the same opaque cursors as the task lists.
+    """
+    sort_fields = ('rank',)
+
+    def paginate_search(self, search, request):
+        """
+        Return the requested page of hits from a TaskSearch.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = 'rank', False
+        self.cursor = self.decode_cursor(request)
+        self.reverse = self.cursor is not None and self.cursor['reverse']
+        after = None
+        if self.cursor is not None:
+            try:
+                after = (float(self.cursor['value']), self.cursor['id'])
+            except (TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+        return self.set_page(search.page(after, descending=self.reverse, limit=self.page_size + 1))
@@ -0,0 +1,142 @@
+import logging
+
+from django.conf import settings
+from django.contrib.admin.models import LogEntry
+from django.db import router, transaction
+from django.db.models import DO_NOTHING
+from django.db.models.deletion import get_candidate_relations_to_delete
+
+from categories.models import TaskCategory
+from users.cache import invalidate_all as invalidate_all_users
+from users.models import User
+from .models import RecurrenceRule, Task, TaskCounter, TaskTombstone
+from .cache import invalidate_all
+from .sync import record_deletions
+
+logger = logging.getLogger(__name__)
+
+
+def get_batch_size(requested=None):
+    """
+    Return the purge batch size: the requested value when it is a positive
+    integer, otherwise the PURGE_BATCH_SIZE setting.
+    """
+    try:
+        batch_size = int(requested)
+    except (TypeError, ValueError):
+        batch_size = getattr(settings, 'PURGE_BATCH_SIZE', 1000)
+    return max(1, batch_size)
+
+
+def is_referenced(model, ids, using):
+    """
+    Return whether any row still points at one of the given primary keys
+    through a relation whose on_delete Django would have to apply.
+    """
+    for related in get_candidate_relations_to_delete(model._meta):
+        if related.on_delete is DO_NOTHING:
+            continue
+        rows = related.related_model._base_manager.using(using)
+        if rows.filter(**{f'{related.field.name}__in': ids}).exists():
+            return True
+    return False
+
+
+def chunked_delete(queryset, batch_size, label=None, progress=None, before_delete=None):
+    """
+    Delete every row matched by the queryset in primary-key batches.
+
+    Each batch is a raw set-based DELETE committed in its own transaction, so
+    Django's Collector never loads related rows into memory and the write
+    lock is released between batches. Callers delete dependent rows first;
+    a batch that is still referenced (e.g. through a foreign key added since)
+    goes through QuerySet.delete() instead, so the relation's on_delete
+    applies rather than leaving rows dangling. `before_delete`, when given, is called with a
+    queryset of each batch inside its transaction, just before the DELETE.
+    Returns the number of rows deleted.
+    """
+    model = queryset.model
+    label = label or model._meta.label
+    using = router.db_for_write(model)
+    total, last_pk = 0, None
+
+    while True:
+        with transaction.atomic(using=using):
+            batch = queryset.order_by('pk')
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            ids = list(batch.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            rows = model._base_manager.using(using).filter(pk__in=ids)
+            if before_delete:
+                before_delete(rows)
+            if is_referenced(model, ids, using):
+                deleted = rows.delete()[1].get(model._meta.label, 0)
+            else:
+                # _raw_delete issues DELETE ... WHERE id IN (...) without collecting related objects
+                deleted = rows._raw_delete(using)
+        total += deleted
+        last_pk = ids[-1]
+        logger.info("Purged %d %s rows (%d so far)", deleted, label, total)
+        if progress:
+            progress(label, total)
+
+    return total
+
+
+def purge_tasks(batch_size=None, progress=None):
+    """
+    Delete every task in the system in batches, leaving tombstones so sync
+    clients learn about the deletions.
+    Returns a {label: count} map of deleted rows.
+    """
+    batch_size = get_batch_size(batch_size)
+    deleted = {
+        'recurrence rules': chunked_delete(RecurrenceRule.objects.all(), batch_size, 'recurrence rules', progress),
+        'tasks': chunked_delete(Task.objects.all(), batch_size, 'tasks', progress, record_deletions),
+    }
+    invalidate_all()  # Every user's cached task lists are now stale
+    return deleted
+
+
+def purge_users(users, batch_size=None, progress=None):
+    """
+    Delete the given users and everything that references them in batches.
+
+    Dependent rows are removed in a fixed, foreign-key-safe order (recurrence
+    rules, tasks, task tombstones, task counters, categories, group and
+    permission links, admin log entries, then the users) so no batch ever
+    leaves a dangling reference behind.
+    Surviving users whose tasks were filed under a purged category get tombstones.
+    Returns a {label: count} map of deleted rows.
+    """
+    batch_size = get_batch_size(batch_size)
+    user_ids = users.values('pk')
+    categories = TaskCategory.objects.filter(user__in=user_ids)
+
+    def record_surviving_deletions(tasks):
+        # Only tasks of surviving users need tombstones; the purged users' own are deleted next
+        record_deletions(tasks.exclude(user__in=user_ids))
+
+    # Tasks of other users may still point at a purged user's category
+    tasks = Task.objects.filter(user__in=user_ids) | Task.objects.filter(category__in=categories.values('pk'))
+
+    steps = [
+        ('recurrence rules', RecurrenceRule.objects.filter(task__in=tasks.values('pk')), None),
+        ('tasks', tasks, record_surviving_deletions),
+        ('task tombstones', TaskTombstone.objects.filter(user__in=user_ids), None),
+        ('task counters', TaskCounter.objects.filter(user__in=user_ids), None),  # After tasks, whose triggers update them
+        ('categories', categories, None),
+        ('user groups', User.groups.through.objects.filter(user__in=user_ids), None),
+        ('user permissions', User.user_permissions.through.objects.filter(user__in=user_ids), None),
+        ('admin log entries', LogEntry.objects.filter(user__in=user_ids), None),
+        ('users', users, None),
+    ]
+    deleted = {
+        label: chunked_delete(queryset, batch_size, label, progress, before_delete)
+        for label, queryset, before_delete in steps
+    }
+    invalidate_all()  # Surviving users may have lost tasks filed under purged categories
+    invalidate_all_users()  # Purged users must stop authenticating
+    return deleted
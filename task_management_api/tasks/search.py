@@ -0,0 +1,128 @@
+import re
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+
+from .models import Task
+
+MAX_TERMS = 16  # Longer queries are truncated rather than expanded into huge index scans
+MIN_PREFIX_LENGTH = 2  # A shorter last term is matched as a whole word, not as a prefix of thousands of words
+
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+# Relative weight of a match in the title versus the description when ranking
+TITLE_WEIGHT = 4.0
+DESCRIPTION_WEIGHT = 1.0
+
+_backends = {}  # {database alias: backend name}, detected once per process
+
+
+def search_terms(query):
+    """
+    Split a user query into plain word terms. Operators and quotes are dropped,
+    so user input can never be a syntax error in the full-text query language.
+    """
+    terms = TERM_RE.findall(query or '')[:MAX_TERMS]
+    if not terms:
+        raise ValidationError("The search query 'q' must contain at least one word.")
+    return terms
+
+
+def get_backend():
+    """
+    Return the search backend of the default database: 'fts5' (SQLite with the
+    tasks_task_fts table from migration 0013), 'postgresql' (tsvector), or
+    'like' when neither is available.
+    """
+    backend = _backends.get(connection.alias)
+    if backend is None:
+        if connection.vendor == 'postgresql':
+            backend = 'postgresql'
+        elif connection.vendor == 'sqlite' and 'tasks_task_fts' in connection.introspection.table_names():
+            backend = 'fts5'
+        else:
+            backend = 'like'
+        _backends[connection.alias] = backend
+    return backend
+
+
+class TaskSearch:
+    """
+    Ranked full-text search over the title and description of a user's tasks.
+
+    page() returns one page of hits as {'id', 'rank'} dicts ordered by rank
+    (lower is better) then id, so results can be keyset-paginated on
+    (rank, id). Ranks depend on index-wide term statistics and may shift
+    slightly as other tasks change.
+    """
+    def __init__(self, user, query):
+        self.user = user
+        self.terms = search_terms(query)
+        self.backend = get_backend()
+
+    def page(self, after=None, descending=False, limit=50):
+        """
+        Return up to `limit` hits following `after`, a (rank, id) pair.
+        """
+        if self.backend == 'like':
+            return self.like_page(after, descending, limit)
+        if self.backend == 'fts5':
+            matches, params = self.fts5_matches()
+        else:
+            matches, params = self.postgresql_matches()
+
+        order = 'DESC' if descending else 'ASC'
+        condition = ''
+        if after is not None:
+            op = '<' if descending else '>'
+            condition = f'WHERE rank {op} %s OR (rank = %s AND id {op} %s)'
+            params += [after[0], after[0], after[1]]
+        sql = f'SELECT id, rank FROM ({matches}) matches {condition} ORDER BY rank {order}, id {order} LIMIT %s'
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + [limit])
+            return [{'id': pk, 'rank': rank} for pk, rank in cursor.fetchall()]
+
+    def fts5_matches(self):
+        """
+        Match the terms in the title or description, the last one as a prefix
+        so results follow the user's typing, within the user's own postings
+        (user_id is an indexed column, so the match never scans other users' tasks).
+        """
+        phrases = [f'"{term}"' for term in self.terms]
+        if len(self.terms[-1]) >= MIN_PREFIX_LENGTH:
+            phrases[-1] += '*'
+        expression = f'user_id:"{self.user.pk}" AND {{title description}}:({" AND ".join(phrases)})'
+        sql = (
+            f'SELECT rowid AS id, bm25(tasks_task_fts, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}, 0.0) AS rank '
+            'FROM tasks_task_fts WHERE tasks_task_fts MATCH %s'
+        )
+        return sql, [expression]
+
+    def postgresql_matches(self):
+        """
+        Match against the expression indexed by migration 0013; ts_rank is
+        negated so that, as with bm25, lower ranks are better.
+        """
+        terms = [term.lower() for term in self.terms]
+        if len(terms[-1]) >= MIN_PREFIX_LENGTH:
+            terms[-1] += ':*'
+        vector = "setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', description), 'D')"
+        sql = (
+            f"SELECT id, -ts_rank({vector}, query) AS rank "
+            "FROM tasks_task, to_tsquery('english', %s) query "
+            "WHERE user_id = %s AND to_tsvector('english', title || ' ' || description) @@ query"
+        )
+        return sql, [' & '.join(terms), self.user.pk]
+
+    def like_page(self, after, descending, limit):
+        """
+        Unranked substring search for databases without a full-text index.
+        """
+        queryset = Task.objects.for_user(self.user)
+        for term in self.terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+        if after is not None:
+            queryset = queryset.filter(**{'id__lt' if descending else 'id__gt': after[1]})
+        ids = queryset.order_by('-id' if descending else 'id').values_list('id', flat=True)[:limit]
+        return [{'id': pk, 'rank': 0.0} for pk in ids]
@@ -1,18 +1,97 @@
+from django.core.exceptions import ValidationError
 from rest_framework import serializers
-from .models import Task
+from .models import RecurrenceRule, Task
+from .cache import invalidate_user
+from .conditional import PreconditionFailed
+from .recurrence import parse_rrule, to_rrule, validate_rule
 from categories.models import TaskCategory
+from categories.resolver import CategoryResolver
 from django.utils.timezone import make_aware
 from django.utils import timezone
 from datetime import datetime, time, date
 
+class PriorityField(serializers.Field):
+    """
+    Exposes the integer priority rank stored on Task as its string label.
+    Accepts 'Low', 'Medium' or 'High' on input and emits the same labels on output.
+    """
+    default_error_messages = {
+        'invalid': "Invalid priority. Must be 'Low', 'Medium', or 'High'.",
+    }
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str) or data not in Task.PRIORITY_RANKS:
+            self.fail('invalid')
+        return Task.PRIORITY_RANKS[data]  # Store the ordinal rank
+
+    def to_representation(self, value):
+        return dict(Task.PRIORITY_LEVELS).get(value)  # Emit the label
+
+
+class TaskCategoryField(serializers.PrimaryKeyRelatedField):
+    """
+    Category field that resolves ids through the request's CategoryResolver,
+    so only the user's own categories are accepted and validating any number
+    of tasks costs a single category query per request.
+    Without a request in the context it falls back to a plain pk lookup.
+    """
+
+    def get_resolver(self):
+        resolver = self.context.get('category_resolver')
+        request = self.context.get('request')
+        if resolver is None and request is not None:
+            resolver = CategoryResolver.for_request(request)
+        return resolver
+
+    def get_queryset(self):
+        request = self.context.get('request')
+        if request is not None:
+            return TaskCategory.objects.filter(user=request.user)  # Only offer the user's own categories
+        return super().get_queryset()
+
+    def to_internal_value(self, data):
+        resolver = self.get_resolver()
+        if resolver is None:
+            return super().to_internal_value(data)
+        if isinstance(data, str) and data.strip().isascii() and data.strip().isdigit():
+            pk = int(data)  # Form data sends ids as strings
+        elif isinstance(data, int) and not isinstance(data, bool):
+            pk = data
+        else:
+            self.fail('incorrect_type', data_type=type(data).__name__)  # Floats such as 1.7 are not truncated
+        category = resolver.get(pk)
+        if category is None:
+            self.fail('does_not_exist', pk_value=data)
+        return category
+
+
+class TaskBulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer that writes many tasks with a single bulk INSERT.
+    """
+
+    def create(self, validated_data):
+        """
+        Create every validated task in one `bulk_create` call.
+        """
+        user = self.context['request'].user
+        tasks = [Task(user=user, **attrs) for attrs in validated_data]
+        tasks = Task.objects.bulk_create(tasks)
+        invalidate_user(user.pk)  # Drop the user's cached task lists
+        return tasks
+
+
 class TaskSerializer(serializers.ModelSerializer):
     """
     Serializer for the Task model.
     Handles validation, serialization, and creation of Task objects.
     """
     # Use PrimaryKeyRelatedField for category to link the task to a category by its ID
-    category = serializers.PrimaryKeyRelatedField(queryset=TaskCategory.objects.all())  
-    priority = serializers.CharField(required=True)  # Make priority a required field
+    category = TaskCategoryField(queryset=TaskCategory.objects.all())  
+    priority = PriorityField(required=True)  # Make priority a required field, exchanged as a label
+
+    # Fields an update may change
+    UPDATABLE_FIELDS = ('title', 'description', 'due_date', 'priority', 'status', 'category')
 
     class Meta:
         model = Task  # This serializer is based on the Task model
@@ -21,6 +100,7 @@ class TaskSerializer(serializers.ModelSerializer):
             'category', 'created_at', 'updated_at', 'user', 'is_completed'
         ]  # Specify the fields to be serialized
         read_only_fields = ['user']  # Prevent the user field from being editable
+        list_serializer_class = TaskBulkListSerializer  # Write lists of tasks in bulk
 
     # Custom validation for due_date
     def validate_due_date(self, value):
@@ -55,20 +135,38 @@ class TaskSerializer(serializers.ModelSerializer):
         Automatically associate the user with the task during creation.
         """
         validated_data['user'] = self.context['request'].user  # Associate the authenticated user
-        return super().create(validated_data)
+        task = super().create(validated_data)
+        invalidate_user(task.user_id)  # Drop the user's cached task lists
+        return task
 
     def update(self, instance, validated_data):
         """
-        Update the task with any new data provided.
+        Update the task with any new data provided, writing only the columns
+        that actually changed (plus updated_at).
+
+        When the context carries `expected_updated_at` (from an If-Match
+        header), the UPDATE only applies if the row still has that version;
+        otherwise PreconditionFailed is raised so concurrent writes are not lost.
         """
-        # Update the fields if new data is provided, otherwise retain the old values
-        instance.title = validated_data.get('title', instance.title)
-        instance.description = validated_data.get('description', instance.description)
-        instance.due_date = validated_data.get('due_date', instance.due_date)
-        instance.priority = validated_data.get('priority', instance.priority)
-        instance.status = validated_data.get('status', instance.status)
-        instance.category = validated_data.get('category', instance.category)
-        instance.save()  # Save the updated instance
+        changed = [
+            field for field in self.UPDATABLE_FIELDS
+            if field in validated_data and getattr(instance, field) != validated_data[field]
+        ]
+        if not changed:
+            return instance  # Nothing to write
+
+        for field in changed:
+            setattr(instance, field, validated_data[field])
+        expected_updated_at = self.context.get('expected_updated_at')
+        if expected_updated_at is None:
+            instance.save(update_fields=changed + ['updated_at'])  # Save only the changed columns
+        else:
+            # Compare-and-swap on updated_at, the task's version
+            instance.updated_at = timezone.now()
+            values = {field: getattr(instance, field) for field in changed + ['updated_at']}
+            if not Task.objects.filter(pk=instance.pk, updated_at=expected_updated_at).update(**values):
+                raise PreconditionFailed()
+        invalidate_user(instance.user_id)  # Drop the user's cached task lists
         return instance
 
     def to_representation(self, instance):
@@ -87,7 +185,114 @@ class TaskSerializer(serializers.ModelSerializer):
         else:
             representation['due_date'] = None  # Handle case where due_date might be None
 
-        # Show the category's name instead of the category ID
-        representation['category'] = instance.category.name if instance.category else None
+        # Show the category's name instead of the category ID, reusing the
+        # request's categories when the relation was not loaded with the task
+        resolver = self.fields['category'].get_resolver()
+        if resolver is not None and not Task.category.is_cached(instance):
+            representation['category'] = resolver.name_of(instance.category_id) or instance.category.name
+        else:
+            representation['category'] = instance.category.name if instance.category else None
 
-        return representation  # Return the customized representation
\ No newline at end of file
+        return representation  # Return the customized representation
+
+class TaskRowSerializer:
+    """
+    Fast read-only serializer for task lists.
+
+    Works on `.values()` rows instead of model instances and skips DRF's field
+    machinery, while producing output identical to TaskSerializer.
+    Formatters are resolved once per instance, and due dates are formatted once
+    per distinct calendar day.
+    """
+    # Columns to select with QuerySet.values(); category__name replaces the nested lookup
+    values_fields = (
+        'id', 'title', 'description', 'due_date', 'priority', 'status',
+        'category__name', 'created_at', 'updated_at', 'user_id', 'is_completed',
+    )
+
+    def __init__(self):
+        self.priority_labels = dict(Task.PRIORITY_LEVELS)
+        self.due_dates = {}  # Cache of formatted due dates keyed by calendar day
+
+    def format_due_date(self, value):
+        if value is None:
+            return None
+        day = value.date()
+        formatted = self.due_dates.get(day)
+        if formatted is None:
+            formatted = self.due_dates[day] = value.strftime("%B %d, %Y")  # Example: October 01, 2024
+        return formatted
+
+    def format_timestamp(self, value):
+        # Equivalent to strftime("%Y-%m-%d %H:%M:%S") without the locale-aware formatter
+        return '%04d-%02d-%02d %02d:%02d:%02d' % (
+            value.year, value.month, value.day, value.hour, value.minute, value.second
+        )
+
+    def to_representation(self, row):
+        """
+        Return the TaskSerializer representation of a single `.values()` row.
+        """
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'due_date': self.format_due_date(row['due_date']),
+            'priority': self.priority_labels.get(row['priority']),
+            'status': row['status'],
+            'category': row['category__name'],
+            'created_at': self.format_timestamp(row['created_at']),
+            'updated_at': self.format_timestamp(row['updated_at']),
+            'user': row['user_id'],
+            'is_completed': row['is_completed'],
+        }
+
+    def serialize(self, rows):
+        """
+        Return the representations of many rows as a list.
+        """
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+
+class RecurrenceRuleSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a task's RecurrenceRule.
+    The rule is given either field by field or as an RFC 5545 `rrule` string
+    (e.g. 'FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10'); both forms are returned.
+    """
+    rrule = serializers.CharField(required=False, write_only=True)  # Alternative to the individual fields
+
+    class Meta:
+        model = RecurrenceRule
+        fields = [
+            'frequency', 'interval', 'by_weekday', 'by_month_day', 'count', 'until', 'rrule',
+            'next_occurrence', 'generated_count', 'last_occurrence',
+        ]
+        read_only_fields = ['next_occurrence', 'generated_count', 'last_occurrence']  # Maintained by the generator
+        extra_kwargs = {'frequency': {'required': False}}  # Not needed when `rrule` is given
+
+    def validate(self, attrs):
+        """
+        Expand `rrule` into the rule fields and check the combination.
+        """
+        rrule = attrs.pop('rrule', None)
+        try:
+            if rrule is not None:
+                attrs = parse_rrule(rrule)
+            elif 'frequency' not in attrs:
+                raise ValidationError("Either 'frequency' or 'rrule' is required.")
+            if attrs.get('by_weekday'):
+                days = [day.strip() for day in attrs['by_weekday'].upper().split(',')]
+                validate_rule({**attrs, 'by_weekday': ','.join(days)})
+                attrs['by_weekday'] = ','.join(sorted(set(days), key=RecurrenceRule.WEEKDAYS.index))
+            else:
+                validate_rule(attrs)
+        except ValidationError as e:
+            raise serializers.ValidationError(e.messages)
+        return attrs
+
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        representation['rrule'] = to_rrule(instance)
+        return representation
@@ -0,0 +1,116 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from categories.models import TaskCategory
+from .models import Task, TaskCounter
+
+COUNTER_VENDORS = ('sqlite', 'postgresql')  # Backends migrations 0014-0015 install the counter triggers on
+
+
+def use_counters():
+    """
+    Return whether status and priority totals are read from the
+    trigger-maintained TaskCounter rows.
+    """
+    return getattr(settings, 'TASKS_STATS_COUNTERS', True) and connection.vendor in COUNTER_VENDORS
+
+
+def end_of_week(now):
+    """
+    Return the start of next Monday in the current time zone.
+    """
+    today = timezone.localdate(now)
+    monday = today + timedelta(days=7 - today.weekday())
+    return timezone.make_aware(datetime.combine(monday, time.min))
+
+
+def get_task_stats(user, now=None):
+    """
+    Return the aggregate task statistics of one user.
+
+    Every dimension is answered by a single query in the database: the status
+    and priority totals by the user's TaskCounter row (or one GROUP BY each
+    when counters are off), the category totals by one GROUP BY over the
+    (user, category) index, and the overdue and due-this-week counts of open
+    tasks by one aggregate over the (user, is_completed, due_date) index.
+
+    The category totals are not read from TaskCategory.task_count: those
+    count every user's tasks in a category, while a user's tasks may be filed
+    under another user's category and vice versa.
+    """
+    now = now or timezone.now()
+    tasks = Task.objects.for_user(user).order_by()
+    priority_labels = dict(Task.PRIORITY_LEVELS)
+
+    if use_counters():
+        counter = TaskCounter.objects.filter(user=user).first() or TaskCounter(user=user)
+        total = counter.total
+        by_status = {Task.PENDING: counter.pending, Task.COMPLETED: counter.completed}
+        by_priority = {'Low': counter.low, 'Medium': counter.medium, 'High': counter.high}
+    else:
+        by_status = dict.fromkeys(dict(Task.STATUS_CHOICES), 0)
+        by_status.update(tasks.values_list('status').annotate(count=Count('id')))
+        by_priority = dict.fromkeys(priority_labels.values(), 0)
+        for rank, count in tasks.values_list('priority').annotate(count=Count('id')):
+            by_priority[priority_labels[rank]] = count
+        total = sum(by_status.values())
+    by_category = [
+        {'id': row['category_id'], 'name': row['category__name'], 'count': row['count']}
+        for row in tasks.values('category_id', 'category__name').annotate(count=Count('id')).order_by('category__name')
+    ]
+
+    due = tasks.filter(is_completed=False).aggregate(
+        overdue=Count('id', filter=Q(due_date__lt=now)),
+        due_this_week=Count('id', filter=Q(due_date__gte=now, due_date__lt=end_of_week(now))),
+    )
+    return {
+        'total': total,
+        'by_status': by_status,
+        'by_priority': by_priority,
+        'by_category': by_category,
+        'overdue': due['overdue'],
+        'due_this_week': due['due_this_week'],
+    }
+
+
+def rebuild_counters(users=None):
+    """
+    Recompute the TaskCounter rows of the given users (default: everyone)
+    from their tasks, e.g. after rows were changed with the triggers disabled.
+    Returns the number of counter rows written.
+    """
+    tasks = Task.objects.order_by()
+    counters = TaskCounter.objects.all()
+    if users is not None:
+        tasks = tasks.filter(user__in=users)
+        counters = counters.filter(user__in=users)
+
+    rows = tasks.values('user_id').annotate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status=Task.PENDING)),
+        completed=Count('id', filter=Q(status=Task.COMPLETED)),
+        low=Count('id', filter=Q(priority=Task.LOW)),
+        medium=Count('id', filter=Q(priority=Task.MEDIUM)),
+        high=Count('id', filter=Q(priority=Task.HIGH)),
+    )
+    with transaction.atomic():
+        counters.delete()
+        return len(TaskCounter.objects.bulk_create([TaskCounter(**row) for row in rows], batch_size=1000))
+
+
+def rebuild_category_counts(categories=None):
+    """
+    Recompute task_count and open_task_count of the given categories
+    (default: all) with one UPDATE. Returns the number of categories updated.
+    """
+    def count(**filters):
+        tasks = Task.objects.filter(category=OuterRef('pk'), **filters).order_by().values('category')
+        return Coalesce(Subquery(tasks.annotate(count=Count('id')).values('count')), Value(0), output_field=IntegerField())
+
+    queryset = TaskCategory.objects.all() if categories is None else categories
+    return queryset.update(task_count=count(), open_task_count=count(is_completed=False))
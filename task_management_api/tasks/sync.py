@@ -0,0 +1,120 @@
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Task, TaskTombstone
+from .serializers import TaskRowSerializer
+
+
+class SyncTokenError(ValueError):
+    """
+    Raised for sync tokens that are malformed or older than the tombstone retention.
+    """
+    def __init__(self, message, expired=False):
+        super().__init__(message)
+        self.expired = expired
+
+
+def get_max_changes():
+    return getattr(settings, 'TASKS_SYNC_MAX_CHANGES', 1000)
+
+
+def get_retention():
+    return timedelta(days=getattr(settings, 'TASKS_TOMBSTONE_RETENTION_DAYS', 90))
+
+
+def record_deletions(queryset):
+    """
+    Write a tombstone for every task in the queryset with a single INSERT.
+    Must run before the tasks are deleted, in the same transaction.
+    """
+    rows = queryset.order_by().values_list('id', 'user_id')
+    TaskTombstone.objects.bulk_create(
+        [TaskTombstone(task_id=task_id, user_id=user_id) for task_id, user_id in rows], batch_size=1000
+    )
+
+
+def encode_token(updated_at, task_id, tombstone_id):
+    """
+    Build an opaque sync token from the watermarks of both change streams:
+    the (updated_at, id) keyset position in the task table and the id of the
+    last tombstone seen, plus the time it was issued.
+    """
+    payload = {
+        'u': updated_at.isoformat() if updated_at else None, 'i': task_id, 'd': tombstone_id,
+        't': int(timezone.now().timestamp()),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+
+def decode_token(token):
+    """
+    Return the (updated_at, task_id, tombstone_id) watermarks of a sync token.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+        updated_at = parse_datetime(payload['u']) if payload['u'] else None
+        task_id, tombstone_id, issued = int(payload['i']), int(payload['d']), int(payload['t'])
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+        raise SyncTokenError("Invalid sync token.")
+    # Tombstones older than the retention period may be pruned, so older tokens could miss deletions
+    if issued < (timezone.now() - get_retention()).timestamp():
+        raise SyncTokenError("Sync token has expired. Perform a full sync.", expired=True)
+    return updated_at, task_id, tombstone_id
+
+
+def get_changes(user, token=None, limit=None):
+    """
+    Return the user's task changes since the given sync token.
+
+    Updated tasks are read in (updated_at, id) order off the user/updated_at
+    index and deletions in id order off the tombstone table, each capped at
+    `limit` rows, so a sync costs O(changes) instead of O(tasks). Without a
+    token every task is returned as created and earlier deletions are skipped.
+    Returns (created, updated, deleted_ids, next_token, has_more), where created
+    and updated are TaskRowSerializer rows.
+    """
+    limit = limit or get_max_changes()
+    tombstones = TaskTombstone.objects.filter(user=user)
+    if token:
+        since, last_task_id, last_tombstone_id = decode_token(token)
+    else:
+        since, last_task_id = None, 0
+        last_tombstone_id = tombstones.aggregate(last=Max('id'))['last'] or 0
+
+    tasks = Task.objects.for_user(user)
+    if since:
+        tasks = tasks.filter(Q(updated_at__gt=since) | Q(updated_at=since, id__gt=last_task_id))
+    changed = list(tasks.order_by('updated_at', 'id').values(*TaskRowSerializer.values_fields)[:limit + 1])
+    deleted = list(
+        tombstones.filter(id__gt=last_tombstone_id).order_by('id').values_list('id', 'task_id')[:limit + 1]
+    )
+    has_more = len(changed) > limit or len(deleted) > limit
+    changed, deleted = changed[:limit], deleted[:limit]
+
+    # A task created since the previous sync is new to the client, even if edited since
+    created, updated = [], []
+    for row in changed:
+        (created if since is None or row['created_at'] > since else updated).append(row)
+    next_token = encode_token(
+        changed[-1]['updated_at'] if changed else since,
+        changed[-1]['id'] if changed else last_task_id,
+        deleted[-1][0] if deleted else last_tombstone_id,
+    )
+    return created, updated, [task_id for _, task_id in deleted], next_token, has_more
+
+
+def prune_tombstones(older_than=None):
+    """
+    Delete tombstones older than the retention period.
+    Returns the number of rows deleted.
+    """
+    cutoff = timezone.now() - (older_than or get_retention())
+    deleted, _ = TaskTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
@@ -1,9 +1,42 @@
-from django.test import TestCase
+import base64
+import csv
+import io
+import json
+import tempfile
+from importlib import import_module
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock, skipUnless
+from urllib.parse import parse_qs, urlparse
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import NotSupportedError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import parse_http_date
 from rest_framework import status
-from rest_framework.test import APITestCase, APIClient  # Import APIClient
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory, force_authenticate  # Import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
 from users.models import User  # Ensure this points to your custom User model
-from .models import Task
+from categories.models import TaskCategory
+from task_management_api.metrics import HISTOGRAMS, RequestMetrics, current
+from .conditional import PreconditionFailed
+from .models import RecurrenceRule, Task, TaskCounter, TaskTombstone
+from .pagination import TaskKeysetPagination
+from .purge import chunked_delete, purge_tasks
+from .recurrence import generate_occurrences, iter_occurrences, parse_rrule, schedule
+from .serializers import TaskRowSerializer, TaskSerializer
+from .stats import get_task_stats, rebuild_counters
+from .benchmarks import generate_dataset
+from .checks import check_task_triggers
+from .async_views import AsyncTaskDetailView, AsyncTaskFilterView, AsyncTaskListView
+from .views import TaskDetailView, TaskFilterView, TaskListView
 
 class TaskAPITest(APITestCase):
     def setUp(self):
@@ -34,4 +67,1631 @@ class TaskAPITest(APITestCase):
         # Assert that the response status code is HTTP 201 Created
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Task.objects.count(), 1)
-        self.assertEqual(Task.objects.get().title, 'Test Task')
\ No newline at end of file
+        self.assertEqual(Task.objects.get().title, 'Test Task')
+
+class TaskTestCase(APITestCase):
+    """
+    Base test case that starts every test with an empty cache, since user ids
+    are reused between tests and cached task lists would otherwise leak.
+    """
+    def setUp(self):
+        cache.clear()
+
+
+@override_settings(TASKS_LIST_CACHE_TIMEOUT=0)
+class TaskQueryCountTest(TaskTestCase):
+    """
+    Regression tests ensuring task list endpoints run a constant number of
+    queries no matter how many tasks they return (with the list cache disabled).
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='counter', email='counter@example.com', password='testpass')
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_tasks(self, count):
+        # Spread tasks over several categories so each row needs its own category
+        for index in range(count):
+            category = TaskCategory.objects.create(name=f'Category {Task.objects.count()}', user=self.user)
+            Task.objects.create(
+                title=f'Task {index}', description='Query count task', due_date=timezone.now(),
+                priority=Task.LOW, user=self.user, category=category,
+            )
+
+    def assertConstantQueries(self, url, user=None):
+        self.client.force_authenticate(user=user or self.user)
+        self.create_tasks(2)
+        with CaptureQueriesContext(connection) as small:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.create_tasks(10)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(small), len(large))
+
+    def test_task_list_query_count(self):
+        self.assertConstantQueries(reverse('task-list'))
+
+    def test_task_filter_query_count(self):
+        self.assertConstantQueries(reverse('task-filter') + '?sort_by=due_date')
+
+    def test_admin_task_list_query_count(self):
+        self.assertConstantQueries(reverse('admin-task-list'), user=self.admin)
+
+    def test_task_list_uses_constant_queries(self):
+        self.create_tasks(5)
+        with self.assertNumQueries(3):  # The ETag aggregate, the latest deletion and the page itself
+            response = self.client.get(reverse('task-list'))
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertTrue(response.data['results'][0]['category'].startswith('Category'))
+
+
+class TaskPaginationTest(TaskTestCase):
+    """
+    Tests for the keyset pagination used by task list endpoints.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='pager', email='pager@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        category = TaskCategory.objects.create(name='Paging', user=self.user)
+        # Only three distinct due dates so the id tiebreaker is exercised
+        base = timezone.now()
+        for index in range(12):
+            Task.objects.create(
+                title=f'Task {index}', description='Paged task', due_date=base + timedelta(days=index % 3),
+                priority=Task.LOW, user=self.user, category=category,
+            )
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_pages_cover_every_task_once_in_sort_order(self):
+        ids = self.walk(reverse('task-filter') + '?sort_by=due_date&page_size=5')
+        expected = list(Task.objects.order_by('due_date', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_default_list_is_ordered_by_id(self):
+        ids = self.walk(reverse('task-list') + '?page_size=4')
+        self.assertEqual(ids, sorted(Task.objects.values_list('id', flat=True)))
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get(reverse('task-filter') + '?sort_by=created_at&page_size=5')
+        second = self.client.get(first.data['next'])
+        self.assertIsNone(first.data['previous'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [task['id'] for task in back.data['results']],
+            [task['id'] for task in first.data['results']],
+        )
+
+    @override_settings(TASKS_MAX_PAGE_SIZE=3)
+    def test_page_size_is_capped(self):
+        response = self.client.get(reverse('task-list') + '?page_size=100')
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse('task-list') + '?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_from_another_sort_is_rejected(self):
+        first = self.client.get(reverse('task-filter') + '?sort_by=due_date&page_size=5')
+        cursor = parse_qs(urlparse(first.data['next']).query)['cursor'][0]
+        response = self.client.get(reverse('task-filter') + f'?sort_by=updated_at&cursor={cursor}')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_a_tampered_value_is_rejected(self):
+        first = self.client.get(reverse('task-filter') + '?sort_by=priority&page_size=5')
+        cursor = parse_qs(urlparse(first.data['next']).query)['cursor'][0]
+        for value in ('abc', 1.5, True, None):
+            with self.subTest(value=value):
+                payload = dict(json.loads(base64.urlsafe_b64decode(cursor)), v=value)
+                tampered = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+                response = self.client.get(reverse('task-filter') + f'?sort_by=priority&cursor={tampered}')
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked against SQLite')
+class TaskIndexUsageTest(TaskTestCase):
+    """
+    EXPLAIN-based tests asserting every filter combination supported by
+    TaskFilterView is answered from an index instead of a table scan.
+    """
+    filter_combinations = [
+        {},
+        {'status': 'Pending'},
+        {'priority': 'High'},
+        {'status': 'Completed', 'priority': 'Low'},
+        {'is_completed': 'false'},
+        {'is_completed': 'true', 'sort_by': 'due_date'},
+        {'due_date': '2030-01-01'},
+        {'due_after': '2030-01-01', 'due_before': '2030-01-08'},
+        {'due_before': '2030-01-08T12:00:00', 'sort_by': 'due_date'},
+        {'overdue': 'true'},
+        {'category': 'Indexed'},
+        {'sort_by': 'due_date'},
+        {'sort_by': 'created_at'},
+        {'sort_by': 'updated_at'},
+        {'sort_by': 'priority'},
+        {'priority_min': 'Medium', 'sort_by': 'priority'},
+        {'status': 'Pending', 'sort_by': 'priority'},
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='planner', email='planner@example.com', password='testpass')
+        TaskCategory.objects.create(name='Indexed', user=self.user)
+        self.factory = APIRequestFactory()
+
+    def get_plan(self, params):
+        view = TaskFilterView()
+        view.request = Request(self.factory.get(reverse('task-filter'), params))
+        view.request.user = self.user
+        queryset = view.get_queryset()
+        self.assertFalse(hasattr(view, 'validation_error'), params)
+        # Order the way the keyset paginator does before fetching a page
+        field, descending = TaskKeysetPagination().get_sort(queryset)
+        return queryset.order_by(field, 'id').explain()
+
+    def test_filter_combinations_use_an_index(self):
+        table = Task._meta.db_table
+        for params in self.filter_combinations:
+            with self.subTest(params=params):
+                plan = self.get_plan(params)
+                self.assertNotRegex(plan, rf'SCAN {table}\b', plan)
+                self.assertRegex(plan, rf'SEARCH {table} USING (COVERING )?INDEX', plan)
+
+
+@skipUnless(connection.vendor == 'sqlite', "Connection PRAGMAs are SQLite specific")
+class SQLiteConnectionSettingsTest(TestCase):
+    """
+    Tests that new SQLite connections are tuned by the OPTIONS init_command.
+    """
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_connection_pragmas(self):
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('temp_store'), 2)  # MEMORY
+        self.assertTrue(connection.settings_dict['CONN_HEALTH_CHECKS'])
+
+
+class TaskDueDateFilterTest(TaskTestCase):
+    """
+    Tests for the due date range filters of TaskFilterView.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='dates', email='dates@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = TaskCategory.objects.create(name='Dates', user=self.user)
+
+    def create_task(self, title, due_date, is_completed=False):
+        return Task.objects.create(
+            title=title, description='Dated task', due_date=due_date, priority=Task.LOW,
+            user=self.user, category=self.category, is_completed=is_completed,
+        )
+
+    def get_titles(self, params):
+        response = self.client.get(reverse('task-filter'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return sorted(task['title'] for task in response.data['results'])
+
+    def test_due_date_matches_the_whole_day_in_the_requested_time_zone(self):
+        # 23:30 UTC on Jan 1st is already Jan 2nd in Tokyo
+        self.create_task('late', datetime(2030, 1, 1, 23, 30, tzinfo=dt_timezone.utc))
+        self.create_task('early', datetime(2030, 1, 1, 0, 30, tzinfo=dt_timezone.utc))
+        self.assertEqual(self.get_titles({'due_date': '2030-01-01'}), ['early', 'late'])
+        self.assertEqual(self.get_titles({'due_date': '2030-01-02', 'tz': 'Asia/Tokyo'}), ['late'])
+
+    def test_due_before_and_after_form_a_half_open_range(self):
+        for day in (1, 3, 8):
+            self.create_task(f'day {day}', datetime(2030, 1, day, 9, tzinfo=dt_timezone.utc))
+        titles = self.get_titles({'due_after': '2030-01-03', 'due_before': '2030-01-08'})
+        self.assertEqual(titles, ['day 3'])
+
+    def test_overdue_only_returns_open_tasks_in_the_past(self):
+        past = timezone.now() - timedelta(days=1)
+        self.create_task('overdue', past)
+        self.create_task('done', past, is_completed=True)
+        self.create_task('upcoming', timezone.now() + timedelta(days=1))
+        self.assertEqual(self.get_titles({'overdue': 'true'}), ['overdue'])
+        self.assertEqual(self.get_titles({'overdue': 'false'}), ['done', 'upcoming'])
+
+    def test_invalid_values_are_rejected(self):
+        for params in (
+            {'due_date': '01-01-2030'}, {'due_date': '2030-02-30'}, {'due_before': 'soon'}, {'due_after': '2030-13-01'},
+            {'tz': 'Mars/Base'}, {'overdue': 'maybe'},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(reverse('task-filter'), params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskPriorityTest(TaskTestCase):
+    """
+    Tests for the ordinal priority storage behind the label-based API.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='ranks', email='ranks@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = TaskCategory.objects.create(name='Ranks', user=self.user)
+        for priority in (Task.HIGH, Task.LOW, Task.MEDIUM):
+            Task.objects.create(
+                title=f'Priority {priority}', description='Ranked task', due_date=timezone.now(),
+                priority=priority, user=self.user, category=self.category,
+            )
+
+    def get_priorities(self, params):
+        response = self.client.get(reverse('task-filter'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [task['priority'] for task in response.data['results']]
+
+    def test_sort_by_priority_follows_rank_order(self):
+        self.assertEqual(self.get_priorities({'sort_by': 'priority'}), ['Low', 'Medium', 'High'])
+
+    def test_priority_range_filter(self):
+        self.assertEqual(self.get_priorities({'priority_min': 'Medium', 'sort_by': 'priority'}), ['Medium', 'High'])
+        self.assertEqual(self.get_priorities({'priority_max': 'Medium', 'sort_by': 'priority'}), ['Low', 'Medium'])
+        self.assertEqual(self.get_priorities({'priority': 'High'}), ['High'])
+
+    def test_labels_are_accepted_and_stored_as_ranks(self):
+        data = {
+            'title': 'Labelled', 'description': 'Uses a label', 'due_date': timezone.now() + timedelta(days=1),
+            'priority': 'High', 'status': 'Pending', 'category': self.category.id,
+        }
+        response = self.client.post(reverse('task-list'), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(response.data['priority'], 'High')
+        self.assertEqual(Task.objects.get(pk=response.data['id']).priority, Task.HIGH)
+
+    def test_unknown_label_is_rejected(self):
+        data = {
+            'title': 'Bad', 'description': 'Unknown label', 'due_date': timezone.now() + timedelta(days=1),
+            'priority': 'Urgent', 'status': 'Pending', 'category': self.category.id,
+        }
+        response = self.client.post(reverse('task-list'), data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('priority', response.data)
+
+    def test_non_string_priority_is_rejected(self):
+        task = Task.objects.first()
+        for priority in (['High'], {'label': 'High'}, 3):
+            with self.subTest(priority=priority):
+                response = self.client.patch(reverse('task-detail', args=[task.id]), {'priority': priority}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('priority', response.data)
+
+
+class TaskBulkTest(TaskTestCase):
+    """
+    Tests for the bulk create/update/delete endpoint.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='bulk', email='bulk@example.com', password='testpass')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.categories = [TaskCategory.objects.create(name=f'Bulk {index}', user=self.user) for index in range(3)]
+        self.foreign_category = TaskCategory.objects.create(name='Foreign', user=self.other)
+        self.url = reverse('task-bulk')
+
+    def make_items(self, count):
+        due_date = (timezone.now() + timedelta(days=1)).isoformat()
+        return [{
+            'title': f'Bulk {index}', 'description': 'Imported', 'due_date': due_date, 'priority': 'Medium',
+            'status': 'Pending', 'category': self.categories[index % 3].id,
+        } for index in range(count)]
+
+    def test_bulk_create_runs_constant_queries(self):
+        with CaptureQueriesContext(connection) as small:
+            response = self.client.post(self.url, self.make_items(3), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(self.url, self.make_items(60), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(len(response.data['created']), 60)
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 63)
+
+    def test_bulk_create_reports_errors_per_item_and_writes_nothing(self):
+        items = self.make_items(3)
+        items[1]['priority'] = 'Urgent'
+        items[2]['category'] = self.foreign_category.id
+        response = self.client.post(self.url, items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertIn('priority', response.data['errors'][0]['errors'])
+        self.assertIn('category', response.data['errors'][1]['errors'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_bulk_create_rejects_oversized_payloads(self):
+        with self.settings(TASKS_BULK_MAX_ITEMS=2):
+            response = self.client.post(self.url, self.make_items(3), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self):
+        ids = self.client.post(self.url, self.make_items(4), format='json').data['created']
+        changes = [{'id': pk, 'priority': 'High', 'category': self.categories[0].id} for pk in ids]
+        response = self.client.patch(self.url, changes, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(sorted(response.data['updated']), sorted(ids))
+        tasks = Task.objects.filter(pk__in=ids)
+        self.assertTrue(all(task.priority == Task.HIGH and task.category_id == self.categories[0].id for task in tasks))
+
+    def test_bulk_update_rejects_tasks_of_other_users(self):
+        foreign = Task.objects.create(
+            title='Theirs', description='Not yours', due_date=timezone.now(), priority=Task.LOW,
+            user=self.other, category=self.foreign_category,
+        )
+        response = self.client.patch(self.url, [{'id': foreign.id, 'title': 'Mine now'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.title, 'Theirs')
+
+    def test_bulk_delete(self):
+        ids = self.client.post(self.url, self.make_items(5), format='json').data['created']
+        response = self.client.delete(self.url, {'ids': ids[:3]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['deleted'], sorted(ids[:3]))
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_bulk_delete_with_unknown_id_deletes_nothing(self):
+        ids = self.client.post(self.url, self.make_items(2), format='json').data['created']
+        response = self.client.delete(self.url, {'ids': ids + [999999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'], [{'index': 2, 'errors': {'id': ['Task not found.']}}])
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_bulk_ids_must_be_integers(self):
+        ids = self.client.post(self.url, self.make_items(2), format='json').data['created']
+        for bad in (True, [ids[0]], {'id': ids[0]}, str(ids[0])):
+            with self.subTest(id=bad):
+                response = self.client.delete(self.url, {'ids': [bad]}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                response = self.client.patch(self.url, [{'id': bad, 'title': 'Renamed'}], format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data['errors'], [{'index': 0, 'errors': {'id': ['A task id must be an integer.']}}])
+                response = self.client.patch(reverse('task-bulk-complete'), {'ids': [bad]}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Task.objects.filter(title__startswith='Bulk', is_completed=False).count(), 2)
+
+
+class TaskBulkCompletionTest(TaskTestCase):
+    """
+    Tests for marking many tasks complete or incomplete at once.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='sprint', email='sprint@example.com', password='testpass')
+        self.other = User.objects.create_user(username='bystander', email='bystander@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        category = TaskCategory.objects.create(name='Sprint', user=self.user)
+        other_category = TaskCategory.objects.create(name='Elsewhere', user=self.other)
+        self.tasks = [
+            Task.objects.create(
+                title=f'Sprint {index}', description='Sprint task', due_date=timezone.now(),
+                priority=Task.HIGH if index % 2 else Task.LOW, user=self.user, category=category,
+            ) for index in range(6)
+        ]
+        self.foreign = Task.objects.create(
+            title='Foreign', description='Not in the sprint', due_date=timezone.now(),
+            priority=Task.HIGH, user=self.other, category=other_category,
+        )
+
+    def test_complete_by_ids_uses_a_single_update(self):
+        ids = [task.id for task in self.tasks[:3]] + [self.foreign.id]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(reverse('task-bulk-complete'), {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['updated'], sorted(ids[:3]))
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 1)
+        self.assertEqual(Task.objects.filter(is_completed=True, status=Task.COMPLETED).count(), 3)
+        self.foreign.refresh_from_db()
+        self.assertFalse(self.foreign.is_completed)
+
+    def test_complete_by_filter(self):
+        response = self.client.patch(reverse('task-bulk-complete'), {'filter': {'priority': 'High'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['updated'], [task.id for task in self.tasks if task.priority == Task.HIGH])
+
+    def test_reopen_only_touches_completed_tasks(self):
+        self.client.patch(reverse('task-bulk-complete'), {'ids': [self.tasks[0].id]}, format='json')
+        response = self.client.patch(reverse('task-bulk-incomplete'), {'filter': {}}, format='json')
+        self.assertEqual(response.data['updated'], [self.tasks[0].id])
+        self.assertEqual(response.data['status'], Task.PENDING)
+        self.assertFalse(Task.objects.filter(is_completed=True).exists())
+
+    def test_invalid_selection_is_rejected(self):
+        for body in ({}, {'ids': [1], 'filter': {}}, {'ids': 'all'}, {'filter': {'priority': 'Urgent'}}):
+            with self.subTest(body=body):
+                response = self.client.patch(reverse('task-bulk-complete'), body, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AdminPurgeTasksTest(TaskTestCase):
+    """
+    Tests for the chunked admin purge of all tasks.
+    """
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser(username='purger', email='purger@example.com', password='adminpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        category = TaskCategory.objects.create(name='Purge', user=self.admin)
+        Task.objects.bulk_create([
+            Task(title=f'Purge {index}', description='Doomed', due_date=timezone.now(),
+                 priority=Task.LOW, user=self.admin, category=category)
+            for index in range(7)
+        ])
+
+    def test_purge_deletes_in_batches(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(reverse('admin-delete-all-tasks') + '?batch_size=3')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response.data['deleted'], {'recurrence rules': 0, 'tasks': 7})
+        self.assertFalse(Task.objects.exists())
+        deletes = [query for query in queries if query['sql'].startswith('DELETE')]
+        self.assertEqual(len(deletes), 3)  # Batches of 3, 3 and 1
+        self.assertEqual(TaskTombstone.objects.filter(user=self.admin).count(), 7)
+
+
+class TaskExportTest(TaskTestCase):
+    """
+    Tests for the streaming NDJSON/CSV export.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='exporter', email='exporter@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        category = TaskCategory.objects.create(name='Export', user=self.user)
+        for index in range(5):
+            Task.objects.create(
+                title=f'Export {index}', description='Exported task', due_date=timezone.now(),
+                priority=Task.HIGH if index < 2 else Task.LOW, user=self.user, category=category,
+            )
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export_matches_serializer_output(self):
+        response = self.client.get(reverse('task-export'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        expected = TaskSerializer(Task.objects.order_by('id'), many=True).data
+        self.assertEqual(rows, json.loads(json.dumps(expected)))
+
+    def test_csv_export_applies_filters(self):
+        response = self.client.get(reverse('task-export'), {'export_format': 'csv', 'priority': 'High'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(io.StringIO(self.read(response))))
+        self.assertEqual(rows[0], TaskSerializer.Meta.fields)
+        self.assertEqual([row[1] for row in rows[1:]], ['Export 0', 'Export 1'])
+
+    def test_export_reads_rows_in_chunks(self):
+        with self.settings(TASKS_EXPORT_CHUNK_SIZE=2):
+            response = self.client.get(reverse('task-export'))
+            self.assertEqual(len(self.read(response).splitlines()), 5)
+
+    async def test_asgi_export_streams_asynchronously(self):
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.user).access_token))()
+        response = await self.async_client.get(
+            reverse('task-export'), {'export_format': 'csv'}, headers={'Authorization': f'Bearer {token}'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)  # A sync iterator would be read into memory first
+        content = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0], TaskSerializer.Meta.fields)
+        self.assertEqual(len(rows), 6)
+
+    def test_invalid_format_and_filters_are_rejected(self):
+        for params in ({'export_format': 'xml'}, {'sort_by': 'title'}):
+            with self.subTest(params=params):
+                response = self.client.get(reverse('task-export'), params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskRowSerializerTest(TaskTestCase):
+    """
+    Tests ensuring the fast list serializer matches TaskSerializer byte for byte.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='rows', email='rows@example.com', password='testpass')
+        categories = [TaskCategory.objects.create(name=f'Rows {index}', user=self.user) for index in range(2)]
+        for index, priority in enumerate((Task.LOW, Task.MEDIUM, Task.HIGH, Task.LOW)):
+            Task.objects.create(
+                title=f'Row "{index}"', description='Ünïcode\nmultiline', is_completed=bool(index % 2),
+                due_date=datetime(2030, 1 + index, 9, 23, 59, 59, 123456, tzinfo=dt_timezone.utc),
+                priority=priority, user=self.user, category=categories[index % 2],
+            )
+
+    def test_output_is_identical_to_task_serializer(self):
+        queryset = Task.objects.order_by('id')
+        expected = JSONRenderer().render(TaskSerializer(queryset, many=True).data)
+        fast = JSONRenderer().render(TaskRowSerializer().serialize(queryset.values(*TaskRowSerializer.values_fields)))
+        self.assertEqual(fast, expected)
+
+    def test_list_endpoint_uses_fast_path(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.get(reverse('task-list'))
+        expected = TaskSerializer(Task.objects.order_by('id'), many=True).data
+        self.assertEqual(JSONRenderer().render(response.data['results']), JSONRenderer().render(expected))
+
+
+class TaskListCacheTest(TaskTestCase):
+    """
+    Tests for the per-user task list cache and its write-driven invalidation.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='poller', email='poller@example.com', password='testpass')
+        self.admin = User.objects.create_superuser(username='cacheadmin', email='cacheadmin@example.com', password='adminpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = TaskCategory.objects.create(name='Cached', user=self.user)
+        self.task = Task.objects.create(
+            title='Cached task', description='Polled constantly', due_date=timezone.now() + timedelta(days=1),
+            priority=Task.LOW, user=self.user, category=self.category,
+        )
+
+    def assertCacheHit(self, url, params=None):
+        with self.assertNumQueries(0):
+            response = self.client.get(url, params)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        return response
+
+    def assertCacheMiss(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        return response
+
+    def test_writes_in_a_transaction_invalidate_again_on_commit(self):
+        items = [{
+            'title': 'Bulk', 'description': 'Created', 'due_date': (timezone.now() + timedelta(days=1)).isoformat(),
+            'priority': 'Low', 'status': 'Pending', 'category': self.category.id,
+        }]
+        for method, url, data in (
+            (self.client.post, reverse('task-bulk'), items),
+            (self.client.delete, reverse('category-detail', args=[self.category.id]), None),
+        ):
+            with self.subTest(url=url):
+                self.client.get(reverse('task-list'))  # Cache the current page
+                with self.captureOnCommitCallbacks() as callbacks:
+                    method(url, data, format='json')
+                self.assertCacheMiss(reverse('task-list'))  # A concurrent poll before the commit
+                self.assertTrue(callbacks)
+                for callback in callbacks:
+                    callback()
+                self.assertCacheMiss(reverse('task-list'))
+
+    def test_overdue_filter_is_not_cached(self):
+        url = reverse('task-filter')
+        self.assertEqual(self.client.get(url, {'overdue': 'true'}).data['results'], [])
+        later = timezone.now() + timedelta(days=2)
+        with mock.patch('tasks.filters.timezone.now', return_value=later):
+            response = self.client.get(url, {'overdue': 'true'})  # No write, only time has passed
+        self.assertNotIn('X-Cache', response)
+        self.assertEqual([task['id'] for task in response.data['results']], [self.task.id])
+
+    def test_repeated_polls_are_served_from_cache(self):
+        first = self.assertCacheMiss(reverse('task-list'))
+        second = self.assertCacheHit(reverse('task-list'))
+        self.assertEqual(first.data, second.data)
+        # Query parameters are normalized, so their order does not matter
+        self.assertCacheMiss(reverse('task-filter') + '?priority=Low&sort_by=due_date')
+        self.assertCacheHit(reverse('task-filter') + '?sort_by=due_date&priority=Low')
+
+    def test_cache_is_per_user(self):
+        self.assertCacheMiss(reverse('task-list'))
+        other = User.objects.create_user(username='neighbour', email='neighbour@example.com', password='testpass')
+        self.client.force_authenticate(user=other)
+        response = self.assertCacheMiss(reverse('task-list'))
+        self.assertEqual(response.data['results'], [])
+
+    def test_writes_invalidate_the_users_lists(self):
+        url = reverse('task-list')
+        writes = [
+            lambda: self.client.post(url, {
+                'title': 'New', 'description': 'Fresh', 'due_date': timezone.now() + timedelta(days=1),
+                'priority': 'High', 'status': 'Pending', 'category': self.category.id,
+            }),
+            lambda: self.client.patch(reverse('task-detail', args=[self.task.id]), {'title': 'Renamed'}),
+            lambda: self.client.patch(reverse('task-toggle-complete', args=[self.task.id])),
+            lambda: self.client.patch(reverse('task-toggle-incomplete', args=[self.task.id])),
+            lambda: self.client.patch(reverse('task-bulk-complete'), {'ids': [self.task.id]}, format='json'),
+            lambda: self.client.patch(reverse('category-detail', args=[self.category.id]), {'name': 'Renamed category'}),
+            lambda: self.client.post(reverse('category-list'), {'name': 'Another category'}),
+            lambda: self.client.delete(reverse('task-detail', args=[self.task.id])),
+        ]
+        self.assertCacheMiss(url)
+        for write in writes:
+            self.assertCacheHit(url)
+            self.assertLess(write().status_code, 300)
+            response = self.assertCacheMiss(url)  # Also warms the cache for the next write
+        self.assertNotIn(self.task.id, [task['id'] for task in response.data['results']])
+
+    def test_category_delete_invalidates_the_list(self):
+        self.assertCacheMiss(reverse('task-list'))
+        self.client.delete(reverse('category-detail', args=[self.category.id]))
+        response = self.assertCacheMiss(reverse('task-list'))
+        self.assertEqual(response.data['results'], [])
+
+    def test_purge_invalidates_every_user(self):
+        self.assertCacheMiss(reverse('task-list'))
+        self.client.force_authenticate(user=self.admin)
+        self.client.delete(reverse('admin-delete-all-tasks'))
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.assertCacheMiss(reverse('task-list')).data['results'], [])
+
+    def test_stats_report_hits_and_misses(self):
+        self.assertCacheMiss(reverse('task-list'))
+        self.assertCacheHit(reverse('task-list'))
+        self.assertCacheHit(reverse('task-list'))
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('admin-task-cache-stats'))
+        self.assertEqual(response.data, {'hits': 2, 'misses': 1, 'hit_rate': 2 / 3})
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            backend = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}
+            with self.settings(CACHES={'default': backend}):
+                self.assertCacheMiss(reverse('task-list'))
+                self.assertCacheHit(reverse('task-list'))
+                self.client.patch(reverse('task-toggle-complete', args=[self.task.id]))
+                self.assertCacheMiss(reverse('task-list'))
+
+
+class TaskConditionalGetTest(TaskTestCase):
+    """
+    Tests for ETag / Last-Modified handling on task endpoints.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='etag', email='etag@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = TaskCategory.objects.create(name='Conditional', user=self.user)
+        self.task = Task.objects.create(
+            title='Conditional', description='Rarely changes', due_date=timezone.now() + timedelta(days=1),
+            priority=Task.LOW, user=self.user, category=self.category,
+        )
+
+    def test_list_answers_304_when_unchanged(self):
+        for url in (reverse('task-list'), reverse('task-filter') + '?sort_by=due_date'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertIn('Last-Modified', response)
+                etag = response['ETag']
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response['ETag'], etag)
+
+    @override_settings(TASKS_LIST_CACHE_TIMEOUT=0)
+    def test_not_modified_list_skips_reading_rows(self):
+        etag = self.client.get(reverse('task-list'))['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('task-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 2)  # Only the validator aggregates
+        self.assertIn('COUNT', queries[0]['sql'])
+        self.assertIn('tasks_tasktombstone', queries[1]['sql'])
+
+    def test_list_etag_changes_on_write_and_per_page(self):
+        etag = self.client.get(reverse('task-list'))['ETag']
+        self.assertNotEqual(self.client.get(reverse('task-list') + '?page_size=1')['ETag'], etag)
+        self.client.patch(reverse('task-toggle-complete', args=[self.task.id]))
+        response = self.client.get(reverse('task-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_last_modified_advances_on_delete(self):
+        other = Task.objects.create(
+            title='Doomed', description='Deleted later', due_date=timezone.now(),
+            priority=Task.LOW, user=self.user, category=self.category,
+        )
+        Task.objects.filter(pk=self.task.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        Task.objects.filter(pk=other.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        self.client.delete(reverse('task-detail', args=[other.id]))
+        last_modified = self.client.get(reverse('task-list'))['Last-Modified']
+        self.assertEqual(parse_http_date(last_modified), int(TaskTombstone.objects.get().deleted_at.timestamp()))
+
+    def test_list_honours_if_modified_since(self):
+        last_modified = self.client.get(reverse('task-list'))['Last-Modified']
+        response = self.client.get(reverse('task-list'), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_answers_304_when_unchanged(self):
+        url = reverse('task-detail', args=[self.task.id])
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.client.patch(reverse('category-detail', args=[self.category.id]), {'name': 'Renamed'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['category'], 'Renamed')
+
+    def test_last_modified_follows_category_renames(self):
+        for url in (reverse('task-detail', args=[self.task.id]), reverse('task-list')):
+            with self.subTest(url=url):
+                Task.objects.filter(pk=self.task.pk).update(updated_at=timezone.now() - timedelta(days=1))
+                TaskCategory.objects.filter(pk=self.category.pk).update(updated_at=timezone.now() - timedelta(days=1))
+                last_modified = self.client.get(url)['Last-Modified']
+                self.client.patch(reverse('category-detail', args=[self.category.id]), {'name': f'Renamed {url}'})
+                response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotEqual(response['Last-Modified'], last_modified)
+
+    def test_detail_of_missing_task_is_404(self):
+        response = self.client.get(reverse('task-detail', args=[999999]), HTTP_IF_NONE_MATCH='"anything"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskChangesTest(TaskTestCase):
+    """
+    Tests for the delta sync endpoint and the tombstones it reads deletions from.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='syncer', email='syncer@example.com', password='testpass')
+        self.other = User.objects.create_user(username='bystander', email='bystander@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = TaskCategory.objects.create(name='Sync', user=self.user)
+        self.tasks = [self.create_task(f'Sync {index}') for index in range(3)]
+        other_category = TaskCategory.objects.create(name='Elsewhere', user=self.other)
+        Task.objects.create(
+            title='Not mine', description='Other user', due_date=timezone.now(),
+            priority=Task.LOW, user=self.other, category=other_category,
+        )
+
+    def create_task(self, title):
+        return Task.objects.create(
+            title=title, description='Synced', due_date=timezone.now() + timedelta(days=1),
+            priority=Task.MEDIUM, user=self.user, category=self.category,
+        )
+
+    def sync(self, token=None, **params):
+        if token:
+            params['since'] = token
+        response = self.client.get(reverse('task-changes'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def ids(self, rows):
+        return sorted(row['id'] for row in rows)
+
+    def test_initial_sync_returns_every_task_as_created(self):
+        data = self.sync()
+        self.assertEqual(self.ids(data['created']), sorted(task.id for task in self.tasks))
+        self.assertEqual(data['updated'], [])
+        self.assertEqual(data['deleted'], [])
+        self.assertFalse(data['has_more'])
+
+    def test_sync_returns_only_changes_since_token(self):
+        token = self.sync()['next_token']
+        self.assertEqual(self.sync(token), {
+            'created': [], 'updated': [], 'deleted': [], 'next_token': token, 'has_more': False,
+        })
+
+        new_task = self.create_task('New')
+        self.client.patch(reverse('task-toggle-complete', args=[self.tasks[0].id]))
+        self.client.delete(reverse('task-detail', args=[self.tasks[1].id]))
+        data = self.sync(token)
+        self.assertEqual(self.ids(data['created']), [new_task.id])
+        self.assertEqual(self.ids(data['updated']), [self.tasks[0].id])
+        self.assertTrue(data['updated'][0]['is_completed'])
+        self.assertEqual(data['deleted'], [self.tasks[1].id])
+
+        # The next token starts after everything already returned
+        data = self.sync(data['next_token'])
+        self.assertEqual((data['created'], data['updated'], data['deleted']), ([], [], []))
+
+    def test_category_rename_marks_its_tasks_updated(self):
+        token = self.sync()['next_token']
+        self.client.patch(reverse('category-detail', args=[self.category.id]), {'name': 'Renamed'})
+        data = self.sync(token)
+        self.assertEqual(self.ids(data['updated']), sorted(task.id for task in self.tasks))
+        self.assertEqual({row['category'] for row in data['updated']}, {'Renamed'})
+        self.client.patch(reverse('category-detail', args=[self.category.id]), {'name': 'Renamed'})
+        self.assertEqual(self.sync(data['next_token'])['updated'], [])  # Saving the same name changes nothing
+
+    def test_bulk_and_category_deletes_leave_tombstones(self):
+        token = self.sync()['next_token']
+        self.client.delete(reverse('task-bulk'), {'ids': [self.tasks[0].id]}, format='json')
+        self.client.delete(reverse('category-detail', args=[self.category.id]))
+        self.assertEqual(sorted(self.sync(token)['deleted']), sorted(task.id for task in self.tasks))
+
+    def test_sync_pages_through_large_change_sets(self):
+        token = self.sync()['next_token']
+        for task in self.tasks:
+            task.save()
+        with self.settings(TASKS_SYNC_MAX_CHANGES=2):
+            first = self.sync(token)
+            second = self.sync(first['next_token'])
+        self.assertTrue(first['has_more'])
+        self.assertFalse(second['has_more'])
+        self.assertEqual(self.ids(first['updated'] + second['updated']), sorted(task.id for task in self.tasks))
+
+    def test_invalid_and_expired_tokens(self):
+        response = self.client.get(reverse('task-changes'), {'since': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        token = self.sync()['next_token']
+        with self.settings(TASKS_TOMBSTONE_RETENTION_DAYS=-1):
+            response = self.client.get(reverse('task-changes'), {'since': token})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_prune_tombstones_command(self):
+        self.client.delete(reverse('task-detail', args=[self.tasks[0].id]))
+        TaskTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=400))
+        self.client.delete(reverse('task-detail', args=[self.tasks[1].id]))
+        call_command('prune_tombstones', stdout=io.StringIO())
+        self.assertEqual(list(TaskTombstone.objects.values_list('task_id', flat=True)), [self.tasks[1].id])
+
+
+class TaskToggleTest(TaskTestCase):
+    """
+    Tests for the single-statement completion toggles.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='toggler', email='toggler@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        category = TaskCategory.objects.create(name='Toggle', user=self.user)
+        self.task = Task.objects.create(
+            title='Toggle', description='Flip me', due_date=timezone.now(),
+            priority=Task.LOW, user=self.user, category=category,
+        )
+
+    def test_toggle_flips_state_in_one_statement(self):
+        url = reverse('task-toggle-complete', args=[self.task.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(url)
+        self.assertEqual(response.data, {'id': self.task.id, 'is_completed': True, 'status': Task.COMPLETED})
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].startswith('UPDATE'))
+
+        response = self.client.patch(url)
+        self.assertEqual(response.data, {'id': self.task.id, 'is_completed': False, 'status': Task.PENDING})
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.is_completed, self.task.status), (False, Task.PENDING))
+
+    def test_incomplete_sets_pending_and_touches_updated_at(self):
+        Task.objects.filter(pk=self.task.pk).update(is_completed=True, status=Task.COMPLETED)
+        before = Task.objects.get(pk=self.task.pk).updated_at
+        response = self.client.patch(reverse('task-toggle-incomplete', args=[self.task.id]))
+        self.assertEqual(response.data, {'id': self.task.id, 'is_completed': False, 'status': Task.PENDING})
+        self.assertGreater(Task.objects.get(pk=self.task.pk).updated_at, before)
+
+    def test_toggle_of_another_users_task_is_404(self):
+        intruder = User.objects.create_user(username='intruder', email='intruder@example.com', password='testpass')
+        self.client.force_authenticate(user=intruder)
+        for name in ('task-toggle-complete', 'task-toggle-incomplete'):
+            response = self.client.patch(reverse(name, args=[self.task.id]))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.is_completed)
+
+    def test_update_returning_without_returning_support(self):
+        with mock.patch.object(connection, 'vendor', 'mysql'):
+            rows = Task.objects.filter(pk=self.task.pk).update_returning(
+                ['id', 'status'], status=Task.COMPLETED, is_completed=True
+            )
+        self.assertEqual(rows, [{'id': self.task.id, 'status': Task.COMPLETED}])
+
+
+class TaskPartialUpdateTest(TaskTestCase):
+    """
+    Tests for column-level task updates and If-Match optimistic concurrency.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='editor', email='editor@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = TaskCategory.objects.create(name='Edits', user=self.user)
+        self.task = Task.objects.create(
+            title='Original', description='Untouched', due_date=timezone.now() + timedelta(days=1),
+            priority=Task.LOW, user=self.user, category=self.category,
+        )
+        self.url = reverse('task-detail', args=[self.task.id])
+
+    def test_patch_writes_only_changed_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {'title': 'Renamed', 'priority': 'Low'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        update, = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertIn('"title"', update)
+        self.assertIn('"updated_at"', update)
+        for column in ('"description"', '"priority"', '"due_date"', '"category_id"'):
+            self.assertNotIn(column, update)
+
+    def test_patch_without_changes_skips_the_write(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {'title': 'Original'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE')])
+
+    def test_if_match_with_current_etag_updates_and_returns_new_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'title': 'Matched'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(self.url)['ETag'], response['ETag'])
+
+    def test_if_match_after_saving_the_category_unchanged(self):
+        response = self.client.patch(reverse('category-detail', args=[self.category.id]), {'name': 'Edits'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'title': 'Matched'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_match_with_stale_etag_is_rejected(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.patch(self.url, {'title': 'Someone else'})
+        response = self.client.patch(self.url, {'description': 'Lost write'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.title, self.task.description), ('Someone else', 'Untouched'))
+
+    def test_concurrent_write_between_check_and_update_is_rejected(self):
+        stale = self.task.updated_at
+        Task.objects.filter(pk=self.task.pk).update(title='Raced', updated_at=timezone.now())
+        serializer = TaskSerializer(
+            self.task, data={'description': 'Late'}, partial=True, context={'expected_updated_at': stale}
+        )
+        serializer.is_valid(raise_exception=True)
+        with self.assertRaises(PreconditionFailed):
+            serializer.save()
+        self.assertEqual(Task.objects.get(pk=self.task.pk).description, 'Untouched')
+
+
+class TaskCategoryResolutionTest(TaskTestCase):
+    """
+    Tests for request-scoped category resolution and ownership checks.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='resolver', email='resolver@example.com', password='testpass')
+        self.other = User.objects.create_user(username='owner', email='owner@example.com', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = TaskCategory.objects.create(name='Mine', user=self.user)
+        self.foreign = TaskCategory.objects.create(name='Theirs', user=self.other)
+        self.data = {
+            'title': 'Resolved', 'description': 'Category by id', 'priority': 'Low',
+            'due_date': (timezone.now() + timedelta(days=1)).isoformat(), 'category': self.category.id,
+        }
+
+    def test_create_rejects_another_users_category(self):
+        response = self.client.post(reverse('task-list'), dict(self.data, category=self.foreign.id))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('category', response.data)
+        self.assertFalse(Task.objects.exists())
+
+    def test_update_rejects_another_users_category(self):
+        task = Task.objects.create(
+            title='Mine', description='Owned', due_date=timezone.now() + timedelta(days=1),
+            priority=Task.LOW, user=self.user, category=self.category,
+        )
+        response = self.client.patch(reverse('task-detail', args=[task.id]), {'category': self.foreign.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_loads_categories_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('task-bulk'), [self.data] * 20, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        category_queries = [query for query in queries if 'FROM "categories_taskcategory"' in query['sql']]
+        self.assertEqual(len(category_queries), 1)
+
+    def test_non_integral_category_ids_are_rejected(self):
+        for value in (self.category.id + 0.7, f'{self.category.id}.0', True, '', [self.category.id]):
+            with self.subTest(value=value):
+                response = self.client.post(reverse('task-list'), dict(self.data, category=value), format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('category', response.data)
+        self.assertFalse(Task.objects.exists())
+        response = self.client.post(reverse('task-list'), dict(self.data, category=str(self.category.id)), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(TASKS_LIST_CACHE_TIMEOUT=0)
+    def test_filter_by_category_uses_category_id(self):
+        Task.objects.create(
+            title='Mine', description='Owned', due_date=timezone.now() + timedelta(days=1),
+            priority=Task.LOW, user=self.user, category=self.category,
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('task-filter'), {'category': 'Mine'})
+        self.assertEqual(len(response.data['results']), 1)
+        category_queries = [query for query in queries if 'FROM "categories_taskcategory"' in query['sql']]
+        self.assertEqual(len(category_queries), 1)  # Shared by the validators and the page
+
+        response = self.client.get(reverse('task-filter'), {'category': 'Theirs'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(TASKS_LIST_CACHE_TIMEOUT=0)
+class AsyncTaskViewsTest(TaskTestCase):
+    """
+    Tests that the async read views answer exactly like the DRF views.
+    """
+    def setUp(self):
+        super().setUp()
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username='async', email='async@example.com', password='testpass')
+        self.category = TaskCategory.objects.create(name='Async', user=self.user)
+        self.tasks = [
+            Task.objects.create(
+                title=f'Async {index}', description='Served without a thread hop',
+                due_date=timezone.now() + timedelta(days=index + 1), priority=index % 3 + 1,
+                user=self.user, category=self.category,
+            )
+            for index in range(5)
+        ]
+
+    def call(self, view, path, authenticate=True, headers=None, **kwargs):
+        request = self.factory.get(path, **(headers or {}))
+        if authenticate:
+            force_authenticate(request, user=self.user)
+        handler = view.as_view()
+        if iscoroutinefunction(handler):
+            handler = async_to_sync(handler)
+        response = handler(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def assertSameResponse(self, sync_view, async_view, path, **kwargs):
+        expected = self.call(sync_view, path, **kwargs)
+        actual = self.call(async_view, path, **kwargs)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(json.loads(actual.content), json.loads(expected.content))
+        self.assertEqual(actual.get('ETag'), expected.get('ETag'))
+        return actual
+
+    def test_list_matches_sync_view(self):
+        self.assertSameResponse(TaskListView, AsyncTaskListView, '/api/tasks/?page_size=2')
+
+    def test_filter_matches_sync_view(self):
+        for query in ('sort_by=due_date', 'category=Async&priority=High', 'priority_min=Medium&sort_by=priority',
+                      'status=Unknown', 'category=Missing'):
+            with self.subTest(query=query):
+                self.assertSameResponse(TaskFilterView, AsyncTaskFilterView, f'/api/tasks/filter/?{query}')
+
+    def test_detail_matches_sync_view(self):
+        task = self.tasks[0]
+        self.assertSameResponse(TaskDetailView, AsyncTaskDetailView, f'/api/tasks/{task.id}/', pk=task.id)
+        response = self.call(AsyncTaskDetailView, '/api/tasks/999999/', pk=999999)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_conditional_get(self):
+        etag = self.call(AsyncTaskListView, '/api/tasks/')['ETag']
+        response = self.call(AsyncTaskListView, '/api/tasks/', headers={'HTTP_IF_NONE_MATCH': etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_file_cache_is_used_off_the_event_loop(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}}
+            with override_settings(CACHES=caches, TASKS_LIST_CACHE_TIMEOUT=300), \
+                    mock.patch('tasks.async_views.sync_to_async', wraps=sync_to_async) as hop:
+                self.assertEqual(self.call(AsyncTaskListView, '/api/tasks/')['X-Cache'], 'MISS')
+                self.assertEqual(self.call(AsyncTaskListView, '/api/tasks/')['X-Cache'], 'HIT')
+        self.assertTrue(all(call.kwargs == {'thread_sensitive': False} for call in hop.call_args_list))
+        self.assertGreater(hop.call_count, 4)
+
+    def test_jwt_authentication(self):
+        token = RefreshToken.for_user(self.user).access_token
+        response = self.call(
+            AsyncTaskListView, '/api/tasks/', authenticate=False, headers={'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        )
+        self.assertEqual(len(json.loads(response.content)['results']), 5)
+
+        response = self.call(AsyncTaskListView, '/api/tasks/', authenticate=False)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('Bearer', response['WWW-Authenticate'])
+
+    def test_writes_are_delegated_to_the_sync_view(self):
+        request = self.factory.patch(f'/api/tasks/{self.tasks[0].id}/', {'title': 'Delegated'}, format='json')
+        force_authenticate(request, user=self.user)
+        response = async_to_sync(AsyncTaskDetailView.as_view())(request, pk=self.tasks[0].id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Task.objects.get(pk=self.tasks[0].id).title, 'Delegated')
+
+
+class BenchmarkSuiteTest(TaskTestCase):
+    """
+    Smoke test for the benchmark command and its data generator.
+    """
+    def test_generate_dataset(self):
+        dataset = generate_dataset(users=2, categories=3, tasks=10)
+        self.assertEqual(len(dataset.users), 2)
+        for user in dataset.users:
+            self.assertEqual(len(dataset.categories[user.id]), 3)
+            self.assertEqual(Task.objects.for_user(user).count(), 10)
+
+    def test_run_benchmarks_writes_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = f'{directory}/results.json'
+            call_command('run_benchmarks', users=2, categories=2, tasks=200, repeat=1, output=output, stdout=io.StringIO())
+            with open(output) as results:
+                report = json.load(results)
+            call_command('run_benchmarks', users=2, categories=2, tasks=200, repeat=1, output=output,
+                         baseline=output, stdout=io.StringIO())
+        names = {result['name'] for result in report['results']}
+        self.assertIn('serializer/TaskRowSerializer', names)
+        self.assertIn('filter/category/sort=due_date', names)
+        self.assertIn('toggle/task-toggle-complete', names)
+        self.assertIn('bulk_delete/100', names)
+        self.assertIn('auth/jwt_login', names)
+        self.assertEqual(report['dataset'], {'users': 2, 'categories': 2, 'tasks': 200})
+        self.assertFalse(User.objects.filter(username__startswith='bench-').exists())  # Rolled back
+
+
+class RequestMetricsTest(TaskTestCase):
+    """
+    Tests for the request instrumentation middleware and the /metrics endpoint.
+    """
+    def setUp(self):
+        super().setUp()
+        for histogram in HISTOGRAMS:
+            histogram.clear()
+        self.user = User.objects.create_user(username='metrics', email='metrics@example.com', password='testpass')
+        category = TaskCategory.objects.create(name='Work', user=self.user)
+        Task.objects.create(
+            title='Measured', description='Task', due_date=timezone.now() + timedelta(days=1),
+            priority=Task.HIGH, user=self.user, category=category,
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('task-list'))
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        self.assertIn('serialize;dur=', timing)
+        self.assertIn('render;dur=', timing)
+        self.assertIn('total;dur=', timing)
+
+    def test_metrics_endpoint_exposes_histograms(self):
+        self.client.get(reverse('task-list'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('http_request_duration_seconds_count{view="task-list",method="GET",status="200"} 1', body)
+        self.assertIn('http_request_db_queries_bucket{view="task-list",le="+Inf"} 1', body)
+        self.assertIn('http_request_serialization_seconds_count{view="task-list"} 1', body)
+        self.assertIn('http_response_size_bytes_count{view="task-list"} 1', body)
+
+    def test_metrics_endpoint_is_local_only(self):
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='203.0.113.5')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_metrics_token_replaces_the_address_check(self):
+        with override_settings(METRICS_TOKEN='scrape-secret'):
+            response = self.client.get(reverse('metrics'))  # Loopback, as behind a local proxy
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+            response = self.client.get(
+                reverse('metrics'), REMOTE_ADDR='203.0.113.5', HTTP_AUTHORIZATION='Bearer scrape-secret',
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_slow_request_logs_sql(self):
+        with override_settings(METRICS_SLOW_REQUEST_MS=0.000001):
+            with self.assertLogs('task_management_api.metrics', level='WARNING') as logs:
+                self.client.get(reverse('task-list'))
+        self.assertIn('view=task-list', logs.output[0])
+        self.assertIn('FROM "tasks_task"', logs.output[0])
+
+    def test_fast_requests_are_not_logged(self):
+        with override_settings(METRICS_SLOW_REQUEST_MS=60000):
+            with self.assertNoLogs('task_management_api.metrics', level='WARNING'):
+                self.client.get(reverse('task-list'))
+
+    def test_async_view_queries_are_counted(self):
+        with override_settings(TASKS_LIST_CACHE_TIMEOUT=0):
+            request = APIRequestFactory().get('/api/tasks/')
+            force_authenticate(request, user=self.user)
+            metrics = RequestMetrics(max_statements=10)
+            token = current.set(metrics)
+            try:
+                async_to_sync(AsyncTaskListView.as_view())(request)
+            finally:
+                current.reset(token)
+        self.assertGreater(metrics.queries, 0)
+        self.assertIn('serialize', metrics.phases)
+
+
+class TaskSearchTest(TaskTestCase):
+    """
+    Tests for the ranked full-text task search endpoint.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='searcher', email='searcher@example.com', password='testpass')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='testpass')
+        self.category = TaskCategory.objects.create(name='Work', user=self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def create_task(self, title, description='Nothing to see', user=None):
+        user = user or self.user
+        category = self.category if user == self.user else TaskCategory.objects.create(name=title, user=user)
+        return Task.objects.create(
+            title=title, description=description, due_date=timezone.now() + timedelta(days=1),
+            user=user, category=category,
+        )
+
+    def search(self, q, **params):
+        return self.client.get(reverse('task-search'), {'q': q, **params})
+
+    def result_ids(self, response):
+        return [task['id'] for task in response.data['results']]
+
+    def test_title_matches_rank_first(self):
+        in_description = self.create_task('Weekly chores', 'Prepare the quarterly report')
+        in_title = self.create_task('Quarterly report', 'Due before the board meeting')
+        response = self.search('quarterly report')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.result_ids(response), [in_title.id, in_description.id])
+        self.assertEqual(response.data['results'][0]['category'], 'Work')
+
+    def test_last_term_matches_as_prefix(self):
+        task = self.create_task('Renew passport')
+        self.assertEqual(self.result_ids(self.search('pass')), [task.id])
+        self.assertEqual(self.result_ids(self.search('pass renew')), [])  # Earlier terms must match whole words
+
+    def test_only_own_tasks_are_returned(self):
+        self.create_task('Secret plan', user=self.other)
+        mine = self.create_task('Secret plan')
+        self.assertEqual(self.result_ids(self.search('secret')), [mine.id])
+
+    def test_index_follows_create_update_and_delete(self):
+        response = self.client.post(reverse('task-list'), {
+            'title': 'Book flights', 'description': 'Vacation', 'due_date': (timezone.now() + timedelta(days=3)).isoformat(),
+            'priority': 'Low', 'status': 'Pending', 'category': self.category.id,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        task_id = response.data['id']
+        self.assertEqual(self.result_ids(self.search('flights')), [task_id])
+
+        self.client.patch(reverse('task-detail', args=[task_id]), {'title': 'Book hotel'}, format='json')
+        self.assertEqual(self.result_ids(self.search('flights')), [])
+        self.assertEqual(self.result_ids(self.search('hotel')), [task_id])
+
+        Task.objects.filter(pk=task_id).update(description='Conference trip')  # Bypasses the serializer
+        self.assertEqual(self.result_ids(self.search('conference')), [task_id])
+
+        self.client.delete(reverse('task-detail', args=[task_id]))
+        self.assertEqual(self.result_ids(self.search('hotel')), [])
+
+    def test_pagination(self):
+        tasks = [self.create_task(f'Errand {index}') for index in range(5)]
+        response = self.search('errand', page_size=2)
+        seen = self.result_ids(response)
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen += self.result_ids(response)
+        self.assertEqual(sorted(seen), sorted(task.id for task in tasks))
+        self.assertEqual(len(seen), len(set(seen)))
+
+        previous = self.client.get(response.data['previous'])
+        self.assertEqual(len(previous.data['results']), 2)
+
+    def test_query_without_words_is_rejected(self):
+        response = self.search('"*()')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
+    def test_operators_are_treated_as_text(self):
+        task = self.create_task('Call NEAR office')
+        self.assertEqual(self.result_ids(self.search('call AND NOT "office')), [])
+        self.assertEqual(self.result_ids(self.search('call near office')), [task.id])
+
+
+class TaskStatsTest(TaskTestCase):
+    """
+    Tests for the task statistics endpoint and the trigger-maintained counters.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='stats', email='stats@example.com', password='testpass')
+        self.work = TaskCategory.objects.create(name='Work', user=self.user)
+        self.home = TaskCategory.objects.create(name='Home', user=self.user)
+        self.client.force_authenticate(user=self.user)
+        now = timezone.now()
+        self.overdue = self.create_task(now - timedelta(days=2), Task.HIGH, self.work)
+        self.create_task(now - timedelta(days=1), Task.LOW, self.work, completed=True)  # Done, so not overdue
+        self.create_task(now + timedelta(days=60), Task.MEDIUM, self.home)
+
+    def create_task(self, due_date, priority, category, completed=False):
+        return Task.objects.create(
+            title='Task', description='Stats', due_date=due_date, priority=priority, user=self.user, category=category,
+            is_completed=completed, status=Task.COMPLETED if completed else Task.PENDING,
+        )
+
+    def get_stats(self):
+        response = self.client.get(reverse('task-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_stats(self):
+        data = self.get_stats().data
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(data['by_status'], {'Pending': 2, 'Completed': 1})
+        self.assertEqual(data['by_priority'], {'Low': 1, 'Medium': 1, 'High': 1})
+        self.assertEqual(data['by_category'], [
+            {'id': self.home.id, 'name': 'Home', 'count': 1},
+            {'id': self.work.id, 'name': 'Work', 'count': 2},
+        ])
+        self.assertEqual(data['overdue'], 1)
+
+    def test_due_this_week(self):
+        now = datetime(2026, 10, 14, 12, tzinfo=dt_timezone.utc)  # A Wednesday
+        Task.objects.filter(pk=self.overdue.pk).update(due_date=datetime(2026, 10, 18, 20, tzinfo=dt_timezone.utc))
+        with override_settings(TIME_ZONE='UTC'):
+            stats = get_task_stats(self.user, now=now)
+        self.assertEqual(stats['due_this_week'], 1)
+        self.assertEqual(stats['overdue'], 0)
+
+    def test_counters_match_grouped_queries(self):
+        self.client.patch(reverse('task-toggle-complete', args=[self.overdue.pk]))
+        self.client.patch(reverse('task-detail', args=[self.overdue.pk]), {'priority': 'Low'}, format='json')
+        self.client.delete(reverse('task-bulk'), {'ids': [self.overdue.pk]}, format='json')
+        Task.objects.for_user(self.user).update(priority=Task.HIGH)
+        with override_settings(TASKS_STATS_CACHE_TIMEOUT=0):
+            counted = self.get_stats().data
+            with override_settings(TASKS_STATS_COUNTERS=False):
+                grouped = self.get_stats().data
+        self.assertEqual(counted, grouped)
+        self.assertEqual(counted['by_priority'], {'Low': 0, 'Medium': 0, 'High': 2})
+
+    def test_tasks_in_other_users_categories(self):
+        other = User.objects.create_user(username='lender', email='lender@example.com', password='testpass')
+        borrowed = TaskCategory.objects.create(name='Borrowed', user=other)
+        self.create_task(timezone.now() + timedelta(days=60), Task.LOW, borrowed)
+        Task.objects.create(title='Theirs', description='Stats', due_date=timezone.now(), priority=Task.LOW,
+                            user=other, category=self.work)
+        with override_settings(TASKS_STATS_CACHE_TIMEOUT=0):
+            counted = self.get_stats().data
+            with override_settings(TASKS_STATS_COUNTERS=False):
+                grouped = self.get_stats().data
+        self.assertEqual(counted, grouped)
+        self.assertEqual(counted['by_category'], [
+            {'id': borrowed.id, 'name': 'Borrowed', 'count': 1},
+            {'id': self.home.id, 'name': 'Home', 'count': 1},
+            {'id': self.work.id, 'name': 'Work', 'count': 2},
+        ])
+
+    def test_one_query_per_dimension(self):
+        with override_settings(TASKS_STATS_CACHE_TIMEOUT=0):
+            with CaptureQueriesContext(connection) as queries:
+                self.get_stats()
+            self.assertEqual(len(queries), 3)  # Counters, categories, due dates
+            with override_settings(TASKS_STATS_COUNTERS=False):
+                with CaptureQueriesContext(connection) as queries:
+                    self.get_stats()
+            self.assertEqual(len(queries), 4)  # Status, priority, categories, due dates
+
+    def test_stats_are_cached_until_the_next_write(self):
+        self.assertEqual(self.get_stats()['X-Cache'], 'MISS')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_stats()['X-Cache'], 'HIT')
+        self.assertEqual(len(queries), 0)
+        self.client.delete(reverse('task-detail', args=[self.overdue.pk]))
+        response = self.get_stats()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['total'], 2)
+
+    def test_rebuild_counters(self):
+        TaskCounter.objects.filter(user=self.user).update(total=99, high=0)
+        self.assertEqual(rebuild_counters(User.objects.filter(pk=self.user.pk)), 1)
+        counter = TaskCounter.objects.get(user=self.user)
+        self.assertEqual((counter.total, counter.pending, counter.completed, counter.high), (3, 2, 1, 1))
+
+
+class TaskTriggerTest(TaskTestCase):
+    """
+    Tests for the trigger-maintained counts: the system check that the triggers
+    survived the migrations, and the migrations' refusal of other databases.
+    """
+    def test_triggers_exist_after_migrate(self):
+        self.assertEqual(check_task_triggers(None, databases=['default']), [])
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite drops triggers when it rebuilds a table')
+    def test_missing_trigger_is_reported(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER tasks_category_counts_update')  # Rolled back with the test
+        error, = check_task_triggers(None, databases=['default'])
+        self.assertEqual(error.id, 'tasks.E001')
+        self.assertIn('tasks_category_counts_update', error.msg)
+
+    def test_migrations_refuse_unsupported_databases(self):
+        schema_editor = mock.Mock(connection=mock.Mock(vendor='mysql'))
+        for name in ('0014_task_counter', '0015_category_task_counts'):
+            migration = import_module(f'tasks.migrations.{name}')
+            with self.subTest(migration=name), self.assertRaises(NotSupportedError):
+                migration.run({'sqlite': migration.SQLITE_FORWARD}, required=True)(None, schema_editor)
+        search = import_module('tasks.migrations.0013_task_search_index')
+        with self.assertWarns(RuntimeWarning):
+            search.run({'sqlite': search.SQLITE_FORWARD}, required=True)(None, schema_editor)
+        schema_editor.execute.assert_not_called()
+
+
+@override_settings(TIME_ZONE='UTC')
+class RecurrenceTest(TaskTestCase):
+    """
+    Tests for recurring tasks: rule expansion, the recurrence endpoint and
+    batched occurrence generation.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='repeat', email='repeat@example.com', password='testpass')
+        self.category = TaskCategory.objects.create(name='Routine', user=self.user)
+        self.client.force_authenticate(user=self.user)
+        self.now = datetime(2030, 1, 1, 12, tzinfo=dt_timezone.utc)  # A Tuesday
+        self.template = self.create_task(datetime(2030, 1, 1, 9, tzinfo=dt_timezone.utc))
+
+    def create_task(self, due_date):
+        return Task.objects.create(
+            title='Water plants', description='Every one of them', due_date=due_date, priority=Task.HIGH,
+            user=self.user, category=self.category,
+        )
+
+    def create_rule(self, task=None, **fields):
+        rule = RecurrenceRule(task=task or self.template, **fields)
+        schedule(rule, after=self.now).save()
+        return rule
+
+    def occurrences(self, rule, start, count):
+        dates = iter_occurrences(rule, self.template.due_date, start)
+        return [next(dates).strftime('%Y-%m-%d') for _ in range(count)]
+
+    def test_daily_interval_resumes_on_the_series_grid(self):
+        rule = RecurrenceRule(frequency=RecurrenceRule.DAILY, interval=3)
+        self.assertEqual(self.occurrences(rule, datetime(2030, 1, 5).date(), 3), ['2030-01-07', '2030-01-10', '2030-01-13'])
+
+    def test_weekly_by_weekday(self):
+        rule = RecurrenceRule(frequency=RecurrenceRule.WEEKLY, interval=2, by_weekday='MO,FR')
+        self.assertEqual(
+            self.occurrences(rule, self.template.due_date.date(), 4),
+            ['2030-01-04', '2030-01-14', '2030-01-18', '2030-01-28'],
+        )
+
+    def test_monthly_skips_short_months_and_supports_the_last_day(self):
+        rule = RecurrenceRule(frequency=RecurrenceRule.MONTHLY, by_month_day=31)
+        self.assertEqual(self.occurrences(rule, self.template.due_date.date(), 3), ['2030-01-31', '2030-03-31', '2030-05-31'])
+        rule.by_month_day = -1
+        self.assertEqual(self.occurrences(rule, self.template.due_date.date(), 3), ['2030-01-31', '2030-02-28', '2030-03-31'])
+
+    def test_occurrences_keep_the_time_of_day(self):
+        rule = RecurrenceRule(frequency=RecurrenceRule.DAILY)
+        due = next(iter_occurrences(rule, self.template.due_date, datetime(2031, 6, 1).date()))
+        self.assertEqual(due, datetime(2031, 6, 1, 9, tzinfo=dt_timezone.utc))
+
+    def test_parse_rrule(self):
+        self.assertEqual(parse_rrule('RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;COUNT=10'), {
+            'frequency': RecurrenceRule.WEEKLY, 'interval': 2, 'by_weekday': 'MO,WE', 'count': 10,
+        })
+        self.assertEqual(parse_rrule('FREQ=MONTHLY;UNTIL=20300601T000000Z')['until'],
+                         datetime(2030, 6, 1, tzinfo=dt_timezone.utc))
+        for text in ('FREQ=YEARLY', 'FREQ=DAILY;BYHOUR=9', 'FREQ=DAILY;COUNT=x', 'nonsense'):
+            with self.assertRaises(ValidationError):
+                parse_rrule(text)
+
+    def test_set_rule_schedules_without_creating_tasks(self):
+        url = reverse('task-recurrence', args=[self.template.pk])
+        response = self.client.put(url, {'rrule': 'FREQ=WEEKLY;BYDAY=we,mo,we;COUNT=5'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rrule'], 'FREQ=WEEKLY;BYDAY=MO,WE;COUNT=5')
+        self.assertIsNotNone(response.data['next_occurrence'])
+        self.assertEqual(Task.objects.count(), 1)
+
+        response = self.client.put(url, {'frequency': 'Daily', 'by_weekday': 'MO'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.put(url, {'frequency': 'Daily', 'interval': 2}, format='json')
+        self.assertEqual(response.data['rrule'], 'FREQ=DAILY;INTERVAL=2')  # Fields left out were reset
+        self.assertEqual(self.client.get(url).data['interval'], 2)
+
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_replacing_a_rule_does_not_repeat_occurrences(self):
+        url = reverse('task-recurrence', args=[self.template.pk])
+        horizon = self.template.due_date + timedelta(days=5)
+        self.client.put(url, {'frequency': 'Daily'}, format='json')
+        self.assertEqual(generate_occurrences(horizon), (1, 5))
+        response = self.client.put(url, {'frequency': 'Daily'}, format='json')
+        self.assertEqual(response.data['generated_count'], 1)  # The count restarts
+        self.assertEqual(generate_occurrences(horizon), (0, 0))
+        generate_occurrences(horizon + timedelta(days=2))
+        due_dates = list(Task.objects.values_list('due_date', flat=True))
+        self.assertEqual(len(due_dates), 8)
+        self.assertEqual(len(set(due_dates)), len(due_dates))
+
+    def test_rules_of_other_users_tasks_are_hidden(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass')
+        self.client.force_authenticate(user=other)
+        response = self.client.put(reverse('task-recurrence', args=[self.template.pk]), {'frequency': 'Daily'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_generation_is_batched_and_idempotent(self):
+        for day in range(5):
+            self.create_rule(self.create_task(self.template.due_date + timedelta(days=day)), frequency=RecurrenceRule.DAILY)
+        horizon = self.now + timedelta(days=10)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(generate_occurrences(horizon, batch_size=2), (5, 10 + 9 + 8 + 7 + 6))  # Up to January 11th
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "tasks_task"')]
+        self.assertEqual(len(inserts), 3)  # One per batch of rules
+        self.assertEqual(generate_occurrences(horizon), (0, 0))
+        self.assertEqual(Task.objects.filter(due_date__gt=horizon).count(), 0)
+        self.assertEqual(Task.objects.filter(due_date__date='2030-01-09').count(), 5)
+
+    def test_count_and_until_end_the_series(self):
+        counted = self.create_rule(frequency=RecurrenceRule.DAILY, count=3)
+        until = self.create_rule(self.create_task(self.template.due_date), frequency=RecurrenceRule.WEEKLY,
+                                 until=datetime(2030, 1, 20, tzinfo=dt_timezone.utc))
+        generate_occurrences(self.now + timedelta(days=60))
+        counted.refresh_from_db()
+        until.refresh_from_db()
+        self.assertEqual((counted.generated_count, counted.next_occurrence), (3, None))
+        self.assertEqual((until.generated_count, until.next_occurrence), (3, None))  # Jan 8 and 15
+        self.assertEqual(Task.objects.count(), 2 + 2 + 2)
+
+    def test_generated_tasks_copy_the_template(self):
+        self.create_rule(frequency=RecurrenceRule.MONTHLY)
+        generate_occurrences(self.now + timedelta(days=40))
+        occurrence = Task.objects.exclude(pk=self.template.pk).get()
+        self.assertEqual(
+            (occurrence.title, occurrence.priority, occurrence.category_id, occurrence.status, occurrence.due_date),
+            ('Water plants', Task.HIGH, self.category.id, Task.PENDING, datetime(2030, 2, 1, 9, tzinfo=dt_timezone.utc)),
+        )
+
+    def test_command(self):
+        rule = RecurrenceRule(task=self.create_task(timezone.now()), frequency=RecurrenceRule.DAILY)
+        schedule(rule).save()
+        out = io.StringIO()
+        call_command('generate_occurrences', '--days', '3', stdout=out)
+        self.assertIn('Generated 3 tasks from 1 recurrence rules', out.getvalue())
+
+    def test_deleting_and_purging_templates(self):
+        self.create_rule(frequency=RecurrenceRule.DAILY)
+        response = self.client.delete(reverse('task-bulk'), {'ids': [self.template.pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(RecurrenceRule.objects.exists())
+        self.create_rule(self.create_task(self.now), frequency=RecurrenceRule.DAILY)
+        self.assertEqual(purge_tasks(), {'recurrence rules': 1, 'tasks': 1})
+
+    def test_chunked_delete_cascades_to_rows_left_behind(self):
+        rule = self.create_rule(frequency=RecurrenceRule.DAILY)
+        count = Task.objects.count()
+        self.assertEqual(chunked_delete(Task.objects.all(), 10), count)  # Without deleting the rule first
+        self.assertFalse(RecurrenceRule.objects.filter(pk=rule.pk).exists())
@@ -1,19 +1,46 @@
+from django.conf import settings
 from django.urls import path
-from .views import (AdminTaskListView, AdminDeleteAllTasksView, TaskListView, TaskDetailView, TaskToggleCompleteView, TaskToggleIncompleteView, TaskFilterView)
+from .views import (AdminTaskListView, AdminDeleteAllTasksView, AdminTaskCacheStatsView, TaskListView, TaskDetailView, TaskBulkView, TaskBulkCompletionView, TaskToggleCompleteView, TaskToggleIncompleteView, TaskRecurrenceView, TaskFilterView, TaskSearchView, TaskStatsView, TaskChangesView, TaskExportView)
+from .async_views import AsyncTaskListView, AsyncTaskFilterView, AsyncTaskDetailView
+
+# Under ASGI, serve the hot read endpoints with async-native views (writes still go to the DRF views)
+if getattr(settings, 'TASKS_ASYNC_VIEWS', False):
+    task_list, task_filter, task_detail = AsyncTaskListView, AsyncTaskFilterView, AsyncTaskDetailView
+else:
+    task_list, task_filter, task_detail = TaskListView, TaskFilterView, TaskDetailView
 
 urlpatterns = [
     # Admin views
     path('admin/tasks/', AdminTaskListView.as_view(), name='admin-task-list'),  # GET: List all tasks (admin only)
     path('admin/tasks/delete/all/', AdminDeleteAllTasksView.as_view(), name='admin-delete-all-tasks'),  # DELETE: Delete all tasks (admin only)
+    path('admin/tasks/cache/', AdminTaskCacheStatsView.as_view(), name='admin-task-cache-stats'),  # GET: Task list cache hit/miss metrics (admin only)
 
     # User views
-    path('tasks/', TaskListView.as_view(), name='task-list'),  # GET: List user's tasks, POST: Create a new task
-    path('tasks/<int:pk>/', TaskDetailView.as_view(), name='task-detail'),  # GET: Retrieve task, PUT: Update task, DELETE: Delete task
+    path('tasks/', task_list.as_view(), name='task-list'),  # GET: List user's tasks, POST: Create a new task
+    path('tasks/bulk/', TaskBulkView.as_view(), name='task-bulk'),  # POST: Create tasks, PATCH: Update tasks, DELETE: Delete tasks (in bulk)
+    path('tasks/bulk/complete/', TaskBulkCompletionView.as_view(is_completed=True), name='task-bulk-complete'),  # PATCH: Mark many tasks as complete
+    path('tasks/bulk/incomplete/', TaskBulkCompletionView.as_view(is_completed=False), name='task-bulk-incomplete'),  # PATCH: Mark many tasks as incomplete
+    path('tasks/<int:pk>/', task_detail.as_view(), name='task-detail'),  # GET: Retrieve task, PUT: Update task, DELETE: Delete task
     
     # Task completion/incomplete toggle views
     path('tasks/<int:pk>/complete/', TaskToggleCompleteView.as_view(), name='task-toggle-complete'),  # PATCH: Toggle task completion
     path('tasks/<int:pk>/incomplete/', TaskToggleIncompleteView.as_view(), name='task-toggle-incomplete'),  # PATCH: Mark task as incomplete
 
+    # Task recurrence view
+    path('tasks/<int:pk>/recurrence/', TaskRecurrenceView.as_view(), name='task-recurrence'),  # GET: Retrieve rule, PUT: Set rule, DELETE: Stop repeating
+
     # Task filter and sorting view
-    path('tasks/filter/', TaskFilterView.as_view(), name='task-filter'),  # GET: Filter and sort tasks
+    path('tasks/filter/', task_filter.as_view(), name='task-filter'),  # GET: Filter and sort tasks
+
+    # Task search view
+    path('tasks/search/', TaskSearchView.as_view(), name='task-search'),  # GET: Ranked full-text search of tasks (?q=)
+
+    # Task statistics view
+    path('tasks/stats/', TaskStatsView.as_view(), name='task-stats'),  # GET: Task counts by status, priority, category and due date
+
+    # Delta sync view
+    path('tasks/changes/', TaskChangesView.as_view(), name='task-changes'),  # GET: Tasks created, updated or deleted since a sync token
+
+    # Task export view
+    path('tasks/export/', TaskExportView.as_view(), name='task-export'),  # GET: Stream tasks as NDJSON or CSV
 ]
@@ -1,21 +1,136 @@
+import csv
+import json
+import logging
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from .models import Task, TaskCategory  # Import the Task model
-from .serializers import TaskSerializer  # Import the Task serializer
+from .models import RecurrenceRule, Task, TaskTombstone  # Import the Task models
+from .serializers import RecurrenceRuleSerializer, TaskSerializer, TaskRowSerializer  # Import the Task serializers
+from .pagination import TaskKeysetPagination, TaskSearchPagination  # Cursor pagination for task lists and search
+from .search import TaskSearch  # Ranked full-text search
+from .stats import get_task_stats  # Aggregate task statistics
+from .recurrence import schedule  # Recurring task series
+from .filters import filter_tasks  # Shared TaskFilterView filtering rules
+from .purge import purge_tasks  # Chunked, set-based admin purges
+from .sync import SyncTokenError, get_changes, record_deletions  # Delta sync and tombstones
+from .cache import (  # Per-user list cache
+    get_cache, get_stats, get_timeout, invalidate_user, list_cache_key, record, stats_cache_key,
+)
+from .conditional import (  # ETag / Last-Modified support
+    ConditionalGetMixin, PreconditionFailed, if_match_holds, latest, not_modified_response, set_validator_headers,
+    task_etag, task_list_etag,
+)
+from categories.resolver import CategoryResolver  # Request-scoped category lookups
+from task_management_api.metrics import timed  # Serialization time in Server-Timing
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Case, Count, Max, Value, When
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def is_task_id(value):
+    """
+    Return whether a JSON value is a task id: an integer, but not a boolean.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+class TaskRowListMixin:
+    """
+    Serve list responses through TaskRowSerializer, the fast read-only path
+    over `.values()` rows, while writes keep using TaskSerializer.
+    Views setting `cache_responses` keep their serialized pages in the per-user
+    list cache, which every write to the user's tasks or categories invalidates.
+    Views setting `conditional_get` emit ETag/Last-Modified headers and answer
+    matching If-None-Match/If-Modified-Since requests with 304.
+    """
+    cache_responses = False  # Cache serialized pages per user and query parameters
+    conditional_get = False  # Emit validators and answer conditional requests
+
+    def get_list_validators(self, request):
+        """
+        Return (etag, last_modified) for the list, derived from one aggregate over
+        the filtered queryset (latest task and category updated_at and row count)
+        plus the user's cache generation, or None when the request is invalid.
+        Last-Modified also accounts for the user's latest task deletion, and for
+        category renames, since rows carry their category's name.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if hasattr(self, 'validation_error'):
+            return None  # Let the list handler report the error
+        stats = queryset.order_by().aggregate(
+            last_modified=Max('updated_at'), category_modified=Max('category__updated_at'), count=Count('id'),
+        )
+        last_deleted = TaskTombstone.objects.filter(user=request.user).aggregate(last=Max('deleted_at'))['last']
+        last_modified = latest(stats['last_modified'], stats['category_modified'], last_deleted)
+        return task_list_etag(request, stats['count'], last_modified), last_modified
+
+    def list_rows(self, queryset):
+        """
+        Return the paginated response for the given task queryset.
+        """
+        rows = queryset.values(*TaskRowSerializer.values_fields)
+        page = self.paginate_queryset(rows)
+        with timed('serialize'):
+            data = TaskRowSerializer().serialize(page)
+        return self.get_paginated_response(data)
+
+    def build_list_response(self):
+        """
+        Query and serialize the requested page.
+        """
+        return self.list_rows(self.filter_queryset(self.get_queryset()))
+
+    def list(self, request, *args, **kwargs):
+        timeout = get_timeout() if self.cache_responses else 0
+        cache = get_cache()
+        key = list_cache_key(request) if timeout else None
+
+        # A cached page carries the validators computed when it was stored,
+        # so a cache hit answers both plain and conditional GETs without a query
+        cached = cache.get(key) if key else None
+        if cached is not None:
+            data, validators = cached
+            record('hits')
+        else:
+            validators = self.get_list_validators(request) if self.conditional_get else None
+
+        if validators:
+            not_modified = not_modified_response(request, *validators)
+            if not_modified is not None:
+                return not_modified
+
+        if cached is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+        else:
+            response = self.build_list_response()
+            if key:
+                if response.status_code == status.HTTP_200_OK:
+                    cache.set(key, (response.data, validators), timeout)
+                record('misses')
+                response['X-Cache'] = 'MISS'
+
+        if validators and response.status_code == status.HTTP_200_OK:
+            set_validator_headers(response, *validators)
+        return response
 
 # Admin View for List of All Tasks
-class AdminTaskListView(generics.ListAPIView):
+class AdminTaskListView(TaskRowListMixin, generics.ListAPIView):
     """
     AdminTaskListView provides a read-only list of all tasks in the system.
     It is restricted to admin users only.
     """
     serializer_class = TaskSerializer  # Specify the serializer to use
     permission_classes = [permissions.IsAdminUser]  # Require admin permissions
+    pagination_class = TaskKeysetPagination  # Page through tasks with an opaque cursor
 
     def get_queryset(self):
         # Return all tasks regardless of the user
-        return Task.objects.all()
+        return Task.objects.with_related()
 
 # Admin Delete All Tasks View
 class AdminDeleteAllTasksView(generics.DestroyAPIView):
@@ -24,86 +139,356 @@ class AdminDeleteAllTasksView(generics.DestroyAPIView):
     def delete(self, request, *args, **kwargs):
         """
         Delete all tasks in the database.
+        Rows are removed in batches of `batch_size` (default PURGE_BATCH_SIZE),
+        each committed separately, so memory use and lock time stay bounded.
         """
-        deleted_count, _ = Task.objects.all().delete()  # Delete all tasks and get the count
+        deleted = purge_tasks(batch_size=request.query_params.get('batch_size'))  # Delete all tasks in batches
         return Response({
-            "message": f"Successfully deleted {deleted_count} tasks."
+            "message": f"Successfully deleted {deleted['tasks']} tasks.",
+            "deleted": deleted,
         }, status=status.HTTP_204_NO_CONTENT)
 
 # Task List View (Retrieve all tasks for authenticated user)
-class TaskListView(generics.ListCreateAPIView):
+class TaskListView(TaskRowListMixin, generics.ListCreateAPIView):
     serializer_class = TaskSerializer  # Specify the serializer to use
     permission_classes = [permissions.IsAuthenticated]  # Require authentication
+    pagination_class = TaskKeysetPagination  # Page through tasks with an opaque cursor
+    cache_responses = True  # Serve repeated polls from the per-user list cache
+    conditional_get = True  # Answer unchanged polls with 304 Not Modified
 
     def get_queryset(self):
         # Return only tasks that belong to the authenticated user
-        return Task.objects.filter(user=self.request.user)  # Filter by 'user'
+        return Task.objects.for_user(self.request.user).with_related()  # Filter by 'user'
     
     def perform_create(self, serializer):
         # Assign the authenticated user as the task's owner
         serializer.save(user=self.request.user)  # Set 'user' field
 
+# Admin view for task list cache statistics
+class AdminTaskCacheStatsView(generics.GenericAPIView):
+    """
+    Report hit/miss counters of the per-user task list cache (admin only).
+    """
+    permission_classes = [permissions.IsAdminUser]  # Only allow admin users
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_stats(), status=status.HTTP_200_OK)
+
 # Task Detail View (Retrieve, Update, Delete a specific task)
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer  # Specify the serializer to use
     permission_classes = [permissions.IsAuthenticated]  # Require authentication
 
     def get_queryset(self):
         # Return only tasks that belong to the authenticated user
-        return Task.objects.filter(user=self.request.user)  # Filter by 'user'
+        return Task.objects.for_user(self.request.user).with_related()  # Filter by 'user'
+
+    def get_version(self, pk):
+        """
+        Return the task's updated_at, category name and category updated_at,
+        read with a single indexed lookup, or None when it does not exist.
+        """
+        return self.get_queryset().filter(pk=pk).values_list(
+            'updated_at', 'category__name', 'category__updated_at',
+        ).first()
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Derive the ETag from the task's updated_at and category name, and
+        Last-Modified from the later of the task's and the category's
+        updated_at; a missing task falls through to the normal 404.
+        """
+        row = self.get_version(kwargs['pk'])
+        if row is None:
+            return None
+        updated_at, category_name, category_updated_at = row
+        return task_etag(kwargs['pk'], updated_at, category_name), latest(updated_at, category_updated_at)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if getattr(self, 'expected_updated_at', None):
+            context['expected_updated_at'] = self.expected_updated_at  # Version the If-Match header refers to
+        return context
+
+    def update(self, request, *args, **kwargs):
+        """
+        Update the task, honouring an If-Match header for optimistic concurrency:
+        a stale ETag is answered with 412 Precondition Failed instead of
+        overwriting someone else's changes. Responses carry the new ETag.
+        """
+        if request.headers.get('If-Match'):
+            row = self.get_version(kwargs['pk'])
+            if row is not None:  # A missing task falls through to the normal 404
+                updated_at, category_name, _ = row
+                if not if_match_holds(request, task_etag(kwargs['pk'], updated_at, category_name)):
+                    raise PreconditionFailed()
+                self.expected_updated_at = updated_at  # The task's own version, not Last-Modified
+
+        response = super().update(request, *args, **kwargs)
+        task = self.updated_task
+        set_validator_headers(
+            response, task_etag(task.pk, task.updated_at, task.category.name),
+            latest(task.updated_at, task.category.updated_at),
+        )
+        return response
+
+    def perform_update(self, serializer):
+        serializer.save()
+        self.updated_task = serializer.instance  # Source of the response's new ETag
 
     def delete(self, request, *args, **kwargs):
         """Override delete method to provide custom response."""
         task = self.get_object()  # Get the task object
         task_title = task.title  # Capture task title or other info you want in the message
-        task.delete()  # Delete the task
+        with transaction.atomic():
+            record_deletions(self.get_queryset().filter(pk=task.pk))  # Let sync clients see the deletion
+            task.delete()  # Delete the task
+        invalidate_user(request.user.pk)  # Drop the user's cached task lists
     
         # Return a custom response message with a status
         return Response({
             "message": f"Task '{task_title}' has been successfully deleted."
         }, status=status.HTTP_200_OK)
 
-# Task Completion Toggle View (Mark a task as complete)
-class TaskToggleCompleteView(generics.UpdateAPIView):
+# Bulk Task View (Create, Update, Delete many tasks at once)
+class TaskBulkView(generics.GenericAPIView):
+    """
+    Create, update or delete many of the authenticated user's tasks in one request.
+    POST takes a list of tasks, PATCH a list of partial tasks that include their `id`,
+    and DELETE an object with a list of `ids`. All items are validated in one pass
+    and nothing is written unless every item is valid; errors are reported per item.
+    """
+    serializer_class = TaskSerializer  # Specify the serializer to use
+    permission_classes = [permissions.IsAuthenticated]  # Require authentication
+
+    def get_queryset(self):
+        # Return only tasks that belong to the authenticated user
+        return Task.objects.for_user(self.request.user)  # Filter by 'user'
+
+    def check_items(self, items, name='tasks'):
+        """
+        Check the payload is a non-empty list within the configured size limit.
+        Returns an error message, or None when the payload is acceptable.
+        """
+        max_items = getattr(settings, 'TASKS_BULK_MAX_ITEMS', 10000)
+        if not isinstance(items, list) or not items:
+            return f"Expected a non-empty list of {name}."
+        if len(items) > max_items:
+            return f"Too many {name}. At most {max_items} can be sent in one request."
+        return None
+
+    def get_bulk_context(self):
+        """
+        Build the serializer context shared by every item, so the user's
+        categories are resolved with a single query for the whole request.
+        """
+        context = self.get_serializer_context()
+        context['category_resolver'] = CategoryResolver.for_request(self.request)
+        return context
+
+    def error_response(self, errors):
+        """
+        Return a 400 response listing the errors of each invalid item by index.
+        Accepts errors as a list aligned with the items or as an {index: errors} map.
+        """
+        indexed = sorted(errors.items()) if isinstance(errors, dict) else enumerate(errors)
+        return Response({
+            "errors": [{"index": index, "errors": error} for index, error in indexed if error]
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    def post(self, request, *args, **kwargs):
+        """
+        Validate and create a list of tasks with a single bulk INSERT.
+        """
+        error = self.check_items(request.data)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = TaskSerializer(data=request.data, many=True, context=self.get_bulk_context())
+        if not serializer.is_valid():
+            return self.error_response(serializer.errors)
+
+        with transaction.atomic():
+            tasks = serializer.save()  # The bulk list serializer invalidates the user's cached lists
+        return Response({"created": [task.id for task in tasks]}, status=status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        """
+        Validate and apply partial updates to a list of tasks with bulk UPDATEs.
+        """
+        error = self.check_items(request.data)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = [item.get('id') for item in request.data if isinstance(item, dict)]
+        tasks = self.get_queryset().filter(pk__in=[pk for pk in ids if is_task_id(pk)]).in_bulk()
+        context = self.get_bulk_context()
+
+        errors, changes = [], []
+        for item in request.data:
+            pk = item.get('id') if isinstance(item, dict) else None
+            if not is_task_id(pk):
+                errors.append({"id": ["A task id must be an integer."]})
+                continue
+            task = tasks.get(pk)
+            if task is None:
+                errors.append({"id": ["Task not found."]})
+                continue
+            serializer = TaskSerializer(task, data=item, partial=True, context=context)
+            if serializer.is_valid():
+                errors.append({})
+                changes.append((task, serializer.validated_data))
+            else:
+                errors.append(serializer.errors)
+        if any(errors):
+            return self.error_response(errors)
+
+        # Apply every change in memory, then write them with bulk_update
+        fields = {'updated_at'}
+        now = timezone.now()
+        for task, validated_data in changes:
+            for attr, value in validated_data.items():
+                setattr(task, attr, value)
+            task.updated_at = now
+            fields.update(validated_data)
+        with transaction.atomic():
+            Task.objects.bulk_update([task for task, _ in changes], sorted(fields), batch_size=500)
+        invalidate_user(request.user.pk)
+        return Response({"updated": [task.id for task, _ in changes]}, status=status.HTTP_200_OK)
+
+    def delete(self, request, *args, **kwargs):
+        """
+        Delete a list of tasks, given as {"ids": [...]}, with a single DELETE.
+        """
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        error = self.check_items(ids, name='task ids')
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+        if not all(is_task_id(pk) for pk in ids):
+            return Response({"error": "Task ids must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            queryset = self.get_queryset().filter(pk__in=ids)
+            found = set(queryset.values_list('id', flat=True))
+            errors = [{} if pk in found else {"id": ["Task not found."]} for pk in ids]
+            if any(errors):
+                return self.error_response(errors)
+            record_deletions(queryset)  # Let sync clients see the deletions
+            queryset.delete()
+        invalidate_user(request.user.pk)
+        return Response({"deleted": sorted(found)}, status=status.HTTP_200_OK)
+
+# Bulk Completion View (Mark many tasks as complete or incomplete)
+class TaskBulkCompletionView(generics.GenericAPIView):
+    """
+    Mark many of the authenticated user's tasks as complete (or incomplete) at once.
+    The body selects tasks either by {"ids": [...]} or by {"filter": {...}} using the
+    same parameters as TaskFilterView. All matching tasks are changed with a single
+    set-based UPDATE and the ids of the affected tasks are returned.
+    """
     serializer_class = TaskSerializer  # Specify the serializer to use
     permission_classes = [permissions.IsAuthenticated]  # Require authentication
+    is_completed = True  # Target state, overridden per URL through as_view()
 
     def get_queryset(self):
         # Return only tasks that belong to the authenticated user
-        return Task.objects.filter(user=self.request.user)  # Filter by 'user'
+        return Task.objects.for_user(self.request.user)  # Filter by 'user'
+
+    def get_targets(self, data):
+        """
+        Return the tasks selected by the request body.
+        Raises ValidationError when the body selects nothing or is invalid.
+        """
+        if not isinstance(data, dict) or ('ids' in data) == ('filter' in data):
+            raise ValidationError("Provide either 'ids' or 'filter'.")
+
+        queryset = self.get_queryset()
+        if 'ids' in data:
+            ids = data['ids']
+            max_items = getattr(settings, 'TASKS_BULK_MAX_ITEMS', 10000)
+            if not isinstance(ids, list) or not ids or not all(is_task_id(pk) for pk in ids):
+                raise ValidationError("'ids' must be a non-empty list of task ids.")
+            if len(ids) > max_items:
+                raise ValidationError(f"Too many task ids. At most {max_items} can be sent in one request.")
+            return queryset.filter(pk__in=ids)
+
+        if not isinstance(data['filter'], dict):
+            raise ValidationError("'filter' must be an object of TaskFilterView parameters.")
+        return filter_tasks(queryset, data['filter'], self.request.user, CategoryResolver.for_request(self.request))
 
     def patch(self, request, *args, **kwargs):
-        task = self.get_object()  # Get the task instance
-        print(f"Toggling task: {task.title} - Current status: {task.is_completed}")
+        target_status = Task.COMPLETED if self.is_completed else Task.PENDING
+        with transaction.atomic():
+            # Only rows that actually change state are touched
+            queryset = self.get_targets(request.data).filter(is_completed=not self.is_completed)
+            ids = list(queryset.select_for_update().values_list('id', flat=True))
+            if ids:
+                queryset.update(is_completed=self.is_completed, status=target_status, updated_at=timezone.now())
+        if ids:
+            invalidate_user(request.user.pk)
 
-        # Toggle the is_completed status
-        task.is_completed = not task.is_completed
-        task.status = 'Completed' if task.is_completed else 'Pending'  # Update the status based on completion
-        task.save()
+        return Response({
+            "updated": sorted(ids), "is_completed": self.is_completed, "status": target_status
+        }, status=status.HTTP_200_OK)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, ValidationError):
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return super().handle_exception(exc)
+
+class TaskStateUpdateMixin:
+    """
+    Change the completion state of one of the user's tasks with a single
+    conditional UPDATE scoped by user and pk, returning the new state.
+    """
+    def update_task_state(self, **values):
+        """
+        Apply the values and return the task's id, is_completed and status.
+        Raises Http404 when the task does not exist or belongs to someone else.
+        """
+        rows = self.get_queryset().filter(pk=self.kwargs['pk']).update_returning(
+            ['id', 'is_completed', 'status'], updated_at=timezone.now(), **values
+        )
+        if not rows:
+            raise Http404(f"No {Task._meta.object_name} matches the given query.")
+        invalidate_user(self.request.user.pk)  # Drop the user's cached task lists
+        logger.debug("Task %s is now %s", rows[0]['id'], rows[0]['status'])
+        return rows[0]
+
+# Task Completion Toggle View (Mark a task as complete)
+class TaskToggleCompleteView(TaskStateUpdateMixin, generics.UpdateAPIView):
+    serializer_class = TaskSerializer  # Specify the serializer to use
+    permission_classes = [permissions.IsAuthenticated]  # Require authentication
+
+    def get_queryset(self):
+        # Return only tasks that belong to the authenticated user
+        return Task.objects.for_user(self.request.user)  # Filter by 'user'
+
+    def patch(self, request, *args, **kwargs):
+        # Toggle is_completed and derive the status from it, in the database
+        task = self.update_task_state(
+            is_completed=Case(When(is_completed=True, then=Value(False)), default=Value(True)),
+            status=Case(When(is_completed=True, then=Value(Task.PENDING)), default=Value(Task.COMPLETED)),
+        )
 
         # Return the updated task with completion status
-        return Response({"id": task.id, "is_completed": task.is_completed, "status": task.status}, status=status.HTTP_200_OK)
+        return Response(task, status=status.HTTP_200_OK)
 
 # Task Incomplete Toggle View (Mark a task as incomplete)
-class TaskToggleIncompleteView(generics.UpdateAPIView):
+class TaskToggleIncompleteView(TaskStateUpdateMixin, generics.UpdateAPIView):
     serializer_class = TaskSerializer  # Specify the serializer to use
     permission_classes = [permissions.IsAuthenticated]  # Require authentication
 
     def get_queryset(self):
         # Return only tasks that belong to the authenticated user
-        return Task.objects.filter(user=self.request.user)  # Filter by 'user'
+        return Task.objects.for_user(self.request.user)  # Filter by 'user'
 
     def patch(self, request, *args, **kwargs):
-        task = self.get_object()  # Get the task instance
-        print(f"Marking task as incomplete: {task.title}")
-
         # Ensure the task is marked as incomplete
-        task.is_completed = False
-        task.status = 'Pending'  # Set status back to Pending
-        task.save()
+        task = self.update_task_state(is_completed=False, status=Task.PENDING)
 
         # Return the updated task
-        return Response({"id": task.id, "is_completed": task.is_completed, "status": task.status}, status=status.HTTP_200_OK)
+        return Response(task, status=status.HTTP_200_OK)
 
     def handle_exception(self, exc):
         """Handle exceptions in a consistent way."""
@@ -112,65 +497,257 @@ class TaskToggleIncompleteView(generics.UpdateAPIView):
         return super().handle_exception(exc)
 
 # Task filter and sorting view
-class TaskFilterView(generics.ListAPIView):
+class TaskFilterView(TaskRowListMixin, generics.ListAPIView):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TaskKeysetPagination
+    cache_responses = True
+    conditional_get = True
 
     def get_queryset(self):
-        queryset = Task.objects.filter(user=self.request.user)
-        
-        status = self.request.query_params.get('status')
-        priority = self.request.query_params.get('priority')
-        category = self.request.query_params.get('category')
-        due_date = self.request.query_params.get('due_date')
-        sort_by = self.request.query_params.get('sort_by')
-        is_completed = self.request.query_params.get('is_completed')
+        queryset = Task.objects.for_user(self.request.user).with_related()
 
         try:
-            if status:
-                if status not in ['Pending', 'Completed']:
-                    raise ValidationError("Invalid status. Must be either 'Pending' or 'Completed'.")
-                queryset = queryset.filter(status=status)
+            # Filtering and sorting rules are shared with the bulk and export endpoints
+            queryset = filter_tasks(
+                queryset, self.request.query_params, self.request.user, CategoryResolver.for_request(self.request)
+            )
+        except ValidationError as e:
+            self.validation_error = str(e)
+            return Task.objects.none()
 
-            if priority:
-                if priority not in ['Low', 'Medium', 'High']:
-                    raise ValidationError("Invalid priority. Must be 'Low', 'Medium', or 'High'.")
-                queryset = queryset.filter(priority=priority)
+        return queryset
 
-            if due_date:
-                queryset = queryset.filter(due_date__date=due_date)
+    def build_list_response(self):
+        queryset = self.get_queryset()
+        if hasattr(self, 'validation_error'):
+            return Response({"error": self.validation_error}, status=status.HTTP_400_BAD_REQUEST)
+        return self.list_rows(queryset)  # Keyset page on the active sort field
 
-            if category:
-                # Check if the category exists and belongs to the user
-                user_categories = TaskCategory.objects.filter(user=self.request.user).values_list('name', flat=True)
-                if category not in user_categories:
-                    raise ValidationError(f"Category '{category}' does not exist or does not belong to you.")
-                queryset = queryset.filter(category__name=category)
+    def handle_exception(self, exc):
+        if isinstance(exc, ValidationError):
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return super().handle_exception(exc)
 
+# Task search view (Ranked full-text search over title and description)
+class TaskSearchView(generics.GenericAPIView):
+    """
+    Search the authenticated user's tasks by title and description with `q`.
+    Every word must match (the last one as a prefix); results are ranked by
+    relevance, with title matches weighing more, and paginated with cursors.
+    The index is maintained by database triggers (SQLite FTS5) or is an
+    expression index (PostgreSQL), so every write path keeps it in sync.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TaskSearchPagination
 
-            if is_completed is not None:
-                is_completed = is_completed.lower() == 'true'
-                queryset = queryset.filter(is_completed=is_completed)
+    def get(self, request, *args, **kwargs):
+        try:
+            search = TaskSearch(request.user, request.query_params.get('q'))
+        except ValidationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        hits = self.paginator.paginate_search(search, request)
+        rows = Task.objects.for_user(request.user).filter(pk__in=[hit['id'] for hit in hits])
+        rows = {row['id']: row for row in rows.values(*TaskRowSerializer.values_fields)}
+        serializer = TaskRowSerializer()
+        with timed('serialize'):
+            data = [serializer.to_representation(rows[hit['id']]) for hit in hits if hit['id'] in rows]
+        return self.get_paginated_response(data)
+
+# Task statistics view (Counts by status, priority, category and due date)
+class TaskStatsView(generics.GenericAPIView):
+    """
+    Return the authenticated user's task counts by status, priority and
+    category, plus how many open tasks are overdue or due this week.
+    The aggregates are computed in the database (see tasks/stats.py) and
+    cached per user until the user's next write or TASKS_STATS_CACHE_TIMEOUT,
+    which bounds how stale the time-dependent due date counts can get.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
 
-            if sort_by:
-                if sort_by not in ['due_date', 'priority', 'created_at', 'updated_at']:
-                    raise ValidationError("Invalid sorting parameter. Must be 'due_date', 'priority', 'created_at', or 'updated_at'.")
-                queryset = queryset.order_by(sort_by)
+    def get(self, request, *args, **kwargs):
+        timeout = getattr(settings, 'TASKS_STATS_CACHE_TIMEOUT', 60)
+        cache = get_cache()
+        key = stats_cache_key(request.user.pk) if timeout else None
+
+        data = cache.get(key) if key else None
+        if data is not None:
+            response = Response(data, status=status.HTTP_200_OK)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        data = get_task_stats(request.user)
+        response = Response(data, status=status.HTTP_200_OK)
+        if key:
+            cache.set(key, data, timeout)
+            response['X-Cache'] = 'MISS'
+        return response
+
+# Task recurrence view (Repeat a task daily, weekly or monthly)
+class TaskRecurrenceView(generics.GenericAPIView):
+    """
+    Read (GET), set (PUT) or remove (DELETE) the recurrence rule of one of
+    the authenticated user's tasks, which becomes the series template.
+    Setting a rule only schedules its next occurrence; the occurrences
+    themselves are created ahead of time by the generate_occurrences command,
+    so no request ever expands a series. Replacing a rule restarts its count
+    and continues after the occurrences the old rule already created.
+    """
+    serializer_class = RecurrenceRuleSerializer
+    permission_classes = [permissions.IsAuthenticated]
 
-        except ValidationError as e:
-            self.validation_error = str(e)
-            return Task.objects.none()
+    def get_task(self):
+        task = Task.objects.for_user(self.request.user).select_related('recurrence').filter(pk=self.kwargs['pk']).first()
+        if task is None:
+            raise Http404("Task not found.")
+        return task
+
+    def get(self, request, *args, **kwargs):
+        task = self.get_task()
+        if not hasattr(task, 'recurrence'):
+            return Response({"error": "This task does not repeat."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self.get_serializer(task.recurrence).data, status=status.HTTP_200_OK)
+
+    def put(self, request, *args, **kwargs):
+        task = self.get_task()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        rule = getattr(task, 'recurrence', None) or RecurrenceRule(task=task)
+        for field in ('interval', 'by_weekday', 'by_month_day', 'count', 'until'):
+            setattr(rule, field, RecurrenceRule._meta.get_field(field).get_default())  # Fields left out are reset
+        for field, value in serializer.validated_data.items():
+            setattr(rule, field, value)
+        rule.generated_count = 1
+        after = max(timezone.now(), rule.last_occurrence) if rule.last_occurrence else None
+        schedule(rule, after).save()  # Never repeats an occurrence already created
+        return Response(self.get_serializer(rule).data, status=status.HTTP_200_OK)
 
-        return queryset
+    def delete(self, request, *args, **kwargs):
+        task = self.get_task()
+        RecurrenceRule.objects.filter(task=task).delete()  # Occurrences already created are kept
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-    def list(self, request, *args, **kwargs):
+# Delta sync view (Tasks changed since a sync token)
+class TaskChangesView(generics.GenericAPIView):
+    """
+    Return the authenticated user's tasks created, updated and deleted since the
+    sync token passed as `since`, plus the token to send on the next call.
+    Without `since` every task is returned as created. When `has_more` is true
+    the client should call again straight away with `next_token`. Clients
+    should upsert both created and updated tasks by id.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            created, updated, deleted, next_token, has_more = get_changes(request.user, request.query_params.get('since'))
+        except SyncTokenError as e:
+            # An expired token may predate pruned tombstones, so the client must start over
+            return Response({"error": str(e)}, status=status.HTTP_410_GONE if e.expired else status.HTTP_400_BAD_REQUEST)
+
+        serializer = TaskRowSerializer()
+        with timed('serialize'):
+            created, updated = serializer.serialize(created), serializer.serialize(updated)
+        return Response({
+            "created": created,
+            "updated": updated,
+            "deleted": deleted,
+            "next_token": next_token,
+            "has_more": has_more,
+        }, status=status.HTTP_200_OK)
+
+class Echo:
+    """
+    File-like object whose write() returns the value, so csv.writer rows can be streamed.
+    """
+    def write(self, value):
+        return value
+
+# Task export view (Stream all of the user's tasks as NDJSON or CSV)
+class TaskExportView(generics.GenericAPIView):
+    """
+    Stream the authenticated user's tasks as NDJSON (default) or CSV.
+    Accepts the same filter parameters as TaskFilterView. Rows are read with a
+    server-side chunked iterator and written out one at a time, so memory
+    stays flat however many tasks the user has. Under ASGI the response is
+    fed by an async iterator, since Django reads a synchronous one into
+    memory before sending it.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    formats = {
+        'ndjson': ('application/x-ndjson', 'tasks.ndjson'),
+        'csv': ('text/csv', 'tasks.csv'),
+    }
+
+    def get_queryset(self):
+        queryset = Task.objects.for_user(self.request.user).order_by('id')
+        return filter_tasks(queryset, self.request.query_params, self.request.user, CategoryResolver.for_request(self.request))
+
+    def iter_rows(self, queryset):
+        """
+        Yield the serialized representation of each task, fetched in chunks.
+        """
+        serializer = TaskRowSerializer()
+        chunk_size = getattr(settings, 'TASKS_EXPORT_CHUNK_SIZE', 2000)
+        for row in queryset.values(*TaskRowSerializer.values_fields).iterator(chunk_size=chunk_size):
+            yield serializer.to_representation(row)
+
+    async def aiter_rows(self, queryset):
+        """
+        Async counterpart of iter_rows; each chunk is fetched off the event loop.
+        """
+        serializer = TaskRowSerializer()
+        chunk_size = getattr(settings, 'TASKS_EXPORT_CHUNK_SIZE', 2000)
+        async for row in queryset.values(*TaskRowSerializer.values_fields).aiterator(chunk_size=chunk_size):
+            yield serializer.to_representation(row)
+
+    def ndjson_format(self):
+        """
+        Return the NDJSON header lines (none) and a function formatting one row.
+        """
+        return [], lambda row: json.dumps(row) + '\n'
+
+    def csv_format(self):
+        """
+        Return the CSV header line and a function formatting one row.
+        """
+        writer = csv.writer(Echo())
+        fields = TaskSerializer.Meta.fields
+        return [writer.writerow(fields)], lambda row: writer.writerow([row[field] for field in fields])
+
+    def stream(self, header, format_row, rows):
+        yield from header
+        for row in rows:
+            yield format_row(row)
+
+    async def astream(self, header, format_row, rows):
+        for line in header:
+            yield line
+        async for row in rows:
+            yield format_row(row)
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in self.formats:
+            return Response({"error": "Invalid export_format. Must be 'ndjson' or 'csv'."}, status=status.HTTP_400_BAD_REQUEST)
         queryset = self.get_queryset()
-        if hasattr(self, 'validation_error'):
-            return Response({"error": self.validation_error}, status=status.HTTP_400_BAD_REQUEST)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+
+        content_type, filename = self.formats[export_format]
+        header, format_row = self.csv_format() if export_format == 'csv' else self.ndjson_format()
+        if isinstance(request._request, ASGIRequest):
+            content = self.astream(header, format_row, self.aiter_rows(queryset))
+        else:
+            content = self.stream(header, format_row, self.iter_rows(queryset))
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
 
     def handle_exception(self, exc):
         if isinstance(exc, ValidationError):
             return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
-        return super().handle_exception(exc)
\ No newline at end of file
+        return super().handle_exception(exc)
@@ -0,0 +1,72 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import cache_user, get_cached_user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that caches the authenticated user by id for
+    USERS_AUTH_CACHE_TIMEOUT seconds, so most requests skip the user SELECT.
+    The user views invalidate the entry on every change, and the active and
+    revoked-token checks still run against the cached user on each request.
+    """
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def check_user(self, user, validated_token, password_fingerprint=None):
+        """
+        Run simplejwt's active and revoked-token checks against a user. A cached
+        user passes the fingerprint of its password, which is not cached itself.
+        """
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            password_fingerprint = password_fingerprint or get_md5_hash_password(user.password)
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_fingerprint:
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+    def get_user(self, validated_token):
+        cached = get_cached_user(self.get_user_id(validated_token))
+        if cached is None:
+            user = super().get_user(validated_token)  # Loads and checks the user
+            cache_user(user, get_md5_hash_password(user.password))
+            return user
+        user, password_fingerprint = cached
+        return self.check_user(user, validated_token, password_fingerprint)
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of authenticate() for async views, loading the user
+        with the async ORM on a cache miss.
+        Returns (user, token), or None when the request carries no token.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        user_id = self.get_user_id(validated_token)
+        cached = get_cached_user(user_id)
+        if cached is None:
+            try:
+                user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            password_fingerprint = get_md5_hash_password(user.password)
+            self.check_user(user, validated_token, password_fingerprint)
+            cache_user(user, password_fingerprint)
+            return user, validated_token
+        user, password_fingerprint = cached
+        return self.check_user(user, validated_token, password_fingerprint), validated_token
@@ -0,0 +1,98 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+
+from .models import User
+
+GENERATION_KEY = 'users:auth:generation'
+
+
+def get_cache():
+    """
+    Return the cache backend holding authenticated users.
+    """
+    return caches[getattr(settings, 'USERS_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    """
+    Return how long an authenticated user is cached; 0 disables the cache.
+    """
+    return getattr(settings, 'USERS_AUTH_CACHE_TIMEOUT', 60)
+
+
+def get_generation():
+    """
+    Return the generation shared by every cached user, bumped by bulk deletes.
+    """
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def user_cache_key(user_id):
+    return f'users:auth:{get_generation()}:{user_id}'
+
+
+def get_cached_user(user_id):
+    """
+    Return (user, password fingerprint) for the cached user with the given id,
+    or None. The password is not cached: it is a deferred field on the user,
+    loaded from the database only if something reads it.
+    """
+    if not get_timeout():
+        return None
+    cached = get_cache().get(user_cache_key(user_id))
+    if cached is None:
+        return None
+    fields, password_fingerprint = cached
+    return User.from_db(router.db_for_read(User), list(fields), list(fields.values())), password_fingerprint
+
+
+def cache_user(user, password_fingerprint):
+    """
+    Cache the user's fields except the password hash, which must not reach a
+    shared (possibly on-disk) cache; `password_fingerprint` stands in for it
+    in the revoked-token check.
+    """
+    timeout = get_timeout()
+    if timeout:
+        fields = {
+            field.attname: getattr(user, field.attname)
+            for field in User._meta.concrete_fields if field.attname != 'password'
+        }
+        get_cache().set(user_cache_key(user.pk), (fields, password_fingerprint), timeout)
+
+
+def invalidate_user(user_id):
+    """
+    Drop one cached user. Called from every view that changes or deletes a user;
+    inside a transaction the entry is dropped again once it commits, in case a
+    concurrent request cached the pre-commit row in between.
+    """
+    key = user_cache_key(user_id)
+    get_cache().delete(key)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: get_cache().delete(key))
+
+
+def invalidate_all():
+    """
+    Drop every cached user, e.g. after an admin purge.
+    """
+    bump_generation()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(bump_generation)
+
+
+def bump_generation():
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), timeout=None)
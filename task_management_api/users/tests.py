@@ -1,3 +1,118 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.settings import api_settings
+from categories.models import TaskCategory
+from tasks.models import RecurrenceRule, Task, TaskCounter, TaskTombstone
+from .cache import invalidate_user, user_cache_key
+from .models import User
+
+
+class AdminPurgeUsersTest(APITestCase):
+    """
+    Tests for the chunked admin purge of every non-superuser account.
+    """
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='root', email='root@example.com', password='adminpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.admin_category = TaskCategory.objects.create(name='Admin', user=self.admin)
+        for index in range(3):
+            user = User.objects.create_user(username=f'user{index}', email=f'user{index}@example.com', password='testpass')
+            category = TaskCategory.objects.create(name=f'Category {index}', user=user)
+            Task.objects.create(
+                title=f'Task {index}', description='Owned by a regular user', due_date=timezone.now(),
+                priority=Task.LOW, user=user, category=category,
+            )
+        # The admin's own task in a regular user's category must go with that category
+        self.orphaned = Task.objects.create(
+            title='Borrowed', description='Uses a regular user category', due_date=timezone.now(),
+            priority=Task.LOW, user=self.admin, category=category,
+        )
+        self.kept = Task.objects.create(
+            title='Kept', description='Admin task', due_date=timezone.now(),
+            priority=Task.LOW, user=self.admin, category=self.admin_category,
+        )
+        RecurrenceRule.objects.create(task=self.orphaned, frequency=RecurrenceRule.DAILY)
+        RecurrenceRule.objects.create(task=self.kept, frequency=RecurrenceRule.WEEKLY)
+
+    def test_purge_removes_users_and_dependent_rows(self):
+        response = self.client.delete(reverse('admin-delete-all-users') + '?batch_size=2')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response.data['deleted']['users'], 3)
+        self.assertEqual(response.data['deleted']['tasks'], 4)
+        self.assertEqual(response.data['deleted']['categories'], 3)
+        self.assertEqual(response.data['deleted']['recurrence rules'], 1)
+        self.assertEqual(list(User.objects.values_list('username', flat=True)), ['root'])
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ['Kept'])
+        self.assertEqual(list(TaskCategory.objects.values_list('name', flat=True)), ['Admin'])
+        # Only the surviving admin's deleted task is recorded for sync clients
+        self.assertEqual(list(TaskTombstone.objects.values_list('task_id', 'user_id')), [(self.orphaned.id, self.admin.id)])
+        self.assertEqual(list(TaskCounter.objects.values_list('user_id', 'total')), [(self.admin.id, 1)])
+        self.assertEqual(list(RecurrenceRule.objects.values_list('task_id', flat=True)), [self.kept.id])
+        connection.check_constraints()  # No batch may leave a dangling foreign key behind
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+    """
+    Tests for JWT authentication with the user cached between requests.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='cached', email='cached@example.com', password='testpass')
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'cached', 'password': 'testpass'})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.profile_url = reverse('user-profile', args=[self.user.id])
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [query for query in queries if 'FROM "users_user"' in query['sql']]
+
+    def test_user_is_loaded_once_then_served_from_cache(self):
+        self.assertEqual(len(self.user_queries()), 2)  # Authentication and the profile itself
+        self.assertEqual(len(self.user_queries()), 1)  # Only the profile itself
+
+    def test_password_hash_is_not_cached(self):
+        self.user_queries()
+        cached = repr(cache.get(user_cache_key(self.user.id)))
+        self.assertIn('cached@example.com', cached)
+        self.assertNotIn(self.user.password, cached)
+        self.assertNotIn("'password'", cached)
+
+    def test_revoke_check_uses_the_cached_fingerprint(self):
+        with mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True):
+            response = self.client.post(reverse('token_obtain_pair'), {'username': 'cached', 'password': 'testpass'})
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+            self.assertEqual(len(self.user_queries()), 2)
+            self.assertEqual(len(self.user_queries()), 1)  # The cached user passes the check
+            self.user.set_password('changed')
+            self.user.save()
+            invalidate_user(self.user.id)
+            self.assertEqual(self.client.get(self.profile_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_refreshes_cached_user(self):
+        self.user_queries()
+        self.client.patch(self.profile_url, {'email': 'renamed@example.com'})
+        self.assertEqual(len(self.user_queries()), 2)
+
+    def test_deleted_user_stops_authenticating(self):
+        self.user_queries()
+        response = self.client.delete(reverse('user-delete', args=[self.user.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(self.profile_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_purged_user_stops_authenticating(self):
+        self.user_queries()
+        User.objects.create_superuser(username='purger', email='purger@example.com', password='adminpass')
+        admin = APIClient()
+        admin.force_authenticate(user=User.objects.get(username='purger'))
+        admin.delete(reverse('admin-delete-all-users'))
+        self.assertEqual(self.client.get(self.profile_url).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -2,6 +2,11 @@ from rest_framework import generics, permissions, status
 from .models import User  # Import the User model
 from .serializers import UserSerializer  # Import the User serializer
 from rest_framework.response import Response
+from tasks.purge import purge_users  # Chunked, set-based purge of users and their data
+from .cache import invalidate_user  # Cached users of CachedJWTAuthentication
+import logging
+
+logger = logging.getLogger(__name__)
 
 # User Registration View (Create User)
 class UserCreateView(generics.CreateAPIView):
@@ -29,6 +34,10 @@ class UserDetailView(generics.RetrieveUpdateAPIView):
         """
         return self.queryset.filter(id=self.request.user.id)
 
+    def perform_update(self, serializer):
+        serializer.save()
+        invalidate_user(serializer.instance.pk)  # Authenticate with the new details from now on
+
 # List Users View for Admin
 class UserListView(generics.ListAPIView):
     """
@@ -64,8 +73,10 @@ class UserDeleteView(generics.DestroyAPIView):
         Logs the username of the deleted user for debugging or tracking.
         """
         user_deleted = instance.username
+        user_id = instance.pk
         instance.delete()  # Delete the user instance
-        print(f"User '{user_deleted}' has been successfully deleted.")  # Message to display to user
+        invalidate_user(user_id)  # Tokens of the deleted user must stop authenticating
+        logger.info("User '%s' has been successfully deleted.", user_deleted)
 
     def delete(self, request, *args, **kwargs):
         """
@@ -85,9 +96,14 @@ class AdminDeleteAllUsersView(generics.DestroyAPIView):
     def delete(self, request, *args, **kwargs):
         """
         Custom delete method to remove all users except the superuser.
+        Users and their tasks and categories are removed in batches of `batch_size`
+        (default PURGE_BATCH_SIZE), each committed separately.
         Returns a message with the number of deleted users.
         """
-        deleted_count, _ = User.objects.filter(is_superuser=False).delete()  # Prevent deletion of superuser
+        deleted = purge_users(  # Prevent deletion of superuser
+            User.objects.filter(is_superuser=False), batch_size=request.query_params.get('batch_size')
+        )
         return Response({
-            "message": f"Successfully deleted {deleted_count} users"
+            "message": f"Successfully deleted {deleted['users']} users",
+            "deleted": deleted,
         }, status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file